@@ -6,14 +6,25 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 import os
 from django.core.asgi import get_asgi_application
-from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.routing import ChannelNameRouter, ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
-import django
-import meetings.routing as app
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'meeting_project.settings')
 django_asgi_app = get_asgi_application()
+
+# Après get_asgi_application() : le consumer importe les modèles Django
+import meetings.routing as app
+from meetings.utils.asr_remote import ASRWorkerConsumer, asr_channel
+
+# Préchauffage optionnel des modèles ML (sinon chargés au premier usage)
+from django.conf import settings
+if getattr(settings, "MODELS_WARMUP_ON_STARTUP", False):
+    from meetings.utils.model_registry import registry
+    registry.warmup()
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(URLRouter(app.websocket_urlpatterns)),
+    # Workers ASR (ASR_REMOTE) : manage.py asr_workers, ou runworker <ASR_REMOTE_CHANNEL>
+    "channel": ChannelNameRouter({asr_channel(): ASRWorkerConsumer.as_asgi()}),
 })
\ No newline at end of file
@@ -41,11 +41,13 @@ INSTALLED_APPS = [
 
 # Middleware - couches de traitement des requêtes
 MIDDLEWARE = [
+    "meetings.middleware.ViewMetricsMiddleware",          # Latence / requêtes SQL par vue (/metrics/)
     "django.middleware.security.SecurityMiddleware",      # Sécurité
     "django.middleware.common.CommonMiddleware",          # Traitement des requêtes communes
     "django.contrib.sessions.middleware.SessionMiddleware", # Gestion des sessions
     "django.middleware.csrf.CsrfViewMiddleware",          # Protection CSRF
     "django.contrib.auth.middleware.AuthenticationMiddleware", # Authentification
+    "meetings.middleware.RequestProfilingMiddleware",     # Profilage à la demande (X-Profile / échantillon)
     "django.contrib.sessions.middleware.SessionMiddleware", # Sessions (dupliqué)
     "django.contrib.messages.middleware.MessageMiddleware", # Messages
     'django.middleware.security.SecurityMiddleware',      # Sécurité (dupliqué)
@@ -158,10 +160,94 @@ CHANNEL_LAYERS = {
         "BACKEND": "channels.layers.InMemoryChannelLayer",  # Couche de canaux en mémoire (développement)
     }
 }
+# Plusieurs processus sur la machine, sans Redis (broker : manage.py asr_workers) :
+#   "default": {"BACKEND": "meetings.utils.local_layer.LocalChannelLayer", "CONFIG": {"path": "/tmp/pfa-channels.sock"}}
+#   ("channel_capacity": {"asr-windows": 20} borne la file des fenêtres ASR en attente)
+# Plusieurs machines : "BACKEND": "channels_redis.core.RedisChannelLayer", "CONFIG": {"hosts": [("127.0.0.1", 6379)]}
 
 # Application ASGI (asynchrone) pour le support WebSocket
 ASGI_APPLICATION = "meeting_project.asgi.application"
 
+# Modèles ML (chargés à la demande, une instance par identifiant)
+ASR_MODEL = "small"  # Taille Whisper (faster-whisper, int8 CPU)
+SUMMARIZER_MODELS = {  # Modèle de résumé par langue
+    "fr": "csebuetnlp/mT5_multilingual_XLSum",
+    "en": "facebook/bart-large-cnn",
+    "ar": "csebuetnlp/mT5_multilingual_XLSum",
+}
+MODELS_WARMUP_ON_STARTUP = False  # Précharger les modèles au démarrage ASGI
+MODELS_MEMORY_BUDGET_MB = None    # Budget RAM des modèles (None = illimité, sinon éviction LRU)
+SUMMARIZER_BACKEND = "torch"      # "torch" (fp32), "torch-int8" (quantification dynamique), "onnx" (optimum)
+SUMMARIZER_ONNX_DIR = None        # Exports ONNX (défaut : BASE_DIR/models/onnx)
+
+# Exécution de l'ASR (Whisper) hors de la boucle d'événements ASGI
+ASR_EXECUTOR = "thread"  # "thread" (modèle partagé) ou "process" (un modèle par processus)
+ASR_MAX_WORKERS = 2      # Inférences simultanées max par worker ASGI
+ASR_VAD_ENABLED = True   # VAD serveur : pas d'ASR sur le silence, déclenchement sur les pauses
+ASR_ADAPTIVE = True      # Sous charge, profil moins coûteux (voir ASR_PROFILES / meetings/utils/adaptive.py)
+# ASR_PROFILES = [...]   # Du plus précis au moins coûteux : name, model, max_window_sec, max_latency_sec, min_new_sec
+
+# Workers ASR séparés du serveur web (manage.py asr_workers) : fenêtres envoyées par la couche de canaux
+ASR_REMOTE = False                 # True : Whisper hors du processus ASGI (couche inter-processus requise)
+ASR_REMOTE_CHANNEL = "asr-windows" # Canal écouté par les workers
+ASR_REMOTE_TIMEOUT = 60.0          # Fenêtre sans réponse -> erreur signalée, la session continue
+ASR_REMOTE_SHM = True              # Audio en mémoire partagée /dev/shm (False : joint au message, workers sur une autre machine)
+ASR_REMOTE_SHM_CACHE = 32          # Segments de sessions gardés ouverts par worker
+ASR_REMOTE_WORKERS = None          # Processus lancés par asr_workers (None = un par cœur)
+
+# Persistance différée des segments live (TranscriptSegment)
+SEGMENTS_FLUSH_EVERY = 20  # bulk_create tous les N segments…
+SEGMENTS_FLUSH_SEC = 5.0   # …ou toutes les T secondes
+LIVE_AUDIO_RECORDING = True  # Audio live écrit sur disque (FLAC ou WebM d'origine) + ligne Audio
+LIVE_AUDIO_QUEUE_MAX = 600    # Trames en attente d'écriture (~1 min à 100 ms) ; au-delà, perdues et signalées
+LIVE_TRACE = False       # Traces de latence par session : "all", "request" ("trace": true au start) ou False
+LIVE_TRACE_DIR = None    # Répertoire des traces (défaut : BASE_DIR/traces) ; lecture : manage.py trace_timeline
+LIVE_PRODUCER_TTL = 30   # Réservation (s) d'une réunion par le socket qui enregistre ; les autres la suivent en spectateurs
+                         # (plusieurs processus ASGI : cache "default" partagé et couche de canaux inter-processus)
+
+# Transcription des fichiers importés (manage.py transcription_worker, hors serveur web)
+TRANSCRIPTION_JOB_WORKERS = 1      # Processus de transcription (un modèle Whisper chacun)
+TRANSCRIPTION_JOB_POLL_SEC = 2.0   # Scrutation de la file des tâches
+TRANSCRIPTION_JOB_STALE_SEC = 600  # Tâche "en cours" sans signe de vie -> échec (vérifié par les workers en marche)
+TRANSCRIPTION_JOB_CHUNK_WORKERS = 1  # >1 : chaque fichier découpé aux silences et réparti sur N processus
+
+# Résumé (transformers) hors de la boucle d'événements
+SUMMARY_BATCH_SIZE = 4   # Morceaux par appel generate du pipeline
+SUMMARY_MAX_WORKERS = 1  # Résumés simultanés par worker ASGI (threads distincts de l'ASR)
+SUMMARY_MAX_INPUT_TOKENS = {}  # Limite d'entrée par modèle ({"model_id": jetons}), sinon lue du modèle
+SUMMARY_JOIN_MAX_TOKENS = 440  # Partiels plus courts ensemble : juxtaposés, sans génération de fusion
+SUMMARY_ROLLING = True         # Résumé glissant pendant la réunion (thread basse priorité)
+SUMMARY_SECTION_CHARS = 2500   # Texte validé accumulé avant de résumer une section
+
+# Caches : "summaries" = résumés par morceau (clé = empreinte du texte + modèle + paramètres),
+# persistant sur disque et borné (au-delà de MAX_ENTRIES, 1/CULL_FREQUENCY des entrées évincées)
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "summaries": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "summaries",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 5000, "CULL_FREQUENCY": 4},
+    },
+}
+
+# Métriques (/metrics/, format Prometheus) : sessions, tampons, ASR, résumés, files, vues
+METRICS_ENABLED = True
+METRICS_TOKEN = None  # Jeton du collecteur (Authorization: Bearer …) ; sans jeton, admin connecté uniquement
+
+# Profilage des requêtes (RequestProfilingMiddleware) : en-tête X-Profile (staff) ou échantillon
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_RATE = 0.0     # Part des requêtes profilées sans en-tête (0.01 = 1 %)
+PROFILING_CPROFILE = False      # cProfile aussi pour les requêtes échantillonnées
+PROFILING_N1_THRESHOLD = 5      # Même requête (aux constantes près) répétée N fois -> signalée
+PROFILING_DIR = None            # Fichiers tournants (défaut : BASE_DIR/profiles) ; rapport : /profiling/
+PROFILING_MAX_BYTES = 5 * 1024 * 1024
+PROFILING_BACKUPS = 3
+
+# Batching ASR inter-sessions (1 = désactivé, chaque session décode seule)
+ASR_BATCH_SIZE = 1          # Fenêtres max par appel Whisper
+ASR_BATCH_MAX_WAIT_MS = 150 # Attente max pour compléter un lot
+
 ###########################################################################################
 # Configuration supplémentaire pour le tunneling avec ngrok
 
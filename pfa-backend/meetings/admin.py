@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import  Reunion, Audio, Transcription, Resume, Rapport
+from .models import  Reunion, Audio, Transcription, Resume, Rapport, TranscriptionJob
 from django.apps import AppConfig
 class MeetingConfig(AppConfig):
     name= 'meetings'
@@ -12,4 +12,5 @@ admin.site.register(Reunion)
 admin.site.register(Audio)
 admin.site.register(Transcription)
 admin.site.register(Resume)
-admin.site.register(Rapport)
\ No newline at end of file
+admin.site.register(Rapport)
+admin.site.register(TranscriptionJob)
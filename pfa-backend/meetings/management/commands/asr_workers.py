@@ -0,0 +1,121 @@
+# meetings/management/commands/asr_workers.py
+# =============================================================================
+# Workers ASR du live, séparés du serveur web (ASR_REMOTE = True)
+#   python manage.py asr_workers                  (un processus par cœur)
+#   python manage.py asr_workers --workers 4 --threads 2
+#   python manage.py asr_workers --workers 0      (broker de canaux seul)
+# Chaque processus charge Whisper et tire ses fenêtres de ASR_REMOTE_CHANNEL
+# une à une, quand il est libre ; un worker qui meurt est relancé sans
+# toucher aux sessions (seule sa fenêtre en cours expire).
+# Avec LocalChannelLayer, la commande héberge aussi le broker de canaux
+# (à démarrer avant le serveur ASGI) ; avec Redis, --no-broker implicite.
+# =============================================================================
+import asyncio
+import functools
+import multiprocessing
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.utils.asr_executor import _init_process_worker
+from meetings.utils.asr_remote import asr_channel
+from meetings.utils.local_layer import ChannelBroker
+
+RESTART_BACKOFF_SEC = 5.0  # worker mort juste après son démarrage : attente avant relance
+
+
+def _worker_main(settings_module: str, channel: str, cpu_threads: int, warmup: bool):
+    _init_process_worker(settings_module)
+    from channels.layers import get_channel_layer
+
+    from meetings.utils.asr_remote import pull_windows
+    from meetings.utils.model_registry import _load_whisper, asr_model_id, registry
+
+    # Un décodage à la fois par processus : threads CTranslate2 bornés
+    registry.LOADERS = {
+        **registry.LOADERS, "asr": functools.partial(_load_whisper, cpu_threads=cpu_threads, num_workers=1),
+    }
+    if warmup:
+        registry.get("asr", asr_model_id())
+    try:
+        asyncio.run(pull_windows(get_channel_layer(), channel))
+    except KeyboardInterrupt:
+        pass
+
+
+class Command(BaseCommand):
+    help = "Lance les workers ASR du live (et le broker de canaux local si configuré)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=getattr(settings, "ASR_REMOTE_WORKERS", None),
+            help="Processus ASR (défaut : un par cœur ; 0 = broker seul)",
+        )
+        parser.add_argument("--threads", type=int, default=None, help="Threads CTranslate2 par worker (défaut : cœurs / workers)")
+        parser.add_argument("--no-broker", action="store_true", help="Ne pas héberger le broker LocalChannelLayer")
+        parser.add_argument("--no-warmup", action="store_true", help="Modèle chargé à la première fenêtre")
+
+    def handle(self, *args, **opts):
+        layer = settings.CHANNEL_LAYERS.get("default", {})
+        backend = layer.get("BACKEND", "")
+        if backend.endswith("InMemoryChannelLayer"):
+            raise CommandError("InMemoryChannelLayer est propre à un processus : configurer LocalChannelLayer ou Redis")
+        broker = None
+        if backend.endswith("local_layer.LocalChannelLayer") and not opts["no_broker"]:
+            broker = ChannelBroker(**layer.get("CONFIG", {}))
+
+        cores = os.cpu_count() or 1
+        n = cores if opts["workers"] is None else max(0, opts["workers"])
+        threads = opts["threads"] or max(1, cores // max(1, n))
+        if n == 0 and broker is None:
+            raise CommandError("Ni worker ni broker à lancer")
+
+        # 'spawn' : processus neufs, sans threads torch/CT2 hérités
+        ctx = multiprocessing.get_context("spawn")
+        target = functools.partial(
+            _worker_main, os.environ.get("DJANGO_SETTINGS_MODULE", "meeting_project.settings"),
+            asr_channel(), threads, not opts["no_warmup"],
+        )
+        procs = [None] * n
+
+        def start(i: int):
+            p = ctx.Process(target=target, name=f"asr-{i}")
+            p.start()
+            p.started = time.monotonic()
+            procs[i] = p
+
+        async def supervise():
+            tasks = [asyncio.ensure_future(broker.serve())] if broker else []
+            if broker:
+                self.stdout.write(f"Broker de canaux sur {broker.path}")
+            for i in range(n):
+                start(i)
+            if n:
+                self.stdout.write(f"Workers ASR démarrés ({n} processus x {threads} threads, canal {asr_channel()})")
+            while True:
+                if tasks and tasks[0].done():
+                    tasks[0].result()  # broker arrêté : on remonte son erreur
+                for i, p in enumerate(procs):
+                    if p.is_alive():
+                        continue
+                    if time.monotonic() - p.started < RESTART_BACKOFF_SEC:
+                        await asyncio.sleep(RESTART_BACKOFF_SEC)
+                    self.stderr.write(f"Worker {p.name} arrêté (code {p.exitcode}), relancé")
+                    start(i)
+                await asyncio.sleep(1.0)
+
+        try:
+            asyncio.run(supervise())
+        except KeyboardInterrupt:
+            pass
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        finally:
+            for p in procs:
+                if p is not None and p.is_alive():
+                    p.terminate()
+            for p in procs:
+                if p is not None:
+                    p.join()
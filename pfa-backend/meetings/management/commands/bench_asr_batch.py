@@ -0,0 +1,75 @@
+# meetings/management/commands/bench_asr_batch.py
+# =============================================================================
+# Benchmark de l'ordonnanceur ASR : débit et latence selon la taille de lot
+#   python manage.py bench_asr_batch --sessions 20 --sizes 1,4,8,16
+# =============================================================================
+import asyncio
+import json
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.utils.asr_scheduler import BatchedASRScheduler
+from meetings.utils.audio_io import SR, load_wav
+from meetings.utils.transcsumm import transcribe_batch
+
+
+class Command(BaseCommand):
+    help = "Mesure débit/latence de l'ASR groupé pour plusieurs tailles de lot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wav", help="Fichier WAV de parole (sinon bruit synthétique, écarté par le VAD)")
+        parser.add_argument("--sessions", type=int, default=20, help="Sessions simulées")
+        parser.add_argument("--rounds", type=int, default=3, help="Fenêtres par session")
+        parser.add_argument("--window", type=float, default=2.5, help="Durée d'une fenêtre (s)")
+        parser.add_argument("--sizes", default="1,2,4,8,16", help="Tailles de lot à tester")
+        parser.add_argument("--max-wait-ms", type=float, default=150)
+        parser.add_argument("--lang", default="fr")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON")
+
+    def handle(self, *args, **opts):
+        n = int(opts["window"] * SR)
+        if opts["wav"]:
+            try:
+                audio = load_wav(opts["wav"])
+            except ValueError as e:
+                raise CommandError(str(e))
+            if audio.size < n:
+                raise CommandError("WAV plus court que la fenêtre")
+        else:
+            self.stderr.write("Sans --wav, le bruit synthétique est écarté par le VAD : seul le filtrage est mesuré")
+            audio = (np.random.default_rng(0).standard_normal(SR * 60) * 0.05).astype(np.float32)
+        windows = [audio[(i * n) % max(1, audio.size - n + 1):][:n] for i in range(opts["sessions"])]
+
+        results = {}
+        for size in [int(s) for s in opts["sizes"].split(",") if s.strip()]:
+            results[size] = asyncio.run(self._run(size, windows, opts))
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'lot':>4} {'débit (s audio/s)':>18} {'latence moy (s)':>16} {'latence max (s)':>16}")
+        for size, r in results.items():
+            self.stdout.write(
+                f"{size:>4} {r['throughput']:>18.2f} {r['latency_avg_sec']:>16.3f} {r['latency_max_sec']:>16.3f}"
+            )
+
+    async def _run(self, size, windows, opts):
+        sched = BatchedASRScheduler(transcribe_batch, batch_size=size, max_wait_ms=opts["max_wait_ms"])
+        t0 = time.perf_counter()
+        for _ in range(opts["rounds"]):
+            # Toutes les sessions soumettent leur fenêtre "en même temps"
+            await asyncio.gather(*(sched.submit(w, opts["lang"]) for w in windows))
+        wall = time.perf_counter() - t0
+
+        per_size = sched.stats()
+        items = sum(s["items"] for s in per_size.values())
+        audio_sec = items * windows[0].size / SR
+        lat = [(s["latency_avg_sec"] or 0) * s["items"] for s in per_size.values()]
+        return {
+            "throughput": audio_sec / wall if wall else 0.0,
+            "latency_avg_sec": sum(lat) / items if items else 0.0,
+            "latency_max_sec": max((s["latency_max_sec"] for s in per_size.values()), default=0.0),
+            "by_batch_size": per_size,
+        }
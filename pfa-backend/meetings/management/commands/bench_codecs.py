@@ -0,0 +1,80 @@
+# meetings/management/commands/bench_codecs.py
+# =============================================================================
+# Débit réseau et coût de décodage par format audio du socket de transcription
+#   python manage.py bench_codecs reunion.wav [--opus-bitrate 24000]
+# =============================================================================
+import io
+import json
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.utils.audio_buffer import PCMRingBuffer
+from meetings.utils.audio_codecs import DECODERS, SR
+from meetings.utils.audio_io import load_wav
+
+
+def _encode_webm_opus(audio: np.ndarray, bitrate: int) -> bytes:
+    """Encode comme MediaRecorder : Opus 48 kHz mono dans un conteneur WebM."""
+    import av
+
+    out = io.BytesIO()
+    with av.open(out, mode="w", format="webm") as container:
+        stream = container.add_stream("libopus", rate=48000)
+        stream.layout = "mono"
+        stream.bit_rate = bitrate
+        frame = av.AudioFrame.from_ndarray(audio.reshape(1, -1), format="flt", layout="mono")
+        frame.sample_rate = SR
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=48000)
+        fifo = av.AudioFifo()
+        for rf in resampler.resample(frame) + resampler.resample(None):
+            fifo.write(rf)
+        while True:
+            chunk = fifo.read(960)  # trames Opus de 20 ms
+            if chunk is None:
+                break
+            container.mux(stream.encode(chunk))
+        container.mux(stream.encode(None))
+    return out.getvalue()
+
+
+class Command(BaseCommand):
+    help = "Compare octets/s et coût de décodage des formats f32, s16 et webm-opus."
+
+    def add_arguments(self, parser):
+        parser.add_argument("wav", help="WAV PCM16 mono 16 kHz")
+        parser.add_argument("--frame-bytes", type=int, default=8192, help="Taille des messages WebSocket")
+        parser.add_argument("--opus-bitrate", type=int, default=24000)
+        parser.add_argument("--json", action="store_true", help="Sortie JSON")
+
+    def handle(self, *args, **opts):
+        try:
+            audio = load_wav(opts["wav"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        payloads = {
+            "f32": audio.astype("<f4").tobytes(),
+            "s16": (np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes(),
+            "webm-opus": _encode_webm_opus(audio, opts["opus_bitrate"]),
+        }
+        results = {}
+        for fmt, payload in payloads.items():
+            decoder = DECODERS[fmt]()
+            pcm = PCMRingBuffer(SR * 30)
+            step = opts["frame_bytes"]
+            for i in range(0, len(payload), step):
+                decoder.feed(payload[i:i + step], pcm)
+                pcm.discard_before(pcm.end)  # simule l'ASR qui consomme
+            decoder.finish()
+            decoder.drain(pcm)
+            if decoder.error is not None:
+                raise CommandError(f"Décodage {fmt} en échec : {decoder.error}")
+            results[fmt] = decoder.stats()
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'format':<10} {'octets/s':>10} {'décodage (ms / s audio)':>24}")
+        for fmt, r in results.items():
+            self.stdout.write(f"{fmt:<10} {r['bytes_per_sec'] or 0:>10} {r['decode_ms_per_audio_sec'] or 0:>24.3f}")
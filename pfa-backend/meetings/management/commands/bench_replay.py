@@ -0,0 +1,321 @@
+# meetings/management/commands/bench_replay.py
+# =============================================================================
+# Rejeu de fichiers WAV dans TranscriptionConsumer (WebsocketCommunicator)
+#   python manage.py bench_replay reunion.wav                 (temps réel)
+#   python manage.py bench_replay a.wav b.wav --speed 4 --format webm-opus
+#   python manage.py bench_replay reunion.wav --stub-asr --json > avant.json
+# Mesures par fichier : délai du premier texte, latence par passe ASR
+# (dernier sample de la fenêtre reçu -> résultat envoyé), RTF, temps CPU du
+# processus, pic d'occupation du tampon PCM. Même chemin que le navigateur :
+# décodage, VAD, déclenchement, exécuteur, local agreement, envoi.
+# --stub-asr : Whisper remplacé par un faux décodeur (coût du pipeline seul).
+# Avec ASR_EXECUTOR = "process", le CPU des processus ASR n'est pas compté.
+# =============================================================================
+import asyncio
+import functools
+import json
+import resource
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from unittest import mock
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from meetings.utils import transcsumm
+from meetings.utils.audio_buffer import PCMRingBuffer
+from meetings.utils.audio_codecs import DECODERS, SR
+from meetings.utils.audio_io import load_wav
+from meetings.utils.model_registry import registry
+
+from .bench_codecs import _encode_webm_opus
+
+STUB_WORD_SEC = 0.5  # Faux ASR : un mot par demi-seconde d'audio non muet
+STUB_MIN_RMS = 1e-3
+
+
+class _Window(np.ndarray):
+    """Vue du tampon marquée de sa position absolue (lue par le faux ASR)."""
+    start = 0
+
+
+class _PositionedBuffer(PCMRingBuffer):
+    def view(self, from_pos: int, to_pos: int = None) -> np.ndarray:
+        v = super().view(from_pos, to_pos).view(_Window)
+        v.start = max(from_pos, self.start)
+        return v
+
+
+def _stub_transcribe(audio: np.ndarray, lang: str, model_id: str = None, cost_sec: float = 0.0):
+    """
+    Remplace transcribe_window : mots alignés sur une grille absolue, donc
+    identiques d'une passe à l'autre (le local agreement valide comme avec
+    Whisper). ``cost_sec`` simule le temps du modèle.
+    """
+    if cost_sec:
+        time.sleep(cost_sec)
+    step = int(SR * STUB_WORD_SEC)
+    start = getattr(audio, "start", 0)
+    words = []
+    for g in range(-(-start // step), (start + audio.size) // step):
+        i = g * step - start
+        cell = np.asarray(audio[i:i + step])
+        if cell.size == step and float(np.sqrt(np.mean(cell * cell))) >= STUB_MIN_RMS:
+            words.append((i / SR, (i + step * 0.8) / SR, f" mot{g}"))
+    return words
+
+
+@contextmanager
+def stub_asr(cost_ms: float = 0.0):
+    """
+    Faux ASR pour les sessions ouvertes dans le bloc : pas de modèle, ni lot
+    Whisper, ni workers distants, ni résumé glissant ; exécuteur à threads
+    (tampons marqués).
+    """
+    with override_settings(ASR_EXECUTOR="thread", ASR_BATCH_SIZE=1, ASR_REMOTE=False, SUMMARY_ROLLING=False), \
+            mock.patch.object(transcsumm, "PCMRingBuffer", _PositionedBuffer), \
+            mock.patch.object(transcsumm, "transcribe_window",
+                              functools.partial(_stub_transcribe, cost_sec=cost_ms / 1000)):
+        yield
+
+
+def _payload(audio: np.ndarray, fmt: str, opus_bitrate: int) -> bytes:
+    if fmt == "f32":
+        return audio.astype("<f4").tobytes()
+    if fmt == "s16":
+        return (np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes()
+    return _encode_webm_opus(audio, opus_bitrate)
+
+
+def _pct(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 4)
+
+
+class _Probe:
+    """Mesures côté serveur, alimentées par le consumer instrumenté."""
+
+    def __init__(self):
+        self.positions = []  # Position absolue de fin du tampon après chaque trame…
+        self.times = []      # …et instant de réception correspondant
+        self.flush_latency = []
+        self.asr_sec = []
+        self.peak_samples = 0
+        self.capacity_bytes = 0
+        self.itemsize = 4
+        self.dropped = 0
+
+    def arrived(self, pcm):
+        self.positions.append(pcm.end)
+        self.times.append(time.perf_counter())
+        self.peak_samples = max(self.peak_samples, len(pcm))
+        self.capacity_bytes = pcm.nbytes
+        self.itemsize = pcm.nbytes // max(pcm.capacity, 1)
+        self.dropped = pcm.dropped
+
+    def arrival(self, pos: int) -> float:
+        i = bisect_left(self.positions, pos)
+        return self.times[i] if i < len(self.times) else time.perf_counter()
+
+
+class _ReplayConsumer(transcsumm.TranscriptionConsumer):
+    """TranscriptionConsumer inchangé, plus quelques relevés autour des étapes."""
+
+    def __init__(self, *args, probe: _Probe = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.probe = probe
+
+    async def receive(self, text_data=None, bytes_data=None):
+        await super().receive(text_data, bytes_data)
+        if bytes_data:
+            self.probe.arrived(self.pcm)
+
+    async def _run_asr(self, final=False, pause=False):
+        end = self.pcm.end
+        if end <= max(self.pcm.start, self.cursor):
+            return await super()._run_asr(final=final, pause=pause)
+        arrived = self.probe.arrival(end)
+        t0 = time.perf_counter()
+        await super()._run_asr(final=final, pause=pause)
+        done = time.perf_counter()
+        self.probe.flush_latency.append(done - arrived)
+        self.probe.asr_sec.append(done - t0)
+        self.probe.peak_samples = max(self.probe.peak_samples, len(self.pcm))
+
+
+class Command(BaseCommand):
+    help = "Rejoue des WAV dans le consumer de transcription et mesure latence, RTF, CPU et mémoire."
+
+    def add_arguments(self, parser):
+        parser.add_argument("wavs", nargs="+", help="WAV PCM16 mono 16 kHz")
+        parser.add_argument("--speed", type=float, default=1.0, help="1 = temps réel, 4 = 4x, 0 = sans attente")
+        parser.add_argument("--format", default="s16", choices=list(DECODERS), help="Format négocié au start")
+        parser.add_argument("--frame-ms", type=int, default=100, help="Durée audio par message WebSocket")
+        parser.add_argument("--opus-bitrate", type=int, default=24000)
+        parser.add_argument("--lang", default="fr")
+        parser.add_argument("--stub-asr", action="store_true", help="Faux ASR : coût du pipeline seul")
+        parser.add_argument("--stub-ms", type=float, default=0.0, help="Temps simulé par passe du faux ASR")
+        parser.add_argument("--no-warmup", action="store_true", help="Chargement des modèles compris dans la mesure")
+        parser.add_argument("--timeout", type=float, default=600.0, help="Attente max d'un message (s)")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON (comparaison de runs)")
+
+    def handle(self, *args, **opts):
+        if opts["speed"] < 0:
+            raise CommandError("--speed doit être >= 0")
+        try:
+            audios = [(path, load_wav(path)) for path in opts["wavs"]]
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if opts["stub_asr"]:
+            ctx = stub_asr(opts["stub_ms"])
+        else:
+            ctx = nullcontext()
+            if not opts["no_warmup"]:
+                self.stderr.write("… chargement des modèles")
+                registry.warmup([opts["lang"]])
+        with ctx:
+            runs = asyncio.run(self._run_all(audios, opts))
+            config = {
+                k: getattr(settings, k, None) for k in (
+                    "ASR_MODEL", "ASR_EXECUTOR", "ASR_MAX_WORKERS", "ASR_BATCH_SIZE",
+                    "ASR_VAD_ENABLED", "ASR_ADAPTIVE", "SUMMARY_ROLLING",
+                )
+            }
+
+        result = {
+            "speed": opts["speed"], "format": opts["format"], "frame_ms": opts["frame_ms"],
+            "stub_asr": opts["stub_asr"], "settings": config,
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+            "runs": runs,
+        }
+        if opts["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        mode = "faux ASR" if opts["stub_asr"] else f"Whisper {config['ASR_MODEL']}"
+        self.stdout.write(
+            f"{mode}, format {opts['format']}, vitesse {opts['speed'] or 'max'}, "
+            f"pic RSS {result['peak_rss_mb']} Mo"
+        )
+        self.stdout.write(
+            f"{'fichier':<24} {'audio s':>8} {'1er texte':>10} {'passes':>7} {'lat p50':>8} "
+            f"{'lat p95':>8} {'lat max':>8} {'RTF':>7} {'CPU s':>7} {'tampon Ko':>10}"
+        )
+        for r in runs:
+            lat = r["flush_latency_sec"]
+            self.stdout.write(
+                f"{r['file'][-24:]:<24} {r['audio_sec']:>8} {r['first_text_sec'] or '-':>10} {r['flushes']:>7} "
+                f"{lat['p50'] or '-':>8} {lat['p95'] or '-':>8} {lat['max'] or '-':>8} "
+                f"{r['rtf']:>7} {r['cpu_sec']:>7} {r['buffer']['peak_bytes'] // 1024:>10}"
+            )
+
+    async def _run_all(self, audios, opts):
+        runs = []
+        for path, audio in audios:
+            self.stderr.write(f"… {path}")
+            runs.append(await self._replay(path, audio, opts))
+        return runs
+
+    async def _replay(self, path, audio, opts):
+        from channels.testing import WebsocketCommunicator
+
+        probe = _Probe()
+        app = _ReplayConsumer.as_asgi(probe=probe)
+        # URL sans réunion : rien n'est écrit en base
+        comm = WebsocketCommunicator(app, "/ws/transcription/")
+        connected, _ = await comm.connect()
+        if not connected:
+            raise CommandError("Connexion WebSocket refusée")
+
+        audio_sec = audio.size / SR
+        payload = _payload(audio, opts["format"], opts["opus_bitrate"])
+        n_frames = max(1, int(np.ceil(audio_sec * 1000 / opts["frame_ms"])))
+        step = -(-len(payload) // n_frames)
+        if opts["format"] != "webm-opus":
+            # Trames PCM alignées sur les samples
+            width = 4 if opts["format"] == "f32" else 2
+            step = max(width, step // width * width)
+        frame_sec = audio_sec * step / len(payload) if payload else 0.0
+
+        events = {"first_partial": None, "first_text": None, "texts": 0, "stats": None}
+        t_first = None
+
+        async def read():
+            # Jusqu'aux statistiques envoyées après le "stop"
+            while True:
+                msg = json.loads(await comm.receive_from(timeout=opts["timeout"]))
+                now = time.perf_counter()
+                kind = msg.get("type")
+                if kind == "partial" and msg.get("message") and events["first_partial"] is None:
+                    events["first_partial"] = now
+                elif kind == "transcription":
+                    events["texts"] += 1
+                    if events["first_text"] is None:
+                        events["first_text"] = now
+                elif kind == "stats" and events.get("stopped"):
+                    events["stats"] = msg
+                    return
+
+        reader = asyncio.create_task(read())
+        cpu0 = time.process_time()
+        t0 = time.perf_counter()
+        await comm.send_to(text_data=json.dumps({"action": "start", "format": opts["format"], "lang": opts["lang"]}))
+        for k, i in enumerate(range(0, len(payload), step)):
+            if opts["speed"] > 0:
+                delay = t0 + k * frame_sec / opts["speed"] - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)  # le consumer traite au fil de l'envoi
+            await comm.send_to(bytes_data=payload[i:i + step])
+            if t_first is None:
+                t_first = time.perf_counter()
+        t_stop = time.perf_counter()
+        events["stopped"] = True
+        await comm.send_to(text_data=json.dumps({"action": "stop"}))
+        try:
+            await reader
+        finally:
+            await comm.disconnect()
+        t_end = time.perf_counter()
+        cpu = time.process_time() - cpu0
+
+        def since_first(t):
+            return round(t - t_first, 3) if t is not None and t_first is not None else None
+
+        wall = t_end - t0
+        stats = events["stats"] or {}
+        return {
+            "file": path,
+            "audio_sec": round(audio_sec, 1),
+            "frames": n_frames,
+            "first_partial_sec": since_first(events["first_partial"]),
+            "first_text_sec": since_first(events["first_text"]),
+            "texts": events["texts"],
+            "flushes": len(probe.asr_sec),
+            "flush_counts": stats.get("flushes"),
+            "flush_latency_sec": {
+                "p50": _pct(probe.flush_latency, 0.5), "p95": _pct(probe.flush_latency, 0.95),
+                "p99": _pct(probe.flush_latency, 0.99), "max": _pct(probe.flush_latency, 1.0),
+            },
+            "asr_sec": {"p50": _pct(probe.asr_sec, 0.5), "p95": _pct(probe.asr_sec, 0.95), "max": _pct(probe.asr_sec, 1.0)},
+            # Temps des passes / durée audio (attente de l'exécuteur comprise)
+            "rtf": round(sum(probe.asr_sec) / audio_sec, 4) if audio_sec else None,
+            "wall_sec": round(wall, 2),
+            "wall_rtf": round(wall / audio_sec, 4) if audio_sec else None,
+            "drain_sec": round(t_end - t_stop, 3),  # "stop" -> dernières statistiques
+            "cpu_sec": round(cpu, 2),
+            "cpu_per_audio_sec": round(cpu / audio_sec, 4) if audio_sec else None,
+            "buffer": {
+                "capacity_bytes": probe.capacity_bytes,
+                "peak_bytes": probe.peak_samples * probe.itemsize,
+                "dropped_samples": probe.dropped,
+            },
+            "decoder": stats.get("decoder"),
+            "asr_profile": stats.get("asr_profile"),
+        }
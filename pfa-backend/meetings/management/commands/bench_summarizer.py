@@ -0,0 +1,193 @@
+# meetings/management/commands/bench_summarizer.py
+# =============================================================================
+# Comparaison des backends de résumé (SUMMARIZER_BACKEND) sur un corpus fixe
+#   python manage.py bench_summarizer --corpus corpus/ [--lang fr]
+#   python manage.py bench_summarizer --from-db 20 --backends torch,torch-int8
+# Chaque backend tourne dans un processus neuf (mémoire mesurée sans
+# interférence) ; latence par morceau, mémoire, et ROUGE des sorties contre le
+# pipeline fp32 d'origine ("torch"). Le cache des résumés n'est pas utilisé.
+# =============================================================================
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.models import Transcription
+from meetings.utils.model_registry import (
+    SUMMARIZER_BACKENDS, _load_summarizer, _rss_bytes, summarizer_model_id,
+)
+from meetings.utils.summarizer import GEN_KWARGS, chunk_text, input_limit
+
+MB = 1024 * 1024
+
+
+def _tokens(text: str):
+    return re.findall(r"\w+", text.lower())
+
+
+def _ngrams(tokens, n):
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _f1(overlap, n_cand, n_ref):
+    if not overlap or not n_cand or not n_ref:
+        return 0.0
+    p, r = overlap / n_cand, overlap / n_ref
+    return 2 * p * r / (p + r)
+
+
+def rouge(candidate: str, reference: str) -> dict:
+    """ROUGE-1/2/L (F1) sur des mots en minuscules, sans dépendance externe."""
+    cand, ref = _tokens(candidate), _tokens(reference)
+    scores = {}
+    for n in (1, 2):
+        c, r = _ngrams(cand, n), _ngrams(ref, n)
+        scores[f"rouge{n}"] = _f1(sum((c & r).values()), sum(c.values()), sum(r.values()))
+    # Plus longue sous-séquence commune (programmation dynamique sur une ligne)
+    prev = [0] * (len(ref) + 1)
+    for a in cand:
+        cur = [0]
+        for j, b in enumerate(ref):
+            cur.append(prev[j] + 1 if a == b else max(prev[j + 1], cur[j]))
+        prev = cur
+    scores["rougeL"] = _f1(prev[-1], len(cand), len(ref))
+    return scores
+
+
+class Command(BaseCommand):
+    help = "Compare latence, mémoire et qualité (ROUGE) des backends de résumé."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corpus", help="Fichier .txt ou répertoire de .txt (un document par fichier)")
+        parser.add_argument("--from-db", type=int, default=0, help="N dernières transcriptions enregistrées")
+        parser.add_argument("--lang", default="fr", help="Langue -> modèle de SUMMARIZER_MODELS")
+        parser.add_argument("--backends", default=",".join(SUMMARIZER_BACKENDS))
+        parser.add_argument("--batch-size", type=int, default=1, help="1 = latence par morceau")
+        parser.add_argument("--max-chunks", type=int, default=50, help="Morceaux max évalués")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON")
+        parser.add_argument("--only", help="(interne) un seul backend, dans ce processus")
+
+    def handle(self, *args, **opts):
+        if opts["only"]:
+            self.stdout.write(json.dumps(self._run_backend(opts["only"], opts), ensure_ascii=False))
+            return
+
+        backends = [b.strip() for b in opts["backends"].split(",") if b.strip()]
+        unknown = set(backends) - set(SUMMARIZER_BACKENDS)
+        if unknown:
+            raise CommandError(f"Backends inconnus : {', '.join(sorted(unknown))}")
+        if "torch" not in backends:
+            backends.insert(0, "torch")  # référence du ROUGE
+
+        runs = {}
+        for backend in backends:
+            self.stderr.write(f"… {backend}")
+            runs[backend] = self._spawn(backend, opts)
+
+        ref = runs["torch"]
+        if "error" in ref:
+            raise CommandError(f"Référence torch en échec : {ref['error']}")
+        result = {"model": summarizer_model_id(opts["lang"]), "chunks": len(ref["outputs"]), "backends": []}
+        for backend, run in runs.items():
+            if "error" in run:
+                result["backends"].append({"backend": backend, "error": run["error"]})
+                continue
+            scores = [rouge(c, r) for c, r in zip(run["outputs"], ref["outputs"])]
+            lat = sorted(run["latency_sec"])
+            result["backends"].append({
+                "backend": backend,
+                "load_sec": run["load_sec"],
+                "model_rss_mb": run["model_rss_mb"],
+                "peak_rss_mb": run["peak_rss_mb"],
+                "latency_avg_sec": round(sum(lat) / len(lat), 3) if lat else None,
+                "latency_p95_sec": round(lat[min(len(lat) - 1, int(0.95 * len(lat)))], 3) if lat else None,
+                "speedup": round(sum(ref["latency_sec"]) / sum(lat), 2) if lat and sum(lat) else None,
+                **{k: round(sum(s[k] for s in scores) / len(scores), 4) if scores else None
+                   for k in ("rouge1", "rouge2", "rougeL")},
+            })
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(f"modèle : {result['model']}, {result['chunks']} morceaux (ROUGE vs torch fp32)")
+        self.stdout.write(
+            f"{'backend':>11} {'charg. s':>9} {'modèle Mo':>10} {'pic Mo':>8} "
+            f"{'moy. s':>8} {'p95 s':>8} {'accél.':>7} {'R-1':>6} {'R-2':>6} {'R-L':>6}"
+        )
+        for b in result["backends"]:
+            if "error" in b:
+                self.stdout.write(self.style.ERROR(f"{b['backend']:>11} échec : {b['error']}"))
+                continue
+            self.stdout.write(
+                f"{b['backend']:>11} {b['load_sec']:>9} {b['model_rss_mb']:>10} {b['peak_rss_mb']:>8} "
+                f"{b['latency_avg_sec']:>8} {b['latency_p95_sec']:>8} {b['speedup']:>7} "
+                f"{b['rouge1']:>6} {b['rouge2']:>6} {b['rougeL']:>6}"
+            )
+
+    def _spawn(self, backend, opts):
+        """Relance la commande pour un seul backend dans un processus neuf."""
+        cmd = [
+            sys.executable, sys.argv[0], "bench_summarizer", "--only", backend,
+            "--lang", opts["lang"], "--batch-size", str(opts["batch_size"]),
+            "--max-chunks", str(opts["max_chunks"]), "--from-db", str(opts["from_db"]),
+        ]
+        if opts["corpus"]:
+            cmd += ["--corpus", opts["corpus"]]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            return {"error": (proc.stderr.strip().splitlines() or ["?"])[-1]}
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+
+    def _documents(self, opts):
+        docs = []
+        path = opts["corpus"]
+        if path:
+            files = [path] if os.path.isfile(path) else sorted(
+                os.path.join(path, n) for n in os.listdir(path) if n.endswith(".txt")
+            )
+            for f in files:
+                with open(f, encoding="utf-8") as fh:
+                    docs.append(fh.read())
+        if opts["from_db"]:
+            qs = Transcription.objects.order_by("-heure_date").values_list("text_transcrit", flat=True)
+            docs += list(qs[:opts["from_db"]])
+        docs = [d for d in docs if d.strip()]
+        if not docs:
+            raise CommandError("Corpus vide : --corpus et/ou --from-db")
+        return docs
+
+    def _run_backend(self, backend, opts):
+        docs = self._documents(opts)
+        rss0 = _rss_bytes()
+        t0 = time.perf_counter()
+        pipe = _load_summarizer(summarizer_model_id(opts["lang"]), backend=backend)
+        load_sec = time.perf_counter() - t0
+        model_rss = _rss_bytes() - rss0
+
+        # Morceaux identiques pour tous les backends (même tokenizer)
+        limit = input_limit(pipe)
+        chunks = [c for d in docs for c in chunk_text(d, pipe.tokenizer, limit)][:opts["max_chunks"]]
+        pipe(chunks[0], **GEN_KWARGS)  # préchauffage (allocations, graphes ONNX)
+
+        bs = max(1, opts["batch_size"])
+        outputs, latency = [], []
+        for i in range(0, len(chunks), bs):
+            batch = chunks[i:i + bs]
+            t = time.perf_counter()
+            out = pipe(batch, batch_size=bs, **GEN_KWARGS)
+            latency += [(time.perf_counter() - t) / len(batch)] * len(batch)
+            outputs += [(o[0] if isinstance(o, list) else o)["summary_text"] for o in out]
+        return {
+            "backend": backend,
+            "load_sec": round(load_sec, 1),
+            "model_rss_mb": round(model_rss / MB),
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+            "latency_sec": [round(x, 4) for x in latency],
+            "outputs": outputs,
+        }
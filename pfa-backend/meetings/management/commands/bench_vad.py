@@ -0,0 +1,66 @@
+# meetings/management/commands/bench_vad.py
+# =============================================================================
+# Appels Whisper évités par la VAD serveur (sans exécuter Whisper)
+#   python manage.py bench_vad reunion.wav [--frame 4096]
+# Rejoue le fichier trame par trame dans FlushPolicy, avec et sans VAD.
+# =============================================================================
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.utils.audio_io import SR, load_wav
+from meetings.utils.transcsumm import TranscriptionConsumer as C
+from meetings.utils.vad import EnergyVAD, FlushPolicy
+
+
+class Command(BaseCommand):
+    help = "Compte les déclenchements ASR avec et sans VAD sur un enregistrement."
+
+    def add_arguments(self, parser):
+        parser.add_argument("wav", help="WAV PCM16 mono 16 kHz")
+        parser.add_argument("--frame", type=int, default=4096, help="Samples par trame WebSocket")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON")
+
+    def handle(self, *args, **opts):
+        try:
+            audio = load_wav(opts["wav"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        fixed = self._replay(audio, opts["frame"], None)
+        vad = self._replay(audio, opts["frame"], EnergyVAD(SR))
+
+        calls_fixed = fixed["counts"][FlushPolicy.ASR]
+        calls_vad = vad["counts"][FlushPolicy.ASR] + vad["counts"][FlushPolicy.PAUSE]
+        result = {
+            "audio_sec": round(audio.size / SR, 1),
+            "fixed": fixed,
+            "vad": vad,
+            "asr_calls_fixed": calls_fixed,
+            "asr_calls_vad": calls_vad,
+            "asr_calls_saved_pct": round(100 * (1 - calls_vad / calls_fixed), 1) if calls_fixed else 0.0,
+        }
+        if opts["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(f"audio : {result['audio_sec']} s")
+        self.stdout.write(f"pas fixe {C.MIN_NEW_SEC:.1f} s : {calls_fixed} appels Whisper")
+        self.stdout.write(
+            f"VAD     : {calls_vad} appels ({vad['counts'][FlushPolicy.PAUSE]} sur pause), "
+            f"{vad['counts'][FlushPolicy.SKIP]} fenêtres muettes ignorées, "
+            f"coût VAD {vad['cpu_ms']:.0f} ms"
+        )
+        self.stdout.write(self.style.SUCCESS(f"appels évités : {result['asr_calls_saved_pct']} %"))
+
+    def _replay(self, audio, frame, vad):
+        policy = FlushPolicy(
+            SR, vad=vad, min_new_sec=C.MIN_NEW_SEC,
+            pause_sec=C.PAUSE_SEC, max_latency_sec=C.MAX_LATENCY_SEC,
+        )
+        t0 = time.process_time()
+        for i in range(0, audio.size, frame):
+            policy.feed(audio[i:i + frame])
+            action = policy.decide()
+            if action is not None:
+                policy.mark_flushed(action)
+        return {"counts": dict(policy.counts), "cpu_ms": (time.process_time() - t0) * 1000}
@@ -0,0 +1,360 @@
+# meetings/management/commands/load_sessions.py
+# =============================================================================
+# Charge : combien de réunions simultanées un nœud tient-il ?
+#   python manage.py load_sessions reunion.wav                    (1, 2, 4, 8… sessions)
+#   python manage.py load_sessions reunion.wav --levels 4,8,12 --user alice
+#   python manage.py load_sessions reunion.wav --stub-asr --json > charge.json
+# N sessions /ws/transcription/ sur meeting_project.asgi.application (routage,
+# middlewares, consumer réels, dans ce processus) : start, audio en temps réel,
+# stop, summarize (sauf --stub-asr : le résumeur n'est pas simulé) ; plus du
+# trafic HTTP de fond (calendar_events, dashboard).
+# Par palier : latence des messages (aller-retour d'un "stats" p50/p95/p99),
+# trames perdues (débordement du tampon) ou envoyées en retard, retard de la
+# boucle d'événements, retard ASR, latence HTTP. Les paliers doublent jusqu'à
+# saturation, puis dichotomie entre le dernier palier tenu et le premier raté.
+# =============================================================================
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from meetings.utils.audio_codecs import DECODERS, SR
+from meetings.utils.audio_io import load_wav
+from meetings.utils.model_registry import registry
+
+from .bench_replay import _payload, _pct, stub_asr
+
+LAG_TICK_SEC = 0.05  # Période de la sonde de retard de la boucle
+
+
+def _ms(values, q):
+    v = _pct(values, q)
+    return round(v * 1000, 1) if v is not None else None
+
+
+class _Level:
+    """Relevés d'un palier (toutes sessions confondues)."""
+
+    def __init__(self):
+        self.rtt = []            # aller-retour d'un "stats" (s)
+        self.summary_sec = []    # "summarize" -> résumé final
+        self.backlog = []        # retard ASR rapporté par le serveur (s)
+        self.loop_lag = []       # retard de réveil de la boucle (s)
+        self.http = []           # latence des requêtes de fond (s)
+        self.http_errors = 0
+        self.dropped_samples = 0
+        self.late_frames = 0
+        self.frames = 0
+        self.failed = 0
+        self.errors = []
+
+
+class Command(BaseCommand):
+    help = "Sessions de transcription simultanées + trafic HTTP : latence, pertes et point de saturation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("wav", help="WAV PCM16 mono 16 kHz (bouclé sur --duration)")
+        parser.add_argument("--levels", help="Paliers fixes, ex. 1,2,4,8 (sinon doublement automatique)")
+        parser.add_argument("--max-sessions", type=int, default=64, help="Plafond du doublement")
+        parser.add_argument("--duration", type=float, default=60.0, help="Audio envoyé par session (s)")
+        parser.add_argument("--ramp-sec", type=float, default=5.0, help="Étalement des connexions d'un palier")
+        parser.add_argument("--format", default="s16", choices=list(DECODERS))
+        parser.add_argument("--frame-ms", type=int, default=100)
+        parser.add_argument("--opus-bitrate", type=int, default=24000)
+        parser.add_argument("--lang", default="fr")
+        parser.add_argument("--ping-sec", type=float, default=1.0, help="Période des \"stats\" de mesure")
+        parser.add_argument("--no-summarize", action="store_true", help="Pas de \"summarize\" après le stop")
+        parser.add_argument("--http-rps", type=float, default=2.0, help="Requêtes HTTP de fond par seconde (0 = aucune)")
+        parser.add_argument("--user", help="Utilisateur des requêtes HTTP (sinon anonyme : redirections)")
+        parser.add_argument("--stub-asr", action="store_true", help="Faux ASR : charge du pipeline seul (sans summarize)")
+        parser.add_argument("--stub-ms", type=float, default=0.0, help="Temps simulé par passe du faux ASR")
+        # Seuils de saturation
+        parser.add_argument("--max-rtt-ms", type=float, default=500.0, help="p95 de l'aller-retour")
+        parser.add_argument("--max-lag-ms", type=float, default=100.0, help="p95 du retard de boucle")
+        parser.add_argument("--max-backlog-sec", type=float, default=6.0, help="p95 du retard ASR")
+        parser.add_argument("--timeout", type=float, default=600.0, help="Attente max d'un message (s)")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON")
+
+    def handle(self, *args, **opts):
+        try:
+            audio = load_wav(opts["wav"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        audio = np.resize(audio, int(opts["duration"] * SR))
+        payload = _payload(audio, opts["format"], opts["opus_bitrate"])
+        n_frames = max(1, int(np.ceil(opts["duration"] * 1000 / opts["frame_ms"])))
+        step = -(-len(payload) // n_frames)
+        if opts["format"] != "webm-opus":
+            width = 4 if opts["format"] == "f32" else 2
+            step = max(width, step // width * width)
+        self.frames = [payload[i:i + step] for i in range(0, len(payload), step)]
+        self.frame_sec = opts["duration"] / len(self.frames)
+        self.frame_samples = int(self.frame_sec * SR)
+        self.headers = self._http_headers(opts["user"])
+        self.paths = [reverse("calendar_events"), reverse("dashboard")]
+
+        if opts["stub_asr"]:
+            ctx = stub_asr(opts["stub_ms"])
+            # Le faux ASR ne couvre pas le résumeur : un "summarize" chargerait le vrai modèle
+            opts["no_summarize"] = True
+        else:
+            ctx = nullcontext()
+            self.stderr.write("… chargement des modèles")
+            registry.warmup([opts["lang"]])
+        with ctx:
+            from meeting_project.asgi import application
+            self.application = application
+            levels, saturation = asyncio.run(self._search(opts))
+
+        result = {
+            "stub_asr": opts["stub_asr"], "format": opts["format"], "duration_sec": opts["duration"],
+            "http_rps": opts["http_rps"], "levels": levels, "saturation": saturation,
+        }
+        if opts["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(
+            f"{'sessions':>8} {'RTT p50':>8} {'p95':>7} {'p99':>7} {'boucle p95':>11} {'perdues':>8} "
+            f"{'retard':>7} {'ASR p95 s':>10} {'HTTP p95':>9} {'échecs':>7}  état"
+        )
+        for r in levels:
+            self.stdout.write(
+                f"{r['sessions']:>8} {r['rtt_ms']['p50'] or '-':>8} {r['rtt_ms']['p95'] or '-':>7} "
+                f"{r['rtt_ms']['p99'] or '-':>7} {r['loop_lag_ms']['p95'] or '-':>11} {r['dropped_frames']:>8} "
+                f"{r['late_frames']:>7} {r['asr_backlog_p95_sec'] or '-':>10} {r['http_ms']['p95'] or '-':>9} "
+                f"{r['failed_sessions']:>7}  {'saturé : ' + ', '.join(r['saturated']) if r['saturated'] else 'ok'}"
+            )
+        if saturation["max_ok"] is None:
+            self.stdout.write(self.style.ERROR("Saturé dès le premier palier"))
+        elif saturation["first_saturated"] is None:
+            self.stdout.write(self.style.WARNING(f"Pas de saturation jusqu'à {saturation['max_ok']} sessions"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Point de saturation : {saturation['max_ok']} sessions tenues, "
+                f"{saturation['first_saturated']} saturent"
+            ))
+
+    def _http_headers(self, username):
+        """
+        En-têtes des requêtes de fond : Host (HttpCommunicator n'en envoie pas,
+        ALLOWED_HOSTS rejetterait tout en 400) et cookie de session d'un
+        utilisateur réel (vues protégées par @login_required).
+        """
+        headers = [(b"host", b"localhost")]
+        if not username:
+            return headers
+        user = get_user_model().objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(f"Utilisateur {username} introuvable")
+        client = Client()
+        client.force_login(user)
+        cookies = "; ".join(f"{k}={v.value}" for k, v in client.cookies.items())
+        return headers + [(b"cookie", cookies.encode())]
+
+    # ------------------------------------------------------------------
+    # Recherche du point de saturation
+    # ------------------------------------------------------------------
+    async def _search(self, opts):
+        results = {}
+
+        async def run(n):
+            if n not in results:
+                self.stderr.write(f"… {n} session(s)")
+                results[n] = await self._level(n, opts)
+            return results[n]
+
+        ok, bad = None, None
+        if opts["levels"]:
+            for n in sorted({int(x) for x in opts["levels"].split(",") if x.strip()}):
+                if (await run(n))["saturated"]:
+                    bad = n
+                    break
+                ok = n
+        else:
+            n = 1
+            while n <= opts["max_sessions"]:
+                if (await run(n))["saturated"]:
+                    bad = n
+                    break
+                ok, n = n, n * 2
+            # Dichotomie entre le dernier palier tenu et le premier saturé
+            while ok is not None and bad is not None and bad - ok > 1:
+                mid = (ok + bad) // 2
+                if (await run(mid))["saturated"]:
+                    bad = mid
+                else:
+                    ok = mid
+        levels = [results[n] for n in sorted(results)]
+        return levels, {"max_ok": ok, "first_saturated": bad}
+
+    async def _level(self, n, opts):
+        level = _Level()
+        stop = asyncio.Event()
+        monitors = [asyncio.create_task(self._loop_lag(level, stop))]
+        if opts["http_rps"] > 0:
+            monitors.append(asyncio.create_task(self._http_traffic(level, stop, opts)))
+        t0 = time.perf_counter()
+        try:
+            await asyncio.gather(*(self._session(i, n, level, opts) for i in range(n)))
+        finally:
+            stop.set()
+            await asyncio.gather(*monitors, return_exceptions=True)
+        wall = time.perf_counter() - t0
+
+        row = {
+            "sessions": n,
+            "wall_sec": round(wall, 1),
+            "failed_sessions": level.failed,
+            "rtt_ms": {"p50": _ms(level.rtt, 0.5), "p95": _ms(level.rtt, 0.95), "p99": _ms(level.rtt, 0.99)},
+            "loop_lag_ms": {"p50": _ms(level.loop_lag, 0.5), "p95": _ms(level.loop_lag, 0.95),
+                            "max": _ms(level.loop_lag, 1.0)},
+            "frames": level.frames,
+            "dropped_frames": -(-level.dropped_samples // max(self.frame_samples, 1)),
+            "late_frames": level.late_frames,
+            "asr_backlog_p95_sec": _pct(level.backlog, 0.95),
+            "summary_sec": {"p50": _pct(level.summary_sec, 0.5), "p95": _pct(level.summary_sec, 0.95)},
+            "http_ms": {"p50": _ms(level.http, 0.5), "p95": _ms(level.http, 0.95), "p99": _ms(level.http, 0.99)},
+            "http_requests": len(level.http) + level.http_errors,
+            "http_errors": level.http_errors,
+            "errors": level.errors[:5],
+        }
+        reasons = []
+        if level.failed:
+            reasons.append("sessions en échec")
+        if row["dropped_frames"]:
+            reasons.append("trames perdues")
+        if (row["rtt_ms"]["p95"] or 0) > opts["max_rtt_ms"]:
+            reasons.append("latence des messages")
+        if (row["loop_lag_ms"]["p95"] or 0) > opts["max_lag_ms"]:
+            reasons.append("boucle d'événements")
+        if (row["asr_backlog_p95_sec"] or 0) > opts["max_backlog_sec"]:
+            reasons.append("retard ASR")
+        row["saturated"] = reasons
+        return row
+
+    # ------------------------------------------------------------------
+    # Une session simulée (navigateur)
+    # ------------------------------------------------------------------
+    async def _session(self, i, n, level, opts):
+        from channels.testing import WebsocketCommunicator
+
+        # Connexions étalées : pas de sessions en phase parfaite
+        await asyncio.sleep(opts["ramp_sec"] * i / max(n, 1))
+        comm = WebsocketCommunicator(self.application, "/ws/transcription/")
+        try:
+            connected, _ = await comm.connect(timeout=opts["timeout"])
+        except Exception as e:
+            level.failed += 1
+            level.errors.append(f"connexion : {e!r}")
+            return
+        if not connected:
+            level.failed += 1
+            level.errors.append("connexion refusée")
+            return
+
+        pings = []  # instants d'envoi des "stats" en attente de réponse (None : stats du stop)
+        summary_sent = {}
+        failed = False
+
+        async def read():
+            while True:
+                msg = json.loads(await comm.receive_from(timeout=opts["timeout"]))
+                kind = msg.get("type")
+                if kind == "stats":
+                    sent = pings.pop(0) if pings else None
+                    if sent is not None:
+                        level.rtt.append(time.perf_counter() - sent)
+                    profile = msg.get("asr_profile") or {}
+                    if profile.get("backlog_sec") is not None:
+                        level.backlog.append(profile["backlog_sec"])
+                    if sent is None:  # statistiques finales (après le stop)
+                        level.dropped_samples += (msg.get("buffer") or {}).get("dropped_samples", 0)
+                        if opts["no_summarize"]:
+                            return
+                elif kind == "summary":
+                    if "t" in summary_sent:
+                        level.summary_sec.append(time.perf_counter() - summary_sent["t"])
+                    return
+
+        reader = asyncio.create_task(read())
+        try:
+            await comm.send_to(text_data=json.dumps({"action": "start", "format": opts["format"], "lang": opts["lang"]}))
+            t0 = time.perf_counter()
+            next_ping = t0 + opts["ping_sec"]
+            for k, frame in enumerate(self.frames):
+                delay = t0 + k * self.frame_sec - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -self.frame_sec:
+                    level.late_frames += 1  # l'émetteur (même boucle) n'a pas suivi le temps réel
+                await comm.send_to(bytes_data=frame)
+                level.frames += 1
+                if time.perf_counter() >= next_ping:
+                    pings.append(time.perf_counter())
+                    await comm.send_to(text_data=json.dumps({"action": "stats"}))
+                    next_ping += opts["ping_sec"]
+                if reader.done():
+                    break
+            pings.append(None)
+            await comm.send_to(text_data=json.dumps({"action": "stop"}))
+            if not opts["no_summarize"]:
+                summary_sent["t"] = time.perf_counter()
+                await comm.send_to(text_data=json.dumps({"action": "summarize"}))
+            await reader
+        except Exception as e:
+            failed = True
+            level.failed += 1
+            level.errors.append(repr(e))
+            reader.cancel()
+        finally:
+            try:
+                await comm.disconnect()
+            except asyncio.CancelledError:
+                # Après un receive expiré, asgiref a annulé l'application : la
+                # déconnexion relance cette annulation, la session compte en échec
+                if not failed:
+                    level.failed += 1
+                    level.errors.append("déconnexion : application annulée")
+
+    # ------------------------------------------------------------------
+    # Sondes et trafic de fond
+    # ------------------------------------------------------------------
+    async def _loop_lag(self, level, stop):
+        """Retard de réveil d'un sleep court : boucle bloquée par du code synchrone."""
+        while not stop.is_set():
+            t = time.perf_counter()
+            await asyncio.sleep(LAG_TICK_SEC)
+            level.loop_lag.append(max(0.0, time.perf_counter() - t - LAG_TICK_SEC))
+
+    async def _http_traffic(self, level, stop, opts):
+        """Requêtes GET à débit fixe (sans attendre les réponses : la file grossit si le serveur sature)."""
+        from channels.testing import HttpCommunicator
+
+        async def one(path):
+            t = time.perf_counter()
+            try:
+                response = await HttpCommunicator(self.application, "GET", path, headers=self.headers) \
+                    .get_response(timeout=opts["timeout"])
+            except Exception:
+                level.http_errors += 1
+                return
+            if 200 <= response["status"] < 400:
+                level.http.append(time.perf_counter() - t)
+            else:
+                level.http_errors += 1
+
+        tasks, k = [], 0
+        while not stop.is_set():
+            tasks.append(asyncio.create_task(one(self.paths[k % len(self.paths)])))
+            k += 1
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=1.0 / opts["http_rps"])
+            except asyncio.TimeoutError:
+                pass
+        await asyncio.gather(*tasks, return_exceptions=True)
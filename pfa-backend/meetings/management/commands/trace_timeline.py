@@ -0,0 +1,164 @@
+# meetings/management/commands/trace_timeline.py
+# =============================================================================
+# Chronologie d'une session live tracée (LIVE_TRACE, meetings/utils/tracing.py)
+#   python manage.py trace_timeline --reunion 42            (dernière trace)
+#   python manage.py trace_timeline --reunion 42 --list
+#   python manage.py trace_timeline traces/42/….trace --slowest 10
+# Pour chaque passe ASR, le retard du texte (premier sample de la fenêtre
+# reçu -> texte envoyé) est découpé en : socket (trames arrivées plus lentement
+# que le temps réel), tampon (attente du déclenchement), décodage + VAD,
+# Whisper (file de l'exécuteur comprise) et envoi.
+# =============================================================================
+import glob
+import json
+import os
+from bisect import bisect_left
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.utils.tracing import (
+    ASR_END, ASR_START, DECISION, FRAME, SEND, read_trace, trace_dir,
+)
+
+SR = 16000
+PARTS = ("socket", "tampon", "decodage_vad", "whisper", "envoi")
+
+
+def _pct(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 3)
+
+
+def _passes(events):
+    """Passes ASR reconstruites à partir des événements (dans l'ordre du fichier)."""
+    ends, times, costs = [], [], []  # trames : position de fin, arrivée, décodage + VAD (s)
+    passes, current = [], None
+    for code, t, *f in events:
+        if code == FRAME:
+            ends.append(int(f[3]))
+            times.append(t)
+            costs.append(int(f[0]) / 1e6)
+        elif code == ASR_START:
+            current = {"t_start": t, "start": int(f[0]), "end": int(f[1]), "final": f[2] == "1", "send": 0.0}
+        elif code == ASR_END and current:
+            current["t_end"], current["words"] = t, int(f[0])
+        elif code == SEND and current and "t_end" in current:
+            current["send"] += int(f[0]) / 1e6
+            if f[1] == "partial":  # dernier message d'une passe
+                current["t_sent"] = t + int(f[0]) / 1e6
+                passes.append(current)
+                current = None
+
+    def arrival(pos):
+        i = bisect_left(ends, pos)
+        return i, times[min(i, len(times) - 1)] if times else 0.0
+
+    rows = []
+    for p in passes:
+        i0, first = arrival(p["start"] + 1)
+        i1, last = arrival(p["end"])
+        audio = (p["end"] - p["start"]) / SR
+        socket = max(0.0, (last - first) - audio)
+        decode = sum(costs[i0:i1 + 1])
+        whisper = p["t_end"] - p["t_start"]
+        lag = p["t_sent"] - first
+        rows.append({
+            "t": round(p["t_start"], 3),
+            "window_sec": round(audio, 2),
+            "audio_at_sec": round(p["start"] / SR, 2),
+            "words": p["words"],
+            "final": p["final"],
+            "lag_sec": round(lag, 3),  # audio le plus ancien de la fenêtre -> texte envoyé
+            "lag_newest_sec": round(p["t_sent"] - last, 3),
+            "socket": round(socket, 3),
+            "tampon": round(max(0.0, p["t_start"] - first - socket - decode), 3),
+            "decodage_vad": round(decode, 4),
+            "whisper": round(whisper, 3),
+            "envoi": round(p["send"], 4),
+        })
+    return rows, times, costs
+
+
+class Command(BaseCommand):
+    help = "Chronologie et statistiques de latence d'une session live tracée."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Fichier .trace (sinon --reunion)")
+        parser.add_argument("--reunion", help="Identifiant de réunion (ou \"libre\") : dernière trace")
+        parser.add_argument("--list", action="store_true", help="Liste les traces de la réunion")
+        parser.add_argument("--slowest", type=int, default=0, help="N passes les plus lentes seulement")
+        parser.add_argument("--threshold", type=float, default=5.0, help="Retard (s) signalé dans la chronologie")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON")
+
+    def handle(self, *args, **opts):
+        path = opts["path"]
+        if not path:
+            if not opts["reunion"]:
+                raise CommandError("Fichier de trace ou --reunion attendu")
+            files = sorted(glob.glob(os.path.join(trace_dir(), str(opts["reunion"]), "*.trace")), key=os.path.getmtime)
+            if not files:
+                raise CommandError(f"Aucune trace pour la réunion {opts['reunion']} dans {trace_dir()}")
+            if opts["list"]:
+                for f in files:
+                    self.stdout.write(f"{f}  {os.path.getsize(f) // 1024} Ko")
+                return
+            path = files[-1]
+        if not os.path.isfile(path):
+            raise CommandError(f"Introuvable : {path}")
+
+        meta, events = read_trace(path)
+        rows, arrivals, costs = _passes(events)
+        gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+        decisions = {}
+        for code, _t, *f in events:
+            if code == DECISION:
+                decisions[f[0]] = decisions.get(f[0], 0) + 1
+        summary = {
+            "file": path,
+            "meta": meta,
+            "duration_sec": round(events[-1][1], 1) if events else 0.0,
+            "frames": len(arrivals),
+            "frame_cost_ms": {"p50": _pct([c * 1000 for c in costs], 0.5), "p95": _pct([c * 1000 for c in costs], 0.95)},
+            "frame_gap_sec": {"p50": _pct(gaps, 0.5), "p95": _pct(gaps, 0.95), "max": _pct(gaps, 1.0)},
+            "decisions": decisions,
+            "passes": len(rows),
+            "lag_sec": {"p50": _pct([r["lag_sec"] for r in rows], 0.5), "p95": _pct([r["lag_sec"] for r in rows], 0.95),
+                        "max": _pct([r["lag_sec"] for r in rows], 1.0)},
+            # Part moyenne de chaque étape dans le retard
+            "breakdown_sec": {k: round(sum(r[k] for r in rows) / len(rows), 3) if rows else None for k in PARTS},
+        }
+        if opts["slowest"]:
+            rows = sorted(rows, key=lambda r: r["lag_sec"], reverse=True)[:opts["slowest"]]
+
+        if opts["json"]:
+            self.stdout.write(json.dumps({"summary": summary, "passes": rows}, indent=2, ensure_ascii=False))
+            return
+
+        m = summary["meta"]
+        self.stdout.write(
+            f"{path}\nréunion {m.get('reunion') or '-'}, {m.get('model')}, {m.get('format')}, {m.get('lang')} : "
+            f"{summary['duration_sec']} s, {summary['frames']} trames, {summary['passes']} passes ASR"
+        )
+        self.stdout.write(
+            f"trames : décodage+VAD p50 {summary['frame_cost_ms']['p50']} ms / p95 {summary['frame_cost_ms']['p95']} ms, "
+            f"écart max {summary['frame_gap_sec']['max']} s ; déclenchements {summary['decisions']}"
+        )
+        self.stdout.write(
+            f"retard texte : p50 {summary['lag_sec']['p50']} s, p95 {summary['lag_sec']['p95']} s, "
+            f"max {summary['lag_sec']['max']} s ; moyenne par étape "
+            + ", ".join(f"{k} {v}" for k, v in summary["breakdown_sec"].items())
+        )
+        self.stdout.write(
+            f"\n{'t (s)':>8} {'audio à':>8} {'fen. s':>7} {'mots':>5} {'retard':>7} "
+            + " ".join(f"{k[:8]:>8}" for k in PARTS) + "  cause"
+        )
+        for r in rows:
+            cause = max(PARTS, key=lambda k: r[k]) if r["lag_sec"] >= opts["threshold"] else ""
+            line = (
+                f"{r['t']:>8.2f} {r['audio_at_sec']:>8.1f} {r['window_sec']:>7.1f} {r['words']:>5} {r['lag_sec']:>7.2f} "
+                + " ".join(f"{r[k]:>8.3f}" for k in PARTS)
+                + (f"  {cause}" if cause else "") + ("  (final)" if r["final"] else "")
+            )
+            self.stdout.write(self.style.WARNING(line) if cause else line)
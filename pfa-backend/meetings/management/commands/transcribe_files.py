@@ -0,0 +1,153 @@
+# meetings/management/commands/transcribe_files.py
+# =============================================================================
+# Transcription en masse de fichiers ou de répertoires d'archives
+#   python manage.py transcribe_files archives/ --workers 8 --out transcriptions/
+#   python manage.py transcribe_files conseil.mp3 --reunion 42 --lang fr   (Audio + segments + Transcription)
+#   python manage.py transcribe_files conseil.wav --bench 1,2,4,8 (RTF selon le nombre de workers)
+# Découpage aux silences et pool de processus : voir meetings/utils/parallel_asr.py
+# =============================================================================
+import json
+import os
+import time
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from meetings.models import Audio, JobStatus, Lang, Reunion, TranscriptionJob
+from meetings.utils.parallel_asr import SR, ParallelTranscriber
+from meetings.utils.transcription_jobs import BEAM_SIZE, process, worker_name
+
+AUDIO_EXTS = {".wav", ".mp3", ".m4a", ".aac", ".flac", ".ogg", ".opus", ".webm", ".mp4", ".mkv"}
+
+
+def _collect(paths):
+    """Fichiers audio des chemins donnés (répertoires parcourus récursivement)."""
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _dirs, names in os.walk(p):
+                files += [os.path.join(root, n) for n in sorted(names) if os.path.splitext(n)[1].lower() in AUDIO_EXTS]
+        elif os.path.isfile(p):
+            files.append(p)
+        else:
+            raise CommandError(f"Introuvable : {p}")
+    return files
+
+
+class Command(BaseCommand):
+    help = "Transcrit des fichiers audio longs en parallèle (découpage aux silences)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Fichiers ou répertoires")
+        parser.add_argument("--workers", type=int, default=None, help="Processus (défaut : nombre de cœurs)")
+        parser.add_argument("--lang", default=None, choices=Lang.values, help="Langue (défaut : détection ; obligatoire avec --reunion)")
+        parser.add_argument("--beam-size", type=int, default=BEAM_SIZE)
+        parser.add_argument("--chunk-sec", type=float, default=60.0, help="Taille visée des morceaux")
+        parser.add_argument("--out", default="transcriptions", help="Répertoire des .txt/.json (hors --reunion)")
+        parser.add_argument("--reunion", type=int, help="Rattache chaque fichier à cette réunion (base de données)")
+        parser.add_argument("--bench", help="Nombres de workers à comparer, ex. 1,2,4,8 (premier fichier)")
+        parser.add_argument("--json", action="store_true", help="Sortie JSON (--bench)")
+
+    def handle(self, *args, **opts):
+        if opts["reunion"] and not opts["lang"]:
+            # La langue détectée l'est morceau par morceau, dans les workers : aucune
+            # valeur unique à enregistrer dans la tâche et la Transcription
+            raise CommandError("--reunion exige --lang (langue enregistrée avec la transcription)")
+        from faster_whisper.audio import decode_audio  # PyAV : tous formats courants
+
+        files = _collect(opts["paths"])
+        if not files:
+            raise CommandError("Aucun fichier audio trouvé")
+        if opts["bench"]:
+            return self._bench(decode_audio(files[0], sampling_rate=SR), files[0], opts)
+
+        reunion = None
+        if opts["reunion"]:
+            reunion = Reunion.objects.filter(pk=opts["reunion"]).first()
+            if reunion is None:
+                raise CommandError(f"Réunion {opts['reunion']} introuvable")
+        else:
+            os.makedirs(opts["out"], exist_ok=True)
+
+        with self._engine(opts, opts["workers"]) as engine:
+            self.stdout.write(f"{len(files)} fichier(s), {engine.workers} processus")
+            for path in files:
+                t0 = time.perf_counter()
+                if reunion is not None:
+                    audio_sec, ok = self._to_reunion(path, reunion, opts["lang"], engine)
+                else:
+                    audio_sec, ok = self._to_files(path, decode_audio(path, sampling_rate=SR), opts, engine)
+                wall = time.perf_counter() - t0
+                rtf = wall / audio_sec if audio_sec else 0.0
+                line = f"{path} : {audio_sec / 60:.1f} min en {wall:.0f} s (RTF {rtf:.3f})"
+                self.stdout.write(self.style.SUCCESS(line) if ok else self.style.ERROR(line + " — échec"))
+
+    def _engine(self, opts, workers):
+        return ParallelTranscriber(
+            workers=workers, beam_size=opts["beam_size"],
+            target_sec=opts["chunk_sec"], max_sec=opts["chunk_sec"] * 1.5,
+        )
+
+    def _to_files(self, path, audio, opts, engine):
+        segments = engine.transcribe(audio, opts["lang"])
+        stem = os.path.join(opts["out"], os.path.splitext(os.path.basename(path))[0])
+        with open(stem + ".txt", "w", encoding="utf-8") as f:
+            f.write(" ".join(t for _s, _e, t in segments))
+        with open(stem + ".json", "w", encoding="utf-8") as f:
+            json.dump([{"start": round(s, 2), "end": round(e, 2), "text": t} for s, e, t in segments],
+                      f, ensure_ascii=False, indent=1)
+        return audio.size / SR, True
+
+    def _to_reunion(self, path, reunion, lang, engine):
+        """Même chemin que les imports web : Audio + tâche, exécutée ici avec le moteur parallèle."""
+        audio = Audio(reunion=reunion, format=os.path.splitext(path)[1].lstrip(".").lower()[:15])
+        with open(path, "rb") as f:
+            audio.chemin_fichier.save(os.path.basename(path), File(f), save=True)
+        job = TranscriptionJob.objects.create(
+            audio=audio, langue=lang, status=JobStatus.EN_COURS,
+            worker=worker_name(), date_debut=timezone.now(),
+        )
+        process(job, engine)
+        job.refresh_from_db()
+        audio.refresh_from_db()
+        if job.status != JobStatus.TERMINE:
+            self.stderr.write(job.error)
+        return audio.duree or 0, job.status == JobStatus.TERMINE
+
+    def _bench(self, audio, path, opts):
+        """RTF (temps de calcul / durée audio) pour chaque nombre de workers, modèles déjà chargés."""
+        try:
+            counts = [int(x) for x in opts["bench"].split(",") if x.strip()]
+        except ValueError:
+            raise CommandError("--bench attend une liste d'entiers, ex. 1,2,4")
+        audio_sec = audio.size / SR
+        rows = []
+        for n in counts:
+            with self._engine(opts, n) as engine:
+                engine.warmup()
+                t0 = time.perf_counter()
+                segments = engine.transcribe(audio, opts["lang"])
+                wall = time.perf_counter() - t0
+            rows.append({
+                "workers": n,
+                "cpu_threads_per_worker": engine.cpu_threads,
+                "wall_sec": round(wall, 1),
+                "rtf": round(wall / audio_sec, 4),
+                "segments": len(segments),
+            })
+        base = rows[0]["wall_sec"] or 1.0
+        for r in rows:
+            r["speedup"] = round(base / r["wall_sec"], 2) if r["wall_sec"] else None
+
+        result = {"file": path, "audio_sec": round(audio_sec, 1), "cores": os.cpu_count(), "runs": rows}
+        if opts["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(f"{path} : {audio_sec / 60:.1f} min, {os.cpu_count()} cœurs")
+        self.stdout.write(f"{'workers':>8} {'threads':>8} {'temps (s)':>10} {'RTF':>8} {'accél.':>7}")
+        for r in rows:
+            self.stdout.write(
+                f"{r['workers']:>8} {r['cpu_threads_per_worker']:>8} {r['wall_sec']:>10} "
+                f"{r['rtf']:>8} {r['speedup']:>7}"
+            )
@@ -0,0 +1,68 @@
+# meetings/management/commands/transcription_worker.py
+# =============================================================================
+# Workers de transcription des fichiers importés (hors serveur web)
+#   python manage.py transcription_worker                 (TRANSCRIPTION_JOB_WORKERS processus)
+#   python manage.py transcription_worker --workers 4
+#   python manage.py transcription_worker --once          (vide la file puis s'arrête)
+# Chaque processus charge son propre modèle Whisper et traite une tâche à la fois.
+# =============================================================================
+import multiprocessing
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from meetings.utils.asr_executor import _init_process_worker
+from meetings.utils.transcription_jobs import fail_stale, worker_loop
+
+
+def _worker_main(settings_module: str, poll_sec: float, once: bool):
+    _init_process_worker(settings_module)
+    worker_loop(poll_sec=poll_sec, once=once)
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches de transcription des fichiers audio importés."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=getattr(settings, "TRANSCRIPTION_JOB_WORKERS", 1),
+            help="Processus de transcription (un modèle chargé par processus)",
+        )
+        parser.add_argument(
+            "--poll", type=float, default=getattr(settings, "TRANSCRIPTION_JOB_POLL_SEC", 2.0),
+            help="Intervalle de scrutation de la file (s)",
+        )
+        parser.add_argument("--once", action="store_true", help="S'arrête quand la file est vide")
+
+    def handle(self, *args, **opts):
+        stale = fail_stale(getattr(settings, "TRANSCRIPTION_JOB_STALE_SEC", 600))
+        if stale:
+            self.stdout.write(self.style.WARNING(f"{stale} tâche(s) interrompue(s) marquée(s) en échec"))
+
+        n = max(1, opts["workers"])
+        if n == 1:
+            self.stdout.write("Worker de transcription démarré (1 processus)")
+            return worker_loop(poll_sec=opts["poll"], once=opts["once"])
+
+        # 'spawn' : processus neufs, sans threads torch/CT2 hérités
+        ctx = multiprocessing.get_context("spawn")
+        settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "meeting_project.settings")
+        procs = [
+            ctx.Process(
+                target=_worker_main, args=(settings_module, opts["poll"], opts["once"]),
+                name=f"transcription-{i}",
+            )
+            for i in range(n)
+        ]
+        for p in procs:
+            p.start()
+        self.stdout.write(f"Workers de transcription démarrés ({n} processus)")
+        try:
+            for p in procs:
+                p.join()
+        except KeyboardInterrupt:
+            for p in procs:
+                p.terminate()
+            for p in procs:
+                p.join()
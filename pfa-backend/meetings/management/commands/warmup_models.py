@@ -0,0 +1,67 @@
+# meetings/management/commands/warmup_models.py
+# =============================================================================
+# Préchargement explicite des modèles ML + mesure du démarrage à froid
+#   python manage.py warmup_models [--lang fr --lang en]
+#   python manage.py warmup_models --cold-start   (import de meeting_project.asgi)
+# =============================================================================
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.utils.model_registry import registry
+
+_COLD_START_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "import meeting_project.asgi; "
+    "print(time.perf_counter() - t)"
+)
+
+
+class Command(BaseCommand):
+    help = "Charge les modèles ASR/résumé à l'avance et affiche les temps de chargement."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lang", action="append", help="Limiter aux langues données")
+        parser.add_argument(
+            "--cold-start", action="store_true",
+            help="Mesure seulement le temps d'import de meeting_project.asgi (processus neuf)",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Mesures de démarrage à froid")
+
+    def handle(self, *args, **opts):
+        if opts["cold_start"]:
+            return self._cold_start(opts["repeat"])
+
+        t0 = time.perf_counter()
+        loaded = registry.warmup(langs=opts["lang"])
+        dt = time.perf_counter() - t0
+        for kind, model_id in loaded:
+            self.stdout.write(f"  {kind:<11} {model_id}")
+        self.stdout.write(self.style.SUCCESS(f"{len(loaded)} modèle(s) chargé(s) en {dt:.1f} s"))
+        st = registry.stats()
+        self.stdout.write(
+            f"cache : {st['resident_bytes'] / 2**20:.0f} Mo résidents, "
+            f"hits={st['hits']} misses={st['misses']} evictions={st['evictions']}"
+        )
+
+    def _cold_start(self, repeat: int):
+        """Import de l'application ASGI dans un interpréteur vierge (sans préchauffage)."""
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="meeting_project.settings")
+        times = []
+        for _ in range(max(1, repeat)):
+            out = subprocess.run(
+                [sys.executable, "-c", _COLD_START_SNIPPET],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            )
+            if out.returncode != 0:
+                raise CommandError(out.stderr.strip() or "import de meeting_project.asgi impossible")
+            times.append(float(out.stdout.strip().splitlines()[-1]))
+        times.sort()
+        self.stdout.write(
+            f"import meeting_project.asgi : min {times[0]:.2f} s, "
+            f"médiane {times[len(times) // 2]:.2f} s ({len(times)} mesures)"
+        )
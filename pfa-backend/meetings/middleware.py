@@ -0,0 +1,71 @@
+# meetings/middleware.py
+# =============================================================================
+# Middlewares de l'application meetings
+# - ViewMetricsMiddleware : latence et nombre de requêtes SQL par vue de
+#   meetings.views (histogrammes exposés par /metrics/)
+# - RequestProfilingMiddleware : profil détaillé d'une requête, sur en-tête
+#   X-Profile (staff) ou par échantillonnage (meetings/utils/profiling.py)
+# =============================================================================
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .utils import metrics
+from .utils.profiling import profile_request
+
+
+class ViewMetricsMiddleware:
+    """À placer en tête de MIDDLEWARE : la latence inclut les autres middlewares."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        t0 = time.perf_counter()
+        with connection.execute_wrapper(count):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - t0
+
+        match = getattr(request, "resolver_match", None)
+        if match is not None and match.func.__module__ == "meetings.views" and match.url_name != "metrics":
+            view = match.view_name
+            metrics.view_duration.observe(elapsed, view)
+            metrics.view_queries.observe(queries[0], view)
+            metrics.view_responses.inc(view, f"{response.status_code // 100}xx")
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Après AuthenticationMiddleware (l'en-tête n'est honoré que pour le staff).
+    ``X-Profile: 1`` : SQL et temps ; ``X-Profile: cprofile`` : en plus le
+    profil cProfile. Échantillon PROFILING_SAMPLE_RATE des autres requêtes
+    (cProfile si PROFILING_CPROFILE).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.rate = float(getattr(settings, "PROFILING_SAMPLE_RATE", 0.0))
+        self.sampled_cprofile = getattr(settings, "PROFILING_CPROFILE", False)
+
+    def __call__(self, request):
+        header = request.headers.get("X-Profile")
+        user = getattr(request, "user", None)
+        if header and (settings.DEBUG or (user is not None and user.is_staff)):
+            return profile_request(request, self.get_response, use_cprofile=header.lower() == "cprofile")
+        if self.rate and random.random() < self.rate:
+            return profile_request(request, self.get_response, use_cprofile=self.sampled_cprofile)
+        return self.get_response(request)
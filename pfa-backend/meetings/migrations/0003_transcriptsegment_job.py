@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0002_transcriptionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcriptsegment',
+            name='job',
+            field=models.ForeignKey(blank=True, help_text="Tâche d'import qui a écrit le segment (vide : live)", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='segments', to='meetings.transcriptionjob'),
+        ),
+    ]
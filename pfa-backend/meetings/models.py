@@ -12,6 +12,7 @@ from django.utils import timezone
 from django.core.validators import MinValueValidator
 from datetime import datetime
 import os
+import uuid
 
 
 # =============================================================================
@@ -122,11 +123,13 @@ class Reunion(models.Model):
 def _audio_upload_to(instance, filename: str) -> str:
     """
     Chemin d’upload des fichiers audio :
-      uploads/audio/r<id_reunion>/<timestamp><ext>
+      uploads/audio/r<id_reunion>/<timestamp>_<suffixe><ext>
+    Suffixe aléatoire : deux enregistrements de la même seconde (reprise du
+    live, upload simultané) n'écrivent pas dans le même fichier.
     """
     _base, ext = os.path.splitext(filename)
     ts = timezone.now().strftime("%Y%m%d_%H%M%S")
-    return f"uploads/audio/r{instance.reunion_id}/{ts}{ext.lower()}"
+    return f"uploads/audio/r{instance.reunion_id}/{ts}_{uuid.uuid4().hex[:8]}{ext.lower()}"
 
 
 class Audio(models.Model):
@@ -166,6 +169,10 @@ class TranscriptSegment(models.Model):
     start_sec = models.FloatField(default=0)
     end_sec   = models.FloatField(default=0)
     speaker   = models.CharField(max_length=80, blank=True, help_text="Diarisation future (optionnel)")
+    job       = models.ForeignKey(
+        "TranscriptionJob", on_delete=models.SET_NULL, null=True, blank=True, related_name="segments",
+        help_text="Tâche d'import qui a écrit le segment (vide : live)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -203,6 +210,42 @@ class Transcription(models.Model):
         return f"Transcription {self.id} — {self.reunion.titre}"
 
 
+# =============================================================================
+# Tâche de transcription d'un fichier audio importé (traitée hors requête)
+# =============================================================================
+class JobStatus(models.TextChoices):
+    EN_ATTENTE = "en_attente", "En attente"
+    EN_COURS   = "en_cours",   "En cours"
+    TERMINE    = "termine",    "Terminé"
+    ECHEC      = "echec",      "Échec"
+
+
+class TranscriptionJob(models.Model):
+    """
+    Transcription différée d'un Audio importé.
+    Réservée puis exécutée par un processus `manage.py transcription_worker` ;
+    'progress' (0 → 1) = part de la durée audio déjà transcrite.
+    """
+    audio    = models.ForeignKey(Audio, on_delete=models.CASCADE, related_name="jobs")
+    langue   = models.CharField(max_length=5, choices=Lang.choices, default=Lang.FR)
+    status   = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.EN_ATTENTE)
+    progress = models.FloatField(default=0)
+    error    = models.TextField(blank=True)
+    worker   = models.CharField(max_length=80, blank=True, help_text="Processus qui a réservé la tâche")
+
+    date_creation = models.DateTimeField(auto_now_add=True)
+    date_maj      = models.DateTimeField(auto_now=True, help_text="Dernier signe de vie du worker")
+    date_debut    = models.DateTimeField(null=True, blank=True)
+    date_fin      = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["date_creation"]
+        indexes = [models.Index(fields=["status", "date_creation"])]
+
+    def __str__(self) -> str:
+        return f"Job {self.id} — {self.get_status_display()} ({self.progress:.0%})"
+
+
 # =============================================================================
 # Résumé (OneToOne Transcription)
 # =============================================================================
@@ -2,5 +2,7 @@ from django.urls import re_path
 from  .utils.transcsumm import TranscriptionConsumer
 
 websocket_urlpatterns = [
+     re_path(r"^ws/transcription/(?P<reunion_id>\d+)/$", TranscriptionConsumer.as_asgi()),
+     # Ancienne URL sans réunion : transcription sans persistance des segments
      re_path(r"^ws/transcription/$", TranscriptionConsumer.as_asgi()),
 ]
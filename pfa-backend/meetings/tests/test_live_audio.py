@@ -0,0 +1,108 @@
+# meetings/tests/test_live_audio.py
+# =============================================================================
+# Enregistrement disque de l'audio live (AudioRecorder + TranscriptionConsumer)
+#   python manage.py test meetings.tests.test_live_audio
+# =============================================================================
+import json
+import shutil
+import tempfile
+import threading
+from datetime import date, time
+
+import numpy as np
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from meetings.management.commands.bench_replay import stub_asr
+from meetings.models import Audio, Reunion
+from meetings.utils.audio_recorder import AudioRecorder
+from meetings.utils.transcsumm import TranscriptionConsumer
+
+SR = 16000
+
+
+class _StalledRecorder(AudioRecorder):
+    """Écrivain dont le disque ne répond pas tant que ``release`` n'est pas levé."""
+
+    def __init__(self, path):
+        self.release = threading.Event()
+        self.written = 0
+        super().__init__(path)
+
+    def _item(self, data, pcm):
+        return pcm.size
+
+    def _open(self):
+        pass
+
+    def _write(self, item):
+        self.release.wait()
+        self.written += item
+
+    def _close(self):
+        pass
+
+
+class AudioRecorderTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    @override_settings(LIVE_AUDIO_QUEUE_MAX=5)
+    def test_queue_is_bounded_when_disk_stalls(self):
+        rec = _StalledRecorder(f"{self.dir}/a.raw")
+        frame = np.zeros(1600, dtype=np.float32)
+        for _ in range(50):
+            rec.write(b"", frame)
+        self.assertLessEqual(rec._q.qsize(), 5)
+        self.assertGreater(rec.dropped, 0)
+        rec.release.set()
+        rec.finish(timeout=5)
+        self.assertFalse(rec._thread.is_alive())
+        # Durée = audio réellement écrit, trames perdues exclues
+        self.assertEqual(rec.samples, rec.written)
+
+    def test_write_is_noop_after_error(self):
+        class Broken(_StalledRecorder):
+            def _open(self):
+                raise OSError("disque plein")
+
+        rec = Broken(f"{self.dir}/b.raw")
+        rec._thread.join(5)
+        rec.write(b"", np.zeros(1600, dtype=np.float32))
+        self.assertIsInstance(rec.error, OSError)
+        self.assertEqual((rec._q.qsize(), rec.samples), (0, 0))
+
+
+class LiveAudioDurationTests(TransactionTestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        self.user = get_user_model().objects.create_user("alice", password="x")
+        self.reunion = Reunion.objects.create(
+            titre="Point", date_r=date(2026, 10, 18), heure_r=time(10, 0), utilisateur=self.user,
+        )
+
+    async def _session(self):
+        comm = WebsocketCommunicator(TranscriptionConsumer.as_asgi(), f"/ws/transcription/{self.reunion.pk}/")
+        comm.scope["user"] = self.user
+        comm.scope["url_route"] = {"kwargs": {"reunion_id": self.reunion.pk}}
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        audio = (np.full(3 * SR, 0.1) * 32767).astype("<i2").tobytes()
+        for start in range(2):  # second "start" sans "stop" : le premier fichier est clos
+            await comm.send_to(text_data=json.dumps({"action": "start", "format": "s16"}))
+            for i in range(0, len(audio), 3200):
+                await comm.send_to(bytes_data=audio[i:i + 3200])
+        await comm.send_to(text_data=json.dumps({"action": "stop"}))
+        while json.loads(await comm.receive_from(timeout=10)).get("type") != "stats":
+            pass
+        await comm.disconnect()
+
+    def test_restart_keeps_duration_of_previous_recording(self):
+        with self.settings(MEDIA_ROOT=self.media), stub_asr():
+            async_to_sync(self._session)()
+        durations = list(Audio.objects.filter(reunion=self.reunion).order_by("pk").values_list("duree", flat=True))
+        self.assertEqual(durations, [3, 3])
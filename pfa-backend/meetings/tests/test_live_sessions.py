@@ -0,0 +1,166 @@
+# meetings/tests/test_live_sessions.py
+# =============================================================================
+# Session live partagée : un producteur, des spectateurs (groupe "reunion.<id>")
+#   python manage.py test meetings.tests.test_live_sessions
+# =============================================================================
+import asyncio
+import json
+import shutil
+import tempfile
+from datetime import date, time
+from unittest import mock
+
+import numpy as np
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from meetings.management.commands.bench_replay import stub_asr
+from meetings.models import Reunion
+from meetings.utils import live_sessions, transcsumm
+from meetings.utils.transcsumm import TranscriptionConsumer
+
+SR = 16000
+
+
+class ClaimTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @async_to_sync
+    async def test_single_producer(self):
+        self.assertTrue(await live_sessions.claim(1, "a"))
+        self.assertTrue(await live_sessions.claim(1, "a"))  # déjà détenue
+        self.assertFalse(await live_sessions.claim(1, "b"))
+        await live_sessions.release(1, "b")  # pas le propriétaire : sans effet
+        self.assertEqual(await live_sessions.current_producer(1), "a")
+        await live_sessions.release(1, "a")
+        self.assertTrue(await live_sessions.claim(1, "b"))
+
+    @override_settings(LIVE_PRODUCER_TTL=1)
+    @async_to_sync
+    async def test_keep_claim_ends_when_claim_is_lost(self):
+        await live_sessions.claim(1, "a")
+        task = asyncio.ensure_future(live_sessions.keep_claim(1, "a"))
+        await asyncio.sleep(0.5)
+        self.assertFalse(task.done())  # prolongée tant qu'elle est détenue
+        await cache.aset(live_sessions._key(1), "b", 1)  # expirée puis reprise par un autre
+        await asyncio.wait_for(task, 2)
+        self.assertEqual(await live_sessions.current_producer(1), "b")
+
+
+@override_settings(LIVE_AUDIO_RECORDING=False, LIVE_PRODUCER_TTL=1)
+class ProducerViewerTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        users = get_user_model().objects
+        self.alice = users.create_user("alice", password="x")
+        self.bob = users.create_user("bob", password="x")
+        self.reunion = Reunion.objects.create(
+            titre="Point", date_r=date(2026, 10, 18), heure_r=time(10, 0), utilisateur=self.alice,
+        )
+        self.reunion.participants.add(self.bob)
+
+    async def connect(self, user):
+        comm = WebsocketCommunicator(TranscriptionConsumer.as_asgi(), f"/ws/transcription/{self.reunion.pk}/")
+        comm.scope["user"] = user
+        comm.scope["url_route"] = {"kwargs": {"reunion_id": self.reunion.pk}}
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        return comm
+
+    async def send(self, comm, **msg):
+        await comm.send_to(text_data=json.dumps(msg))
+
+    async def until(self, comm, kind, timeout=5):
+        """Messages reçus jusqu'au premier de type ``kind`` (inclus)."""
+        seen = []
+        while True:
+            msg = json.loads(await comm.receive_from(timeout=timeout))
+            seen.append(msg)
+            if msg.get("type") == kind:
+                return seen
+
+    async def stream(self, comm, audio):
+        data = (audio * 32767).astype("<i2").tobytes()
+        for i in range(0, len(data), 3200):
+            await comm.send_to(bytes_data=data[i:i + 3200])
+            await asyncio.sleep(0)
+
+    def run_session(self, scenario):
+        with self.settings(MEDIA_ROOT=self.media), stub_asr():
+            async_to_sync(scenario)()
+
+    def test_viewer_mirrors_producer_without_buffer(self):
+        async def scenario():
+            producer, viewer = await self.connect(self.alice), await self.connect(self.bob)
+            await self.send(producer, action="start", format="s16")
+            live = (await self.until(viewer, "live"))[-1]
+            self.assertEqual((live["recording"], live["producer"]), (True, False))
+
+            # Second "start" : reste spectateur, aucun tampon PCM alloué
+            await self.send(viewer, action="start", format="s16")
+            await self.until(viewer, "info")
+            await self.send(viewer, action="stats")
+            stats = (await self.until(viewer, "stats"))[-1]
+            self.assertEqual(stats["buffer"]["capacity_samples"], 1)
+
+            await self.stream(producer, np.concatenate([np.full(2 * SR, 0.2), np.zeros(SR)]).astype(np.float32))
+            sent = [m["message"] for m in await self.until(producer, "transcription", timeout=10) if m["type"] == "transcription"]
+            relayed = [m["message"] for m in await self.until(viewer, "transcription", timeout=10) if m["type"] == "transcription"]
+            self.assertEqual(relayed, sent)
+
+            await self.send(producer, action="stop")
+            live = (await self.until(viewer, "live"))[-1]
+            self.assertFalse(live["recording"])
+            await producer.disconnect()
+            await viewer.disconnect()
+
+        self.run_session(scenario)
+
+    def test_viewer_summarize_replies_go_to_requester(self):
+        async def scenario():
+            producer, viewer = await self.connect(self.alice), await self.connect(self.bob)
+            await self.send(producer, action="start", format="s16")
+            await self.until(viewer, "live")
+            await self.until(producer, "info")
+
+            # Rien à résumer : la réponse revient au spectateur, pas au producteur
+            await self.send(viewer, action="summarize")
+            summary = (await self.until(viewer, "summary"))[-1]
+            self.assertIn("Aucun texte", summary["message"])
+            self.assertTrue(await producer.receive_nothing(0.2))
+
+            # Erreur du résumeur : diffusée à toute la réunion
+            await self.stream(producer, np.concatenate([np.full(2 * SR, 0.2), np.zeros(SR)]).astype(np.float32))
+            await self.until(producer, "transcription", timeout=10)
+            await self.until(viewer, "transcription", timeout=10)
+            with mock.patch.object(transcsumm, "summarize_stream", side_effect=RuntimeError("modèle absent")):
+                await self.send(viewer, action="summarize")
+                for comm in (producer, viewer):
+                    infos = [m for m in await self.until(comm, "info") if m["type"] == "info"]
+                    self.assertIn("modèle absent", infos[-1]["message"])
+            await producer.disconnect()
+            await viewer.disconnect()
+
+        self.run_session(scenario)
+
+    def test_lost_claim_turns_producer_into_viewer(self):
+        async def scenario():
+            producer = await self.connect(self.alice)
+            await self.send(producer, action="start", format="s16")
+            await self.until(producer, "info")
+            await cache.aset(live_sessions._key(self.reunion.pk), "specific.autre", 1)
+            msgs = await self.until(producer, "live")
+            self.assertEqual((msgs[-1]["recording"], msgs[-1]["producer"]), (True, False))
+            self.assertTrue(any("reprise" in m.get("message", "") for m in msgs))
+            # Plus producteur : un "stop" n'a plus d'effet
+            await self.send(producer, action="stop")
+            self.assertTrue(await producer.receive_nothing(0.3))
+            await producer.disconnect()
+
+        self.run_session(scenario)
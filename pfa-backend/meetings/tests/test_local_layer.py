@@ -0,0 +1,159 @@
+# meetings/tests/test_local_layer.py
+# =============================================================================
+# Couche de canaux locale (broker + LocalChannelLayer) et workers ASR en mode pull
+#   python manage.py test meetings.tests.test_local_layer
+# =============================================================================
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+from channels.exceptions import ChannelFull
+from django.test import SimpleTestCase
+
+from meetings.utils import asr_remote
+from meetings.utils.local_layer import ChannelBroker, LocalChannelLayer
+
+
+class _BrokerTestCase(SimpleTestCase):
+    broker_config = {}
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "channels.sock")
+
+    async def start_broker(self):
+        self.broker = ChannelBroker(path=self.path, **self.broker_config)
+        self.server = asyncio.ensure_future(self.broker.serve())
+        while not os.path.exists(self.path):
+            await asyncio.sleep(0.01)
+        self.layers = []
+
+    async def stop_broker(self):
+        for layer in self.layers:
+            await layer.close()
+        self.server.cancel()
+        await asyncio.gather(self.server, return_exceptions=True)
+
+    def layer(self) -> LocalChannelLayer:
+        layer = LocalChannelLayer(path=self.path)
+        self.layers.append(layer)
+        return layer
+
+
+class LocalChannelLayerTests(_BrokerTestCase):
+    broker_config = {"capacity": 3, "channel_capacity": {"asr-*": 1}}
+
+    async def test_send_receive_both_orders(self):
+        await self.start_broker()
+        a, b = self.layer(), self.layer()
+        await a.send("c1", {"type": "x", "n": 1})  # mis en file
+        self.assertEqual((await b.receive("c1"))["n"], 1)
+        waiting = asyncio.ensure_future(b.receive("c2"))  # attente longue côté broker
+        await asyncio.sleep(0.05)
+        await a.send("c2", {"type": "x", "n": 2})
+        self.assertEqual((await asyncio.wait_for(waiting, 2))["n"], 2)
+        await self.stop_broker()
+
+    async def test_groups(self):
+        await self.start_broker()
+        a = self.layer()
+        await a.group_add("g", "c1")
+        await a.group_add("g", "c2")
+        await a.group_send("g", {"type": "x"})
+        self.assertEqual(await a.receive("c1"), {"type": "x"})
+        self.assertEqual(await a.receive("c2"), {"type": "x"})
+        await a.group_discard("g", "c2")
+        await a.group_send("g", {"type": "y"})
+        self.assertEqual(await a.receive("c1"), {"type": "y"})
+        self.assertFalse(self.broker.queues.get("c2"))
+        await self.stop_broker()
+
+    async def test_capacity_and_channel_capacity(self):
+        await self.start_broker()
+        a = self.layer()
+        for _ in range(3):
+            await a.send("other", {"type": "x"})
+        with self.assertRaises(ChannelFull):
+            await a.send("other", {"type": "x"})
+        await a.send("asr-windows", {"type": "x"})
+        with self.assertRaises(ChannelFull):
+            await a.send("asr-windows", {"type": "x"})  # motif "asr-*" : 1 message
+        await self.stop_broker()
+
+    async def test_cancelled_receive_loses_nothing(self):
+        await self.start_broker()
+        a, b = self.layer(), self.layer()
+        waiting = asyncio.ensure_future(b.receive("c"))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        await a.send("c", {"type": "x", "n": 1})
+        self.assertEqual((await asyncio.wait_for(b.receive("c"), 2))["n"], 1)
+        await self.stop_broker()
+
+
+class PullWorkerTests(_BrokerTestCase):
+    broker_config = {"capacity": 100}
+
+    async def test_busy_workers_leave_windows_in_shared_queue(self):
+        await self.start_broker()
+        handled, release = [], asyncio.Event()
+
+        async def handle(layer, message):
+            handled.append(message["id"])
+            await release.wait()
+
+        with mock.patch.object(asr_remote, "handle_window", handle):
+            workers = [asyncio.ensure_future(asr_remote.pull_windows(self.layer(), "asr")) for _ in range(2)]
+            client = self.layer()
+            for i in range(6):
+                await client.send("asr", {"type": "asr.window", "id": i})
+            await asyncio.sleep(0.2)
+            # Une fenêtre en cours par worker, le reste attend au broker (pas chez un worker)
+            self.assertEqual(sorted(handled), [0, 1])
+            self.assertEqual(len(self.broker.queues["asr"]), 4)
+
+            # Un worker meurt : seule sa fenêtre en cours est perdue
+            workers[0].cancel()
+            await asyncio.gather(workers[0], return_exceptions=True)
+            release.set()
+            for _ in range(50):
+                if len(handled) == 6:
+                    break
+                await asyncio.sleep(0.02)
+            self.assertEqual(sorted(handled), list(range(6)))
+            workers[1].cancel()
+            await asyncio.gather(workers[1], return_exceptions=True)
+        await self.stop_broker()
+
+
+class RemoteASRTests(_BrokerTestCase):
+    async def test_window_read_from_shared_memory_by_worker(self):
+        from meetings.utils import transcsumm
+        from meetings.utils.audio_buffer import SharedPCMRingBuffer
+
+        await self.start_broker()
+        seen = []
+
+        def fake_transcribe(audio, lang, model_id=None):
+            seen.append(audio.copy())
+            return [(0.0, audio.size / 16000, f" {lang}")]
+
+        pcm = SharedPCMRingBuffer(16000)
+        self.addCleanup(pcm.close)
+        pcm.append(np.arange(8000, dtype=np.float32))
+        with mock.patch.object(transcsumm, "transcribe_window", fake_transcribe):
+            worker = asyncio.ensure_future(asr_remote.pull_windows(self.layer(), "asr"))
+            remote = asr_remote.RemoteASR(self.layer(), "asr", timeout=5)
+            with pcm.lease():
+                words = await remote.run(pcm.ref(2000, 6000), "fr")
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+        self.assertEqual(words, [(0.0, 0.25, " fr")])
+        np.testing.assert_array_equal(seen[0], np.arange(2000, 6000, dtype=np.float32))
+        await self.stop_broker()
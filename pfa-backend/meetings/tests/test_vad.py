@@ -0,0 +1,85 @@
+# meetings/tests/test_vad.py
+# =============================================================================
+# VAD par énergie et politique de déclenchement ASR (meetings/utils/vad.py)
+#   python manage.py test meetings.tests.test_vad
+# =============================================================================
+import numpy as np
+from django.test import SimpleTestCase
+
+from meetings.utils.vad import EnergyVAD, FlushPolicy
+
+SR = 16000
+CHUNK = SR // 10  # trames de 100 ms, comme le navigateur
+
+
+def tone(sec: float, amp: float = 0.3) -> np.ndarray:
+    t = np.arange(int(sec * SR)) / SR
+    return (amp * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(sec: float) -> np.ndarray:
+    return np.zeros(int(sec * SR), dtype=np.float32)
+
+
+def run(policy: FlushPolicy, audio: np.ndarray):
+    """Actions décidées au fil des trames : [(position en s, action)]."""
+    actions = []
+    for i in range(0, audio.size, CHUNK):
+        policy.feed(audio[i:i + CHUNK])
+        action = policy.decide()
+        if action:
+            policy.mark_flushed(action)
+            actions.append((min(i + CHUNK, audio.size) / SR, action))
+    return actions
+
+
+class FlushPolicyTests(SimpleTestCase):
+    def make(self):
+        return FlushPolicy(SR, EnergyVAD(SR), pause_sec=0.4, max_latency_sec=4.0)
+
+    def test_leading_silence_does_not_shorten_latency_cap(self):
+        # 3 s de silence puis 2 s de parole : une seule passe, à la pause finale
+        actions = run(self.make(), np.concatenate([silence(3), tone(2), silence(1)]))
+        self.assertEqual([a for _, a in actions], [FlushPolicy.PAUSE])
+
+    def test_repeated_utterances_flush_on_pauses_only(self):
+        policy = self.make()
+        run(policy, np.concatenate([silence(3), tone(2)] * 10 + [silence(1)]))
+        self.assertEqual(policy.counts[FlushPolicy.ASR], 0)
+        self.assertEqual(policy.counts[FlushPolicy.PAUSE], 10)
+
+    def test_latency_cap_counts_from_first_speech(self):
+        # Parole continue après 3 s de silence : plafond atteint 4 s après son début
+        actions = run(self.make(), np.concatenate([silence(3), tone(10)]))
+        first_asr = next(t for t, a in actions if a == FlushPolicy.ASR)
+        self.assertGreaterEqual(first_asr, 3 + 4.0)
+        self.assertLess(first_asr, 3 + 4.0 + 0.2)
+
+    def test_silence_only_is_skipped(self):
+        policy = self.make()
+        run(policy, silence(10))
+        self.assertEqual(policy.counts[FlushPolicy.ASR] + policy.counts[FlushPolicy.PAUSE], 0)
+        self.assertGreater(policy.counts[FlushPolicy.SKIP], 0)
+
+    def test_flush_clears_trailing_silence(self):
+        policy = self.make()
+        run(policy, np.concatenate([tone(1), silence(0.5)]))
+        self.assertEqual(policy.silence, 0)
+        # Parole qui reprend : pas de PAUSE immédiate sur l'ancien silence
+        policy.feed(tone(0.3))
+        self.assertIsNone(policy.decide())
+
+
+class EnergyVADTests(SimpleTestCase):
+    def test_noise_floor_rises_under_steady_noise(self):
+        vad = EnergyVAD(SR)
+        noise = (np.random.default_rng(0).standard_normal(3 * SR) * 10 ** (-40 / 20)).astype(np.float32)
+        flags = np.concatenate([vad(noise[i:i + CHUNK]) for i in range(0, noise.size, CHUNK)])
+        self.assertFalse(flags[-len(flags) // 3:].any())
+
+    def test_chunking_does_not_change_flags(self):
+        audio = np.concatenate([silence(1), tone(1), silence(1), tone(0.5, 0.05)])
+        whole = EnergyVAD(SR)(audio)
+        vad = EnergyVAD(SR)
+        pieces = np.concatenate([vad(audio[i:i + 1234]) for i in range(0, audio.size, 1234)])
+        np.testing.assert_array_equal(whole, pieces)
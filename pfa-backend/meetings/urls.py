@@ -1,7 +1,5 @@
 from django.urls import path, include
 from . import views
-from django.urls import re_path
-from .utils import transcsumm
 # Définition des patterns d'URL de l'application
 urlpatterns = [
     # Page d'accueil/racine de l'application (page de connexion)
@@ -41,8 +39,16 @@ urlpatterns = [
     path("transcription/<int:reunion_id>/", views.transcription_page, name="transcription"),
     # URL pour sauvegarder une transcription
     path("transcription/<int:reunion_id>/save/", views.save_transcription, name="save_transcription"),
+    # URL pour importer un enregistrement audio (transcription en tâche de fond)
+    path("transcription/<int:reunion_id>/upload/", views.upload_audio, name="upload_audio"),
+    # URL pour suivre l'avancement d'une tâche de transcription
+    path("transcription/jobs/<int:job_id>/", views.transcription_job_status, name="transcription_job_status"),
     # URL pour prévisualiser le rapport d'une réunion
     path("transcription/<int:pk>/report/preview/", views.meeting_report_view, name="meeting_report_view"),
     # URL pour générer un rapport au format DOCX
     path("transcription/<int:reunion_id>/report/docx/", views.generate_report, name="generate_report"),
+    # URL des métriques du worker (collecteur type Prometheus)
+    path("metrics/", views.metrics_view, name="metrics"),
+    # URL du rapport de profilage des requêtes (staff)
+    path("profiling/", views.profiling_report, name="profiling_report"),
 ]
\ No newline at end of file
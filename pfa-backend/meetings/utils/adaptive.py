@@ -0,0 +1,103 @@
+# meetings/utils/adaptive.py
+# =============================================================================
+# Qualité ASR adaptative sous charge (sessions live)
+# - Chaque session mesure son facteur temps réel (temps d'une passe / audio de
+#   la fenêtre, attente de l'exécuteur comprise) et son retard (audio arrivé
+#   pendant la passe, pas encore traité)
+# - Sous pression : profil moins coûteux (modèle plus petit, fenêtres plus
+#   courtes, déclenchements plus espacés) ; retour au profil supérieur quand la
+#   charge retombe, avec hystérésis et durée minimale par profil
+# - Mieux vaut rester en direct avec moins de précision que prendre des minutes de retard
+# =============================================================================
+import logging
+import time
+from collections import Counter
+from typing import List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Du plus précis au moins coûteux ; "model": None = ASR_MODEL
+DEFAULT_PROFILES = [
+    {"name": "normal", "model": None, "max_window_sec": 15.0, "max_latency_sec": 4.0, "min_new_sec": 2.0},
+    {"name": "eco", "model": "base", "max_window_sec": 10.0, "max_latency_sec": 6.0, "min_new_sec": 3.0},
+    {"name": "survie", "model": "tiny", "max_window_sec": 8.0, "max_latency_sec": 8.0, "min_new_sec": 4.0},
+]
+
+# Sessions par profil et changements de profil (lus par les métriques)
+profile_sessions = Counter()
+profile_switches = Counter()
+
+
+def asr_profiles() -> List[dict]:
+    return getattr(settings, "ASR_PROFILES", DEFAULT_PROFILES)
+
+
+class QualityController:
+    """
+    Choix du profil ASR d'une session.
+
+    ``observe(compute_sec, audio_sec, backlog_sec)`` après chaque passe ;
+    renvoie le nouveau profil quand il change, sinon None.
+    """
+
+    DEGRADE_RTF = 0.8      # passe presque aussi longue que l'audio : on décroche
+    DEGRADE_BACKLOG = 6.0  # secondes d'audio en attente après une passe
+    RECOVER_RTF = 0.35     # marge confortable pour remonter d'un cran
+    RECOVER_BACKLOG = 1.5
+    MIN_DWELL_SEC = 15.0   # durée minimale dans un profil avant de remonter
+    DEGRADE_DWELL_SEC = 3.0  # …et avant de redescendre (une passe lente isolée ne suffit pas)
+    ALPHA = 0.3            # lissage exponentiel du RTF
+
+    def __init__(self, profiles: List[dict] = None, clock=time.monotonic):
+        self.profiles = profiles or asr_profiles()
+        self.clock = clock
+        self.level = 0
+        self.rtf = None
+        self.backlog = 0.0
+        self._since = clock()
+        profile_sessions[self.profile["name"]] += 1
+
+    @property
+    def profile(self) -> dict:
+        return self.profiles[self.level]
+
+    def observe(self, compute_sec: float, audio_sec: float, backlog_sec: float) -> Optional[dict]:
+        if audio_sec <= 0:
+            return None
+        rtf = compute_sec / audio_sec
+        self.rtf = rtf if self.rtf is None else self.rtf + self.ALPHA * (rtf - self.rtf)
+        self.backlog = backlog_sec
+
+        dwell = self.clock() - self._since
+        if ((self.rtf > self.DEGRADE_RTF or backlog_sec > self.DEGRADE_BACKLOG)
+                and self.level < len(self.profiles) - 1 and dwell >= self.DEGRADE_DWELL_SEC):
+            return self._switch(self.level + 1, "charge")
+        if (self.level > 0 and self.rtf < self.RECOVER_RTF and backlog_sec < self.RECOVER_BACKLOG
+                and dwell >= self.MIN_DWELL_SEC):
+            return self._switch(self.level - 1, "retour")
+        return None
+
+    def _switch(self, level: int, reason: str) -> dict:
+        old = self.profile["name"]
+        self.level = level
+        self._since = self.clock()
+        # Le RTF mesuré valait pour l'ancien profil : on repart de la prochaine passe
+        self.rtf = None
+        new = self.profile["name"]
+        profile_sessions[old] -= 1
+        profile_sessions[new] += 1
+        profile_switches[f"{old}->{new}"] += 1
+        logger.info("Profil ASR %s -> %s (%s, retard %.1f s)", old, new, reason, self.backlog)
+        return self.profile
+
+    def state(self) -> dict:
+        return {
+            "profile": self.profile["name"],
+            "rtf": round(self.rtf, 3) if self.rtf is not None else None,
+            "backlog_sec": round(self.backlog, 2),
+        }
+
+    def close(self):
+        profile_sessions[self.profile["name"]] -= 1
@@ -0,0 +1,85 @@
+# meetings/utils/asr_executor.py
+# =============================================================================
+# Exécuteur borné pour l'inférence bloquante (Whisper) hors de la boucle ASGI
+# - Pool de threads (défaut) ou de processus, choisi dans les settings
+# - Limite de concurrence par worker : les sessions en surplus attendent
+#   (sans bloquer la boucle) qu'une place se libère
+# =============================================================================
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+
+
+def _init_process_worker(settings_module: str):
+    """Processus 'spawn' : Django doit être initialisé (settings, modèles ORM importés)."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+class ASRExecutor:
+    """
+    Enveloppe asynchrone autour d'un pool d'exécution.
+
+    ``await executor.run(fn, *args)`` exécute ``fn`` dans le pool et rend la
+    main à la boucle d'événements pendant le calcul. ``initializer`` (pool de
+    threads) est appelé au démarrage de chaque thread.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 2, initializer=None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"ASR_EXECUTOR inconnu : {kind!r} (thread|process)")
+        self.kind = kind
+        self.max_workers = max(1, int(max_workers))
+        if kind == "process":
+            # 'spawn' : pas de fork d'un processus qui a déjà des threads torch/CT2
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "meeting_project.settings"),),
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="asr", initializer=initializer
+            )
+        self._sem = None  # créé dans la boucle courante au premier appel
+        self.waiting = 0  # appels en attente d'une place
+        self.running = 0  # appels en cours dans le pool
+
+    async def run(self, fn, *args):
+        """Exécute ``fn(*args)`` dans le pool en respectant la limite de concurrence."""
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_workers)
+        loop = asyncio.get_running_loop()
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            return await loop.run_in_executor(self._pool, fn, *args)
+        finally:
+            self.running -= 1
+            self._sem.release()
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+_executor = None
+
+
+def get_asr_executor() -> ASRExecutor:
+    """Exécuteur partagé par toutes les sessions du worker (créé à la demande)."""
+    global _executor
+    if _executor is None:
+        _executor = ASRExecutor(
+            kind=getattr(settings, "ASR_EXECUTOR", "thread"),
+            max_workers=getattr(settings, "ASR_MAX_WORKERS", 2),
+        )
+    return _executor
@@ -0,0 +1,209 @@
+# meetings/utils/asr_remote.py
+# =============================================================================
+# ASR dans des processus workers séparés du serveur web (ASR_REMOTE)
+# - Côté ASGI : la session envoie sa fenêtre sur le canal ASR_REMOTE_CHANNEL
+#   (segment de mémoire partagée + décalage, pas l'audio) et attend le texte
+#   sur un canal de réponse propre au processus
+# - Côté worker (manage.py asr_workers) : chaque processus ne tire la
+#   fenêtre suivante qu'une fois libre (pull_windows), relit l'audio dans le
+#   segment et lance Whisper ; rien ne s'accumule chez un worker occupé
+# - Un worker qui meurt ne coupe aucune session : la fenêtre en vol expire
+#   (ASR_REMOTE_TIMEOUT), l'erreur est signalée et la passe suivante repart
+# =============================================================================
+import asyncio
+import itertools
+import logging
+import mmap
+import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+from channels.consumer import AsyncConsumer
+from channels.exceptions import ChannelFull
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def asr_channel() -> str:
+    return getattr(settings, "ASR_REMOTE_CHANNEL", "asr-windows")
+
+
+class RemoteASRError(RuntimeError):
+    pass
+
+
+# -----------------------------------------------------------------------------
+# Côté serveur ASGI
+# -----------------------------------------------------------------------------
+class RemoteASR:
+    """
+    Client partagé par les sessions du processus.
+
+    ``await remote.run(window, lang, model_id)`` : ``window`` vient de
+    ``SharedPCMRingBuffer.ref()`` (même machine) ou contient l'audio brut
+    (``{"audio": bytes, "dtype", "n"}``, workers sur une autre machine).
+    """
+
+    def __init__(self, layer, channel: str, timeout: float = 60.0):
+        self.layer = layer
+        self.channel = channel
+        self.timeout = timeout
+        self._futures = {}
+        self._ids = itertools.count(1)
+        self._reply = None
+        self._listener = None
+
+    @property
+    def pending(self) -> int:
+        """Fenêtres envoyées sans réponse (en file ou en cours chez un worker)."""
+        return len(self._futures)
+
+    async def run(self, window: dict, lang: str, model_id: str = None):
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._reply = await self.layer.new_channel("asr-reply")
+            self._listener = loop.create_task(self._listen(self._reply))
+        req = next(self._ids)
+        fut = self._futures[req] = loop.create_future()
+        try:
+            await self.layer.send(self.channel, {
+                "type": "asr.window", "reply": self._reply, "id": req,
+                "lang": lang, "model": model_id, **window,
+            })
+            return await asyncio.wait_for(fut, self.timeout)
+        except ChannelFull:
+            raise RemoteASRError("file des workers ASR pleine")
+        except asyncio.TimeoutError:
+            raise RemoteASRError(f"aucun worker ASR n'a répondu en {self.timeout:.0f} s")
+        finally:
+            self._futures.pop(req, None)
+
+    async def _listen(self, reply: str):
+        try:
+            while True:
+                msg = await self.layer.receive(reply)
+                fut = self._futures.get(msg.get("id"))
+                if fut is None or fut.done():
+                    continue  # réponse arrivée après expiration
+                if msg.get("error"):
+                    fut.set_exception(RemoteASRError(msg["error"]))
+                else:
+                    # msgpack (Redis) rend des listes : mots remis en tuples
+                    fut.set_result([tuple(w) for w in msg["words"]])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Canal de réponse ASR interrompu")
+            for fut in list(self._futures.values()):
+                if not fut.done():
+                    fut.set_exception(RemoteASRError(f"canal de réponse interrompu : {e}"))
+
+
+_remote = None
+
+
+def get_remote_asr():
+    """Client du processus si ASR_REMOTE est actif, sinon None (ASR local)."""
+    global _remote
+    if not getattr(settings, "ASR_REMOTE", False):
+        return None
+    if _remote is None:
+        layer = get_channel_layer()
+        if layer is None:
+            raise RemoteASRError("ASR_REMOTE nécessite CHANNEL_LAYERS")
+        _remote = RemoteASR(layer, asr_channel(), getattr(settings, "ASR_REMOTE_TIMEOUT", 60.0))
+    return _remote
+
+
+# -----------------------------------------------------------------------------
+# Côté worker ASR
+# -----------------------------------------------------------------------------
+_attached = OrderedDict()  # segments des sessions récentes, gardés projetés
+_closing = []              # évincés, encore exportés par une vue
+
+
+def _attach(name: str) -> mmap.mmap:
+    """
+    Projection du segment d'une session. Pas de SharedMemory ici : il
+    inscrirait le segment auprès du resource tracker, qui le supprimerait à
+    l'arrêt du worker alors que le serveur ASGI en est le propriétaire.
+    Copie à l'écriture : le tampon de la session n'est jamais modifié.
+    """
+    buf = _attached.pop(name, None)
+    if buf is None:
+        fd = os.open(os.path.join("/dev/shm", name.lstrip("/")), os.O_RDONLY)
+        try:
+            buf = mmap.mmap(fd, 0, access=mmap.ACCESS_COPY)
+        finally:
+            os.close(fd)
+    _attached[name] = buf
+    while len(_attached) > getattr(settings, "ASR_REMOTE_SHM_CACHE", 32):
+        _closing.append(_attached.popitem(last=False)[1])
+    for old in list(_closing):
+        try:
+            old.close()
+            _closing.remove(old)
+        except BufferError:
+            pass
+    return buf
+
+
+def read_window(message: dict) -> np.ndarray:
+    """Fenêtre décrite par un message ``asr.window`` (vue sans copie du segment partagé)."""
+    dtype = np.dtype(message.get("dtype", "<f4"))
+    if "audio" in message:
+        return np.frombuffer(message["audio"], dtype=dtype, count=message["n"])
+    return np.frombuffer(_attach(message["shm"]), dtype=dtype, count=message["n"],
+                         offset=message["offset"] * dtype.itemsize)
+
+
+async def handle_window(layer, message: dict):
+    """Transcrit une fenêtre ``asr.window`` et répond sur son canal de réponse."""
+    from .transcsumm import transcribe_window  # module du consumer web, importé à la demande
+
+    reply = {"type": "asr.result", "id": message["id"]}
+    t0 = time.perf_counter()
+    try:
+        audio = read_window(message)
+        words = await asyncio.get_running_loop().run_in_executor(
+            None, transcribe_window, audio, message["lang"], message.get("model"),
+        )
+        del audio  # le segment peut être refermé à l'éviction suivante
+        reply["words"] = [(float(s), float(e), str(w)) for s, e, w in words]
+    except Exception as e:
+        logger.exception("Fenêtre ASR en échec")
+        reply["error"] = f"{type(e).__name__}: {e}"
+    reply["worker_sec"] = round(time.perf_counter() - t0, 4)
+    try:
+        await layer.send(message["reply"], reply)
+    except ChannelFull:
+        logger.warning("Réponse ASR perdue : canal %s plein", message["reply"])
+
+
+async def pull_windows(layer, channel: str):
+    """
+    Boucle d'un processus worker : une fenêtre demandée à la couche de canaux
+    seulement quand la précédente est traitée. Les fenêtres en attente restent
+    dans la file partagée (broker ou Redis), prises par le premier worker
+    libre ; un worker qui meurt n'emporte que la fenêtre en cours.
+    """
+    while True:
+        message = await layer.receive(channel)
+        if message.get("type") == "asr.window":
+            await handle_window(layer, message)
+        else:
+            logger.warning("Message ignoré sur %s : %r", channel, message.get("type"))
+
+
+class ASRWorkerConsumer(AsyncConsumer):
+    """
+    Consumer du canal ASR_REMOTE_CHANNEL (routé dans asgi.py) pour
+    ``runworker`` ; ``asr_workers`` lui préfère ``pull_windows``, runworker
+    vidant le canal dans une file locale sans borne.
+    """
+
+    async def asr_window(self, message):
+        await handle_window(self.channel_layer, message)
@@ -0,0 +1,131 @@
+# meetings/utils/asr_scheduler.py
+# =============================================================================
+# Ordonnanceur ASR inter-sessions (micro-batching)
+# - Chaque session soumet sa fenêtre PCM et attend son texte
+# - Les fenêtres en attente sont regroupées jusqu'à ASR_BATCH_SIZE éléments
+#   ou ASR_BATCH_MAX_WAIT_MS millisecondes, puis décodées en un seul appel
+# - Statistiques de débit / latence par taille de lot
+# =============================================================================
+import asyncio
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from .asr_executor import get_asr_executor
+
+
+class BatchedASRScheduler:
+    """
+    File d'attente commune à toutes les sessions du worker.
+
+    ``batch_fn(audios, langs) -> List[str]`` est la fonction bloquante qui
+    décode un lot ; elle est exécutée dans l'exécuteur ASR partagé.
+    """
+
+    def __init__(self, batch_fn, batch_size: int = 8, max_wait_ms: float = 150, sr: int = 16000):
+        self.batch_fn = batch_fn
+        self.batch_size = max(1, int(batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.sr = sr
+        self._pending = []  # [(audio, lang, future, t_submit)]
+        self._timer = None
+        self._inflight = set()  # références fortes vers les lots en cours
+        # Statistiques par taille de lot effective
+        self._stats = defaultdict(lambda: {
+            "batches": 0, "items": 0, "audio_sec": 0.0,
+            "compute_sec": 0.0, "latency_sec": 0.0, "latency_max_sec": 0.0,
+        })
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, audio, lang: str) -> str:
+        """Ajoute une fenêtre au prochain lot et attend sa transcription."""
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((audio, lang, fut, time.perf_counter()))
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._dispatch)
+        return await fut
+
+    def _dispatch(self):
+        """Détache un lot de la file et lance son décodage en tâche de fond."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            if len(self._pending) < self.batch_size:
+                break
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._dispatch)
+
+    async def _run_batch(self, batch):
+        audios = [b[0] for b in batch]
+        langs = [b[1] for b in batch]
+        t0 = time.perf_counter()
+        try:
+            texts = await get_asr_executor().run(self.batch_fn, audios, langs)
+        except Exception as e:
+            for _a, _l, fut, _t in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        t1 = time.perf_counter()
+
+        st = self._stats[len(batch)]
+        st["batches"] += 1
+        st["items"] += len(batch)
+        st["audio_sec"] += sum(a.size for a in audios) / self.sr
+        st["compute_sec"] += t1 - t0
+        for (_a, _l, fut, t_submit), text in zip(batch, texts):
+            lat = t1 - t_submit
+            st["latency_sec"] += lat
+            st["latency_max_sec"] = max(st["latency_max_sec"], lat)
+            if not fut.done():
+                fut.set_result(text)
+
+    def stats(self) -> dict:
+        """
+        Débit et latence par taille de lot :
+        - rtf_throughput : secondes d'audio décodées par seconde de calcul
+        - latency_avg_sec : soumission -> résultat (attente + calcul)
+        """
+        out = {}
+        for size, st in sorted(self._stats.items()):
+            out[size] = {
+                "batches": st["batches"],
+                "items": st["items"],
+                "rtf_throughput": round(st["audio_sec"] / st["compute_sec"], 2) if st["compute_sec"] else None,
+                "latency_avg_sec": round(st["latency_sec"] / st["items"], 3) if st["items"] else None,
+                "latency_max_sec": round(st["latency_max_sec"], 3),
+            }
+        return out
+
+
+_scheduler = None
+
+
+def get_asr_scheduler():
+    """
+    Ordonnanceur partagé du worker, ou None si le batching est désactivé
+    (ASR_BATCH_SIZE <= 1 : chaque session appelle l'exécuteur directement).
+    """
+    global _scheduler
+    if getattr(settings, "ASR_BATCH_SIZE", 1) <= 1:
+        return None
+    if _scheduler is None:
+        from .transcsumm import transcribe_batch  # import tardif (évite le cycle)
+        _scheduler = BatchedASRScheduler(
+            transcribe_batch,
+            batch_size=settings.ASR_BATCH_SIZE,
+            max_wait_ms=getattr(settings, "ASR_BATCH_MAX_WAIT_MS", 150),
+        )
+    return _scheduler
@@ -0,0 +1,240 @@
+# meetings/utils/audio_buffer.py
+# =============================================================================
+# Tampon PCM borné pour le flux audio live (un par session WebSocket)
+# - Mémoire préallouée une fois, capacité fixe (pas de np.concatenate par trame)
+# - Positions exprimées en samples "absolus" depuis le début de la session
+# - Vues numpy contiguës (zéro copie) pour l'ASR, protégées par un "bail"
+#   pendant que l'inférence tourne dans un autre thread
+# - Variante en mémoire partagée : fenêtres lues par les workers ASR distants
+#   (ASR_REMOTE) sans copie ni sérialisation
+# =============================================================================
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class PCMRingBuffer:
+    """
+    Tampon circulaire "linéarisé" de PCM Float32.
+
+    Les données valides occupent toujours une zone contiguë [head:tail] du
+    tableau préalloué : quand la fin du tableau est atteinte, la fenêtre
+    retenue est recopiée au début (compaction, coût amorti O(1) par sample).
+    On peut ainsi donner à Whisper une simple vue numpy, sans copie.
+
+    Si le consommateur ne libère pas assez vite (ASR en retard), les samples
+    les plus anciens sont écrasés et comptés dans ``dropped``.
+
+    Tant qu'une vue est "louée" (``lease``), aucune donnée n'est déplacée en
+    place : la compaction bascule sur un nouveau tableau et l'ancien reste
+    intact pour le lecteur.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        if capacity <= 0:
+            raise ValueError("capacity doit être > 0")
+        self._buf = self._alloc(capacity, dtype)
+        self._head = 0      # index (dans _buf) du plus ancien sample retenu
+        self._tail = 0      # index (dans _buf) de fin des données
+        self._base = 0      # position absolue de _buf[0]
+        self.dropped = 0    # samples perdus par débordement
+        self._leases = 0    # vues en cours d'utilisation hors boucle
+
+    # ------------------------------------------------------------------ état
+    @property
+    def capacity(self) -> int:
+        return self._buf.size
+
+    @property
+    def start(self) -> int:
+        """Position absolue du plus ancien sample encore disponible."""
+        return self._base + self._head
+
+    @property
+    def end(self) -> int:
+        """Position absolue de fin (= nombre total de samples reçus)."""
+        return self._base + self._tail
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire réservée par le tampon (octets), indépendante de la durée."""
+        return self._buf.nbytes
+
+    def stats(self) -> dict:
+        """Résumé mémoire/remplissage pour le suivi par session."""
+        return {
+            "capacity_samples": self.capacity,
+            "buffered_samples": len(self),
+            "total_samples": self.end,
+            "dropped_samples": self.dropped,
+            "bytes": self.nbytes,
+        }
+
+    def reset(self):
+        """Vide le tampon (sans réallouer si aucune vue n'est louée)."""
+        if self._leases:
+            self._buf = self._alloc(self.capacity, self._buf.dtype)
+        self._head = self._tail = self._base = 0
+        self.dropped = 0
+
+    def _alloc(self, capacity: int, dtype) -> np.ndarray:
+        """Nouveau tableau de travail (au départ, ou quand une vue louée doit rester intacte)."""
+        return np.zeros(capacity, dtype=dtype)
+
+    def close(self):
+        """Libère la mémoire hors tas Python (rien à faire ici)."""
+
+    # -------------------------------------------------------------- écriture
+    def append(self, chunk: np.ndarray, scale: float = None):
+        """
+        Ajoute des samples en fin de tampon (copie unique dans _buf).
+        ``scale`` convertit à la volée un PCM entier (ex. int16 -> 1/32768)
+        directement dans le tampon, sans tableau intermédiaire.
+        """
+        n = chunk.size
+        if n == 0:
+            return
+        cap = self.capacity
+
+        # Trame plus grande que la capacité : on ne garde que la fin
+        if n >= cap:
+            self.dropped += len(self) + (n - cap)
+            self._base += self._tail + (n - cap)
+            if self._leases:
+                self._buf = self._alloc(cap, self._buf.dtype)
+            self._write(self._buf, chunk[n - cap:], scale)
+            self._head, self._tail = 0, cap
+            return
+
+        if self._tail + n > cap:
+            # Débordement : on sacrifie les plus anciens samples
+            overflow = len(self) + n - cap
+            if overflow > 0:
+                self.dropped += overflow
+                self._head += overflow
+            self._compact()
+
+        self._write(self._buf[self._tail:self._tail + n], chunk, scale)
+        self._tail += n
+
+    @staticmethod
+    def _write(dst: np.ndarray, src: np.ndarray, scale):
+        if scale is None:
+            dst[...] = src
+        else:
+            np.multiply(src, scale, out=dst, casting="unsafe")
+
+    def _compact(self):
+        """Ramène la fenêtre retenue au début du tableau (numpy gère le recouvrement)."""
+        size = len(self)
+        if self._head:
+            if self._leases:
+                # Une vue est lue ailleurs : copie vers un nouveau tableau
+                buf = self._alloc(self.capacity, self._buf.dtype)
+                buf[:size] = self._buf[self._head:self._tail]
+                self._buf = buf
+            else:
+                self._buf[:size] = self._buf[self._head:self._tail]
+            self._base += self._head
+            self._head, self._tail = 0, size
+
+    # ---------------------------------------------------------------- lecture
+    def view(self, from_pos: int, to_pos: int = None) -> np.ndarray:
+        """
+        Vue (zéro copie) des samples entre les positions absolues ``from_pos``
+        et ``to_pos`` (fin par défaut). Valide jusqu'au prochain ``append``,
+        ou jusqu'à la fin du ``lease`` englobant.
+        """
+        i, j = self._span(from_pos, to_pos)
+        return self._buf[i:j]
+
+    def _span(self, from_pos: int, to_pos: int = None):
+        """Indices dans _buf correspondant aux positions absolues."""
+        i = max(from_pos, self.start) - self._base
+        j = self._tail if to_pos is None else min(to_pos, self.end) - self._base
+        return i, max(i, j)
+
+    @contextmanager
+    def lease(self):
+        """Garantit que les vues prises dans le bloc ne seront pas écrasées."""
+        self._leases += 1
+        try:
+            yield self
+        finally:
+            self._leases -= 1
+
+    def discard_before(self, pos: int):
+        """Libère les samples antérieurs à la position absolue ``pos``."""
+        i = min(max(pos - self._base, self._head), self._tail)
+        self._head = i
+        if self._head == self._tail and not self._leases:
+            # Tampon vide : repartir du début sans copie
+            self._base += self._head
+            self._head = self._tail = 0
+
+
+class SharedPCMRingBuffer(PCMRingBuffer):
+    """
+    Tampon dont le tableau vit dans un segment de mémoire partagée POSIX.
+
+    ``ref()`` décrit une fenêtre (segment, décalage, longueur) qu'un autre
+    processus relit sans copie. Quand le tableau doit être remplacé pendant un
+    bail, l'ancien segment reste lisible jusqu'à la fin du dernier bail, puis
+    il est supprimé. Le processus créateur est seul propriétaire des segments
+    (``close()`` à la fin de la session ; le resource tracker de
+    multiprocessing les supprime si le processus meurt).
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        self._segments = []  # segment courant en dernier, anciens encore loués avant
+        self._closing = []   # supprimés, à fermer quand plus aucune vue ne les exporte
+        super().__init__(capacity, dtype)
+
+    def _alloc(self, capacity: int, dtype) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, capacity * dtype.itemsize))
+        self._segments.append(shm)
+        # frombuffer garde un export du segment : close() échoue tant qu'une vue existe
+        return np.frombuffer(shm.buf, dtype=dtype, count=capacity)  # mis à zéro par le noyau
+
+    @property
+    def segment(self) -> str:
+        return self._segments[-1].name
+
+    def ref(self, from_pos: int, to_pos: int = None) -> dict:
+        """Descripteur de la fenêtre ``view(from_pos, to_pos)``, à utiliser pendant un bail."""
+        i, j = self._span(from_pos, to_pos)
+        return {"shm": self.segment, "offset": i, "n": j - i, "dtype": self._buf.dtype.str}
+
+    @contextmanager
+    def lease(self):
+        with super().lease():
+            yield self
+        if not self._leases and len(self._segments) > 1:
+            for shm in self._segments[:-1]:
+                self._free(shm)
+            del self._segments[:-1]
+
+    def _free(self, shm):
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._closing.append(shm)
+        still = []
+        for s in self._closing:
+            try:
+                s.close()
+            except BufferError:  # une vue numpy de ce segment existe encore
+                still.append(s)
+        self._closing = still
+
+    def close(self):
+        self._buf = np.zeros(0, dtype=self._buf.dtype)
+        for shm in self._segments:
+            self._free(shm)
+        self._segments = []
@@ -0,0 +1,196 @@
+# meetings/utils/audio_codecs.py
+# =============================================================================
+# Formats audio négociés sur le socket de transcription (action "start")
+# - "f32"       : PCM Float32 16 kHz brut (historique, ~64 Ko/s)
+# - "s16"       : PCM int16 16 kHz (~32 Ko/s), converti directement dans le tampon
+# - "webm-opus" : sortie MediaRecorder (Opus/WebM, ~3 Ko/s), décodé par PyAV
+#                 (dépendance déjà tirée par faster-whisper) dans un thread dédié
+# Chaque décodeur écrit dans le PCMRingBuffer de la session et compte octets
+# reçus, samples produits et temps CPU de décodage.
+# =============================================================================
+import io
+import queue
+import threading
+import time
+
+import numpy as np
+
+SR = 16000
+
+
+class AudioDecoder:
+    """Interface commune : ``feed`` (octets reçus) puis ``finish``/``drain`` à l'arrêt."""
+
+    name = ""
+
+    def __init__(self):
+        self.bytes_in = 0
+        self.samples_out = 0
+        self.cpu_sec = 0.0
+        self.error = None  # exception du décodage (flux illisible) : l'enregistrement doit s'arrêter
+
+    def feed(self, data: bytes, pcm) -> int:
+        """Décode ``data`` dans ``pcm`` ; renvoie le nombre de samples ajoutés."""
+        raise NotImplementedError
+
+    def finish(self):
+        """Fin de flux (bloquant : à appeler hors de la boucle d'événements)."""
+
+    def drain(self, pcm) -> int:
+        """Transfère dans ``pcm`` ce qui a été décodé depuis le dernier appel."""
+        return 0
+
+    def close(self):
+        """Abandon du flux (déconnexion), sans attendre."""
+
+    def stats(self) -> dict:
+        audio_sec = self.samples_out / SR
+        return {
+            "format": self.name,
+            "bytes_in": self.bytes_in,
+            "audio_sec": round(audio_sec, 2),
+            "bytes_per_sec": round(self.bytes_in / audio_sec) if audio_sec else None,
+            "decode_ms_per_audio_sec": round(1000 * self.cpu_sec / audio_sec, 3) if audio_sec else None,
+        }
+
+
+class _RawPCMDecoder(AudioDecoder):
+    """PCM brut : vue numpy sur les octets reçus, écrite telle quelle dans le tampon."""
+
+    dtype = None
+    scale = None
+
+    def __init__(self):
+        super().__init__()
+        self._carry = b""  # octets d'un sample coupé entre deux trames
+
+    def feed(self, data: bytes, pcm) -> int:
+        t0 = time.perf_counter()
+        self.bytes_in += len(data)
+        if self._carry:
+            data = self._carry + data
+        width = np.dtype(self.dtype).itemsize
+        usable = len(data) - len(data) % width
+        self._carry = data[usable:]
+        chunk = np.frombuffer(data, dtype=self.dtype, count=usable // width)
+        pcm.append(chunk, scale=self.scale)
+        self.samples_out += chunk.size
+        self.cpu_sec += time.perf_counter() - t0
+        return chunk.size
+
+
+class Float32Decoder(_RawPCMDecoder):
+    name = "f32"
+    dtype = "<f4"
+
+
+class Int16Decoder(_RawPCMDecoder):
+    name = "s16"
+    dtype = "<i2"
+    scale = 1.0 / 32768.0
+
+
+class _BlockingStream(io.RawIOBase):
+    """Fichier en lecture seule alimenté au fil de l'eau (bloque tant que rien n'arrive)."""
+
+    def __init__(self):
+        self._q = queue.Queue()
+        self._buf = b""
+        self._eof = False
+
+    def push(self, data: bytes):
+        self._q.put(data)
+
+    def end(self):
+        self._q.put(None)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buf and not self._eof:
+            item = self._q.get()
+            if item is None:
+                self._eof = True
+            else:
+                self._buf = item
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+
+class WebMOpusDecoder(AudioDecoder):
+    """
+    Opus/WebM (MediaRecorder) décodé incrémentalement par PyAV.
+
+    Le démultiplexeur lit un flux bloquant dans un thread dédié ; les trames
+    rééchantillonnées en Float32 mono 16 kHz sont récupérées par ``drain``
+    depuis la boucle d'événements.
+    """
+
+    name = "webm-opus"
+
+    def __init__(self):
+        super().__init__()
+        self._stream = _BlockingStream()
+        self._out = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="webm-decode", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        import av  # dépendance de faster-whisper
+
+        try:
+            container = av.open(self._stream, mode="r", format="matroska")
+            resampler = av.AudioResampler(format="flt", layout="mono", rate=SR)
+            t0 = time.thread_time()
+            for frame in container.decode(audio=0):
+                for rf in resampler.resample(frame):
+                    self._out.put(rf.to_ndarray().reshape(-1))
+                self.cpu_sec = time.thread_time() - t0
+            for rf in resampler.resample(None):
+                self._out.put(rf.to_ndarray().reshape(-1))
+            self.cpu_sec = time.thread_time() - t0
+            container.close()
+        except Exception as e:  # flux tronqué, format inattendu…
+            self.error = e
+
+    def feed(self, data: bytes, pcm) -> int:
+        self.bytes_in += len(data)
+        self._stream.push(data)
+        return self.drain(pcm)
+
+    def drain(self, pcm) -> int:
+        n = 0
+        while True:
+            try:
+                chunk = self._out.get_nowait()
+            except queue.Empty:
+                break
+            pcm.append(chunk)
+            n += chunk.size
+        self.samples_out += n
+        return n
+
+    def finish(self, timeout: float = 10.0):
+        self._stream.end()
+        self._thread.join(timeout)
+
+    def close(self):
+        self._stream.end()
+
+
+DECODERS = {
+    Float32Decoder.name: Float32Decoder,
+    Int16Decoder.name: Int16Decoder,
+    WebMOpusDecoder.name: WebMOpusDecoder,
+}
+
+
+def make_decoder(fmt: str) -> AudioDecoder:
+    """Décodeur pour le format négocié ; ValueError si inconnu."""
+    try:
+        return DECODERS[fmt]()
+    except KeyError:
+        raise ValueError(f"Format audio non supporté : {fmt!r} ({', '.join(DECODERS)})")
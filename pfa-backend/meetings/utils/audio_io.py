@@ -0,0 +1,18 @@
+# meetings/utils/audio_io.py
+# =============================================================================
+# Entrées/sorties audio communes (benchmarks, imports de fichiers)
+# =============================================================================
+import wave
+
+import numpy as np
+
+SR = 16000  # Fréquence attendue par Whisper
+
+
+def load_wav(path: str) -> np.ndarray:
+    """WAV PCM16 mono 16 kHz -> Float32 [-1, 1]."""
+    with wave.open(path, "rb") as w:
+        if w.getframerate() != SR or w.getnchannels() != 1 or w.getsampwidth() != 2:
+            raise ValueError(f"{path} : WAV attendu en PCM 16 bits, mono, 16 kHz")
+        raw = w.readframes(w.getnframes())
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
@@ -0,0 +1,191 @@
+# meetings/utils/audio_recorder.py
+# =============================================================================
+# Enregistrement sur disque de l'audio live, au fil de l'eau
+# - Fichier rangé comme les uploads : uploads/audio/r<id_reunion>/<timestamp>_<suffixe><ext>
+# - PCM (f32/s16) : encodage FLAC 16 bits (PyAV) ; Opus/WebM : octets reçus
+#   écrits tels quels (aucun réencodage)
+# - Écritures dans un thread dédié via une file : la boucle ne fait jamais d'I/O
+#   disque ; file bornée (LIVE_AUDIO_QUEUE_MAX) : un disque bloqué fait perdre
+#   des trames, comptées, plutôt que grossir la mémoire ; après une erreur
+#   d'écriture, plus rien n'est mis en file
+# =============================================================================
+import logging
+import os
+import queue
+import threading
+
+import numpy as np
+from channels.db import database_sync_to_async
+from django.conf import settings
+
+from meetings.models import Audio, _audio_upload_to
+
+logger = logging.getLogger(__name__)
+
+SR = 16000
+
+
+class AudioRecorder:
+    """
+    Écrivain asynchrone : ``write`` met en file, le thread écrit, ``finish`` clôt.
+    ``write(data, pcm)`` reçoit à la fois les octets du socket et les samples
+    décodés ; chaque sous-classe garde la représentation qui lui convient
+    (``_item``). Une fois le thread en erreur, ``write`` ne fait plus rien.
+    ``samples`` compte l'audio effectivement mis en file : la durée du
+    fichier, indépendante du décodeur de la session (remplacé à chaque start).
+    """
+
+    ext = ""
+    format = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._q = queue.Queue(maxsize=getattr(settings, "LIVE_AUDIO_QUEUE_MAX", 600))
+        self.error = None
+        self.samples = 0   # samples décodés mis en file
+        self.dropped = 0   # trames perdues, file pleine (disque trop lent)
+        self._ended = False
+        self._thread = threading.Thread(target=self._run, name="audio-recorder", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._open()
+            while True:
+                item = self._q.get()
+                if item is not None:
+                    self._write(item)
+                if item is None or (self._ended and self._q.empty()):
+                    break
+            self._close()
+        except Exception as e:  # disque plein, droits…
+            self.error = e
+            while not self._q.empty():  # éléments en attente : libérés, jamais écrits
+                self._q.get_nowait()
+
+    def write(self, data: bytes, pcm: np.ndarray):
+        if self.error is not None or self._ended:
+            return  # thread arrêté : la file ne serait plus jamais vidée
+        item = self._item(data, pcm)
+        if item is not None:
+            try:
+                self._q.put_nowait(item)
+            except queue.Full:
+                if not self.dropped:
+                    logger.warning("Enregistrement %s : disque trop lent, trames perdues", self.path)
+                self.dropped += 1
+                return
+        self.samples += pcm.size
+
+    def _end(self):
+        self._ended = True
+        try:
+            self._q.put_nowait(None)
+        except queue.Full:
+            pass  # le thread vide la file puis s'arrête de lui-même (_ended)
+
+    def finish(self, timeout: float = 30.0):
+        """Fin de l'enregistrement (bloquant : à appeler hors de la boucle)."""
+        self._end()
+        self._thread.join(timeout)
+
+    def close(self):
+        """Abandon sans attendre (déconnexion) : le thread termine le fichier seul."""
+        self._end()
+
+    def _item(self, data: bytes, pcm: np.ndarray):
+        """Élément à écrire pour cette trame (None : rien)."""
+        raise NotImplementedError
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write(self, item):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class FlacRecorder(AudioRecorder):
+    """PCM Float32 16 kHz -> FLAC 16 bits mono (sans perte, ~2x plus compact que s16)."""
+
+    ext = ".flac"
+    format = "flac"
+
+    def _item(self, data: bytes, pcm: np.ndarray):
+        # Conversion int16 = la copie nécessaire (la vue du tampon live est éphémère)
+        if pcm.size:
+            return (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2")
+        return None
+
+    def _open(self):
+        import av  # dépendance de faster-whisper
+
+        self._container = av.open(self.path, mode="w", format="flac")
+        self._stream = self._container.add_stream("flac", rate=SR)
+        self._stream.codec_context.layout = "mono"
+        self._stream.codec_context.format = "s16"
+        self._pts = 0
+
+    def _write(self, samples: np.ndarray):
+        import av
+
+        frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = SR
+        frame.pts = self._pts
+        self._pts += samples.size
+        for packet in self._stream.encode(frame):
+            self._container.mux(packet)
+
+    def _close(self):
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+
+
+class PassthroughRecorder(AudioRecorder):
+    """Flux déjà compressé (Opus/WebM de MediaRecorder) écrit octet pour octet."""
+
+    ext = ".webm"
+    format = "webm/opus"
+
+    def _item(self, data: bytes, pcm: np.ndarray):
+        # L'audio décodé n'est pas réécrit : le flux d'origine suffit
+        return bytes(data) if data else None
+
+    def _open(self):
+        self._f = open(self.path, "wb", buffering=64 * 1024)
+
+    def _write(self, data: bytes):
+        self._f.write(data)
+
+    def _close(self):
+        self._f.close()
+
+
+def recorder_class(wire_format: str):
+    """Enregistreur adapté au format négocié sur le socket."""
+    return PassthroughRecorder if wire_format == "webm-opus" else FlacRecorder
+
+
+@database_sync_to_async
+def open_live_audio(reunion_id: int, wire_format: str):
+    """
+    Crée la ligne Audio de l'enregistrement (durée inconnue jusqu'à l'arrêt)
+    et renvoie ``(audio_id, recorder)`` écrivant dans le fichier associé.
+    """
+    cls = recorder_class(wire_format)
+    audio = Audio(reunion_id=reunion_id, format=cls.format)
+    audio.chemin_fichier.name = _audio_upload_to(audio, "live" + cls.ext)
+    path = os.path.join(settings.MEDIA_ROOT, audio.chemin_fichier.name)
+    recorder = cls(path)
+    audio.save()
+    return audio.id, recorder
+
+
+@database_sync_to_async
+def finalize_live_audio(audio_id: int, seconds: float):
+    """Durée définitive (décodée) ; moins d'une seconde -> 1 (contrainte du modèle)."""
+    Audio.objects.filter(pk=audio_id).update(duree=max(1, round(seconds)))
@@ -0,0 +1,59 @@
+# meetings/utils/live_sessions.py
+# =============================================================================
+# Session live partagée par réunion : un producteur, des spectateurs
+# - Tous les sockets de transcription/<id>/ rejoignent le groupe "reunion.<id>"
+# - Le premier qui démarre l'enregistrement réserve la réunion (cache.add,
+#   atomique) : seul son audio passe par l'ASR, ses messages sont diffusés au
+#   groupe déjà sérialisés ; un spectateur ne fait que les relayer
+# - Réservation à durée limitée (LIVE_PRODUCER_TTL), prolongée tant que le
+#   producteur vit : un worker mort libère la réunion de lui-même
+# Avec plusieurs processus ASGI, le cache "default" doit être partagé (Redis, base)
+# =============================================================================
+import asyncio
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def group_name(reunion_id: int) -> str:
+    return f"reunion.{reunion_id}"
+
+
+def _key(reunion_id: int) -> str:
+    return f"live-producer:{reunion_id}"
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "LIVE_PRODUCER_TTL", 30))
+
+
+async def current_producer(reunion_id: int) -> Optional[str]:
+    """Canal du socket qui enregistre la réunion, ou None."""
+    return await cache.aget(_key(reunion_id))
+
+
+async def claim(reunion_id: int, channel: str) -> bool:
+    """Réserve la réunion pour ``channel`` (vrai aussi s'il la détient déjà)."""
+    if await cache.aadd(_key(reunion_id), channel, _ttl()):
+        return True
+    return await current_producer(reunion_id) == channel
+
+
+async def release(reunion_id: int, channel: str):
+    if await current_producer(reunion_id) == channel:
+        await cache.adelete(_key(reunion_id))
+
+
+async def keep_claim(reunion_id: int, channel: str):
+    """
+    Tâche du producteur : prolonge la réservation jusqu'à son annulation.
+    Se termine si la réservation est perdue (expirée pendant une pause de la
+    boucle, puis prise par un autre socket) : l'appelant cesse de produire.
+    """
+    ttl = _ttl()
+    while True:
+        await asyncio.sleep(ttl / 3)
+        if not await claim(reunion_id, channel):  # reprise si expirée et encore libre
+            return
+        await cache.atouch(_key(reunion_id), ttl)
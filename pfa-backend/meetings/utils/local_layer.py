@@ -0,0 +1,338 @@
+# meetings/utils/local_layer.py
+# =============================================================================
+# Couche de canaux inter-processus sans Redis (une seule machine)
+# - Un broker (manage.py asr_workers, ou asr_workers --workers 0 seul) tient
+#   les files de canaux et les groupes en mémoire, derrière un socket Unix
+# - Chaque processus (serveur ASGI, worker ASR) s'y connecte une fois par
+#   boucle d'événements ; receive() est une attente longue côté broker
+# - Trames = longueur (4 octets) + pickle : le socket est local et en 0600.
+#   Les gros volumes (audio) ne passent pas ici mais en mémoire partagée
+# Configuration : CHANNEL_LAYERS = {"default": {"BACKEND":
+#   "meetings.utils.local_layer.LocalChannelLayer", "CONFIG": {"path": …}}}
+# =============================================================================
+import asyncio
+import fnmatch
+import itertools
+import logging
+import os
+import pickle
+import re
+import struct
+import tempfile
+import time
+import uuid
+import weakref
+from collections import defaultdict, deque
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+FULL, CANCELLED = "full", "cancelled"
+
+
+def default_path() -> str:
+    return os.path.join(tempfile.gettempdir(), "pfa-channels.sock")
+
+
+async def _read_frame(reader: asyncio.StreamReader):
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+def _write_frame(writer: asyncio.StreamWriter, obj):
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(_HEADER.pack(len(data)) + data)
+
+
+# -----------------------------------------------------------------------------
+# Broker
+# -----------------------------------------------------------------------------
+class ChannelBroker:
+    """
+    Files et groupes de tous les processus connectés.
+
+    Requêtes ``(op, id, *args)``, réponses ``(id, ok, valeur)``. Un message
+    envoyé à un canal attendu par un ``receive`` est remis directement ;
+    sinon il est mis en file (``capacity`` messages, ``expiry`` secondes).
+    ``channel_capacity`` borne certains canaux à part, comme channels_redis :
+    ``{"asr-windows": 20, "asr-reply*": 500}`` (motifs fnmatch).
+    """
+
+    def __init__(self, path: str = None, expiry: int = 60, group_expiry: int = 86400,
+                 capacity: int = 100, channel_capacity: dict = None, **kwargs):
+        self.path = path or default_path()
+        self.expiry = expiry
+        self.group_expiry = group_expiry
+        self.capacity = capacity
+        self.channel_capacity = [(re.compile(fnmatch.translate(p)), c) for p, c in (channel_capacity or {}).items()]
+        self.queues = defaultdict(deque)   # canal -> [(expiration, message)]
+        self.waiters = defaultdict(deque)  # canal -> [(writer, id, attentes de la connexion)]
+        self.groups = defaultdict(dict)    # groupe -> {canal: expiration}
+
+    async def serve(self):
+        if os.path.exists(self.path):
+            try:
+                _, w = await asyncio.open_unix_connection(self.path)
+            except OSError:
+                os.unlink(self.path)  # socket d'un broker arrêté
+            else:
+                w.close()
+                raise RuntimeError(f"Un broker écoute déjà sur {self.path}")
+        server = await asyncio.start_unix_server(self._client, self.path)
+        os.chmod(self.path, 0o600)
+        sweeper = asyncio.ensure_future(self._sweep())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    async def _sweep(self):
+        """Purge périodique des messages et appartenances expirés (canaux abandonnés)."""
+        while True:
+            await asyncio.sleep(max(1, self.expiry))
+            now = time.time()
+            for name in list(self.queues):
+                q = self.queues[name]
+                while q and q[0][0] < now:
+                    q.popleft()
+                if not q:
+                    del self.queues[name]
+            for name in [n for n, q in self.waiters.items() if not q]:
+                del self.waiters[name]
+            for group in list(self.groups):
+                members = self.groups[group]
+                for channel in [c for c, exp in members.items() if exp < now]:
+                    del members[channel]
+                if not members:
+                    del self.groups[group]
+
+    async def _client(self, reader, writer):
+        waiting = {}  # id -> canal, receive en attente de cette connexion
+        try:
+            while True:
+                op, req, *args = await _read_frame(reader)
+                if op == "send":
+                    ok = self._deliver(*args)
+                    _write_frame(writer, (req, ok, None if ok else FULL))
+                elif op == "receive":
+                    self._receive(writer, req, args[0], waiting)
+                elif op == "cancel":
+                    channel = waiting.pop(args[0], None)
+                    if channel is not None:
+                        q = self.waiters[channel]
+                        q.remove(next(w for w in q if w[1] == args[0] and w[0] is writer))
+                        _write_frame(writer, (args[0], False, CANCELLED))
+                elif op == "group_add":
+                    self.groups[args[0]][args[1]] = time.time() + self.group_expiry
+                    _write_frame(writer, (req, True, None))
+                elif op == "group_discard":
+                    self.groups.get(args[0], {}).pop(args[1], None)
+                    _write_frame(writer, (req, True, None))
+                elif op == "group_send":
+                    now = time.time()
+                    for channel, exp in list(self.groups.get(args[0], {}).items()):
+                        if exp >= now:
+                            self._deliver(channel, args[1])  # canal plein : message perdu pour lui seul
+                    _write_frame(writer, (req, True, None))
+                elif op == "flush":
+                    self.queues.clear()
+                    self.groups.clear()
+                    _write_frame(writer, (req, True, None))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass  # arrêt du broker : tâche de connexion annulée avec la boucle
+        except Exception:
+            logger.exception("Requête invalide sur le broker de canaux")
+        finally:
+            for req, channel in waiting.items():
+                q = self.waiters[channel]
+                for w in [w for w in q if w[1] == req and w[0] is writer]:
+                    q.remove(w)
+            writer.close()
+
+    def _receive(self, writer, req, channel, waiting):
+        q = self.queues.get(channel)
+        now = time.time()
+        while q:
+            exp, message = q.popleft()
+            if exp >= now:
+                _write_frame(writer, (req, True, message))
+                return
+        waiting[req] = channel
+        self.waiters[channel].append((writer, req, waiting))
+
+    def get_capacity(self, channel: str) -> int:
+        for pattern, capacity in self.channel_capacity:
+            if pattern.match(channel):
+                return capacity
+        return self.capacity
+
+    def _deliver(self, channel: str, message) -> bool:
+        waiters = self.waiters.get(channel)
+        while waiters:
+            writer, req, waiting = waiters.popleft()
+            waiting.pop(req, None)
+            if not writer.is_closing():
+                _write_frame(writer, (req, True, message))
+                return True
+        q = self.queues[channel]
+        now = time.time()
+        while q and q[0][0] < now:
+            q.popleft()
+        if len(q) >= self.get_capacity(channel):
+            return False
+        q.append((now + self.expiry, message))
+        return True
+
+
+def run_broker(config: dict = None):
+    """Broker bloquant (Ctrl+C pour l'arrêter)."""
+    asyncio.run(ChannelBroker(**(config or {})).serve())
+
+
+# -----------------------------------------------------------------------------
+# Client (couche de canaux)
+# -----------------------------------------------------------------------------
+class _Connection:
+    """Connexion au broker d'une boucle : les réponses sont associées aux requêtes par id."""
+
+    def __init__(self, reader, writer):
+        self.writer = writer
+        self.closed = False
+        self.futures = {}
+        self.cancelled = {}  # receive annulé -> canal (réponse éventuellement déjà partie)
+        self._ids = itertools.count(1)
+        self._task = asyncio.ensure_future(self._read(reader))
+
+    def request(self, op: str, *args):
+        if self.closed:
+            raise ConnectionError("Broker de canaux déconnecté")
+        req = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self.futures[req] = fut
+        _write_frame(self.writer, (op, req, *args))
+        return req, fut
+
+    async def call(self, op: str, *args):
+        _, fut = self.request(op, *args)
+        return await fut
+
+    def cancel(self, req: int, channel: str):
+        self.futures.pop(req, None)
+        if not self.closed:
+            self.cancelled[req] = channel
+            _write_frame(self.writer, ("cancel", next(self._ids), req))
+
+    async def _read(self, reader):
+        try:
+            while True:
+                req, ok, value = await _read_frame(reader)
+                fut = self.futures.pop(req, None)
+                if fut is None:
+                    channel = self.cancelled.pop(req, None)
+                    if channel is not None and ok:
+                        # Message remis juste avant l'annulation : renvoyé dans son canal
+                        _write_frame(self.writer, ("send", next(self._ids), channel, value))
+                    continue
+                if fut.done():
+                    continue
+                if ok:
+                    fut.set_result(value)
+                elif value == FULL:
+                    fut.set_exception(ChannelFull())
+                else:
+                    fut.set_exception(ConnectionError(f"Broker de canaux : {value}"))
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            for fut in self.futures.values():
+                if not fut.done():
+                    fut.set_exception(ConnectionError("Broker de canaux déconnecté"))
+            self.futures.clear()
+            self.writer.close()
+
+    def close(self):
+        self._task.cancel()
+        self.writer.close()
+
+
+class LocalChannelLayer(BaseChannelLayer):
+    """
+    Couche de canaux adossée au broker local (voir ``ChannelBroker``).
+
+    Si le broker redémarre, ``receive`` attend puis se reconnecte : les
+    sessions ouvertes continuent (les messages en file sont perdus).
+    """
+
+    extensions = ["groups", "flush"]
+    RETRY_SEC = 0.5
+
+    def __init__(self, path: str = None, expiry: int = 60, group_expiry: int = 86400,
+                 capacity: int = 100, channel_capacity: dict = None, **kwargs):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity)
+        self.path = path or default_path()
+        self.group_expiry = group_expiry
+        self._connections = weakref.WeakKeyDictionary()  # boucle -> _Connection
+
+    async def _connection(self) -> _Connection:
+        loop = asyncio.get_running_loop()
+        conn = self._connections.get(loop)
+        if conn is None or conn.closed:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            current = self._connections.get(loop)
+            if current is not None and not current.closed:
+                writer.close()  # ouverte en parallèle par une autre tâche
+                return current
+            conn = self._connections[loop] = _Connection(reader, writer)
+        return conn
+
+    async def send(self, channel: str, message: dict):
+        conn = await self._connection()
+        await conn.call("send", channel, message)
+
+    async def receive(self, channel: str) -> dict:
+        while True:
+            try:
+                conn = await self._connection()
+                req, fut = conn.request("receive", channel)
+            except OSError:
+                await asyncio.sleep(self.RETRY_SEC)
+                continue
+            try:
+                return await fut
+            except ConnectionError:
+                await asyncio.sleep(self.RETRY_SEC)
+            except asyncio.CancelledError:
+                conn.cancel(req, channel)
+                raise
+
+    async def new_channel(self, prefix: str = "specific") -> str:
+        return f"{prefix}.local!{uuid.uuid4().hex}"
+
+    async def group_add(self, group: str, channel: str):
+        await (await self._connection()).call("group_add", group, channel)
+
+    async def group_discard(self, group: str, channel: str):
+        await (await self._connection()).call("group_discard", group, channel)
+
+    async def group_send(self, group: str, message: dict):
+        await (await self._connection()).call("group_send", group, message)
+
+    async def flush(self):
+        await (await self._connection()).call("flush")
+
+    async def close(self):
+        conn = self._connections.pop(asyncio.get_running_loop(), None)
+        if conn is not None:
+            conn.close()
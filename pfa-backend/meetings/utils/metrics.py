@@ -0,0 +1,225 @@
+# meetings/utils/metrics.py
+# =============================================================================
+# Métriques du worker au format texte Prometheus (vue /metrics/)
+# - Compteurs et histogrammes sans verrou : chaque thread incrémente sa propre
+#   copie (threading.local), sommées seulement à la lecture
+# - Jauges calculées à la lecture (sessions, tampons, files d'attente) :
+#   rien n'est ajouté au chemin de receive()
+# =============================================================================
+import itertools
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable, List, Tuple
+
+REGISTRY = []
+
+# Sessions live du worker : {numéro: consumer}, modifié dans la boucle
+# uniquement ; la lecture copie le dict (opération atomique)
+sessions = {}
+_session_ids = itertools.count(1)
+
+
+def register_session(consumer) -> int:
+    n = next(_session_ids)
+    sessions[n] = consumer
+    return n
+
+
+def unregister_session(n: int):
+    sessions.pop(n, None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards = []  # une copie par thread (list.append est atomique)
+        REGISTRY.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            self._shards.append(shard)
+            return shard
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += self._samples()
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, n: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + n
+
+    def _samples(self):
+        total = {}
+        for shard in list(self._shards):
+            for key, v in list(shard.items()):
+                total[key] = total.get(key, 0) + v
+        return [f"{self.name}{_labels(self.labels, k)} {v}" for k, v in sorted(total.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float], labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self.buckets = sorted(buckets)
+
+    def observe(self, value: float, *labels):
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            # compte par intervalle (dernier : +Inf), puis somme et total
+            row = shard[labels] = [0] * (len(self.buckets) + 3)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-2] += value
+        row[-1] += 1
+
+    def _samples(self):
+        total = {}
+        for shard in list(self._shards):
+            for key, row in list(shard.items()):
+                acc = total.setdefault(key, [0] * len(row))
+                for i, v in enumerate(list(row)):
+                    acc[i] += v
+        lines = []
+        for key, row in sorted(total.items()):
+            cumulative = 0
+            for le, count in zip(self.buckets + ["+Inf"], row):
+                cumulative += count
+                bound = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, bound)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {round(row[-2], 6)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {row[-1]}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Valeur calculée à la lecture : ``fn()`` renvoie un nombre, ou une suite
+    de ``(valeurs des labels, nombre)``. ``kind="counter"`` pour exposer un
+    compteur tenu ailleurs.
+    """
+
+    def __init__(self, name: str, help: str, fn: Callable, labels: Tuple[str, ...] = (), kind: str = "gauge"):
+        super().__init__(name, help, labels)
+        self.fn = fn
+        self.kind = kind
+
+    def _samples(self):
+        value = self.fn()
+        if not self.labels:
+            return [f"{self.name} {value}"]
+        return [f"{self.name}{_labels(self.labels, k)} {v}" for k, v in value]
+
+
+def render() -> str:
+    """Toutes les métriques enregistrées, au format d'exposition texte."""
+    lines = []
+    for metric in REGISTRY:
+        try:
+            lines += metric.render()
+        except Exception as e:  # une jauge en échec ne doit pas masquer les autres
+            lines.append(f"# {metric.name} indisponible : {_escape(e)}")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------------------------------------------------------
+# Métriques de l'application
+# -----------------------------------------------------------------------------
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+asr_duration = Histogram(
+    "pfa_asr_duration_seconds", "Durée d'une passe ASR live (attente de l'exécuteur comprise)",
+    (0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30), ("model",),
+)
+asr_rtf = Histogram("pfa_asr_rtf", "Facteur temps réel d'une passe ASR live", RTF_BUCKETS, ("model",))
+summary_duration = Histogram(
+    "pfa_summary_duration_seconds", "Durée d'un résumé (final ou section glissante)",
+    (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300), ("model", "kind"),
+)
+view_duration = Histogram("pfa_view_duration_seconds", "Latence des vues meetings.views", LATENCY_BUCKETS, ("view",))
+view_queries = Histogram("pfa_view_db_queries", "Requêtes SQL par appel de vue", QUERY_BUCKETS, ("view",))
+view_responses = Counter("pfa_view_responses_total", "Réponses des vues par classe de statut", ("view", "status"))
+
+
+def _session_rows(attr: Callable):
+    rows = []
+    for n, consumer in list(sessions.items()):
+        try:
+            rows.append(((n, consumer.reunion_id or ""), attr(consumer)))
+        except AttributeError:
+            pass  # session en cours de connexion
+    return rows
+
+
+def _executor_rows():
+    # Exécuteurs déjà créés seulement : la lecture n'en démarre aucun
+    from . import asr_executor, asr_remote, asr_scheduler, summarizer
+
+    rows = []
+    for name, ex in (("asr", asr_executor._executor), ("summary", summarizer._executor),
+                     ("rolling", summarizer._background)):
+        if ex is not None:
+            rows += [((name, "waiting"), ex.waiting), ((name, "running"), ex.running)]
+    if asr_scheduler._scheduler is not None:
+        rows.append((("asr_batch", "waiting"), asr_scheduler._scheduler.pending))
+    if asr_remote._remote is not None:
+        rows.append((("asr_remote", "running"), asr_remote._remote.pending))
+    return rows
+
+
+def _profile_rows():
+    from .adaptive import profile_sessions
+    return sorted(((name,), n) for name, n in list(profile_sessions.items()))
+
+
+def _switch_rows():
+    from .adaptive import profile_switches
+    return sorted(((switch,), n) for switch, n in list(profile_switches.items()))
+
+
+def _cache_rows():
+    from .summarizer import cache_stats
+    return [(("hits",), cache_stats["hits"]), (("misses",), cache_stats["misses"])]
+
+
+Gauge("pfa_ws_sessions", "Sessions WebSocket de transcription ouvertes", lambda: len(sessions))
+Gauge("pfa_ws_recording_sessions", "Sessions en cours d'enregistrement",
+      lambda: sum(1 for c in list(sessions.values()) if getattr(c, "recording", False)))
+Gauge("pfa_session_buffer_samples", "Samples retenus dans le tampon PCM de la session",
+      lambda: _session_rows(lambda c: len(c.pcm)), ("session", "reunion"))
+Gauge("pfa_session_buffer_dropped_samples", "Samples perdus par débordement du tampon PCM",
+      lambda: _session_rows(lambda c: c.pcm.dropped), ("session", "reunion"))
+Gauge("pfa_executor_queue", "Appels en attente / en cours par exécuteur", _executor_rows, ("executor", "state"))
+Gauge("pfa_asr_profile_sessions", "Sessions par profil ASR adaptatif", _profile_rows, ("profile",))
+Gauge("pfa_asr_profile_switches_total", "Changements de profil ASR", _switch_rows, ("switch",), kind="counter")
+Gauge("pfa_summary_cache_chunks_total", "Morceaux de résumé servis par le cache / générés", _cache_rows,
+      ("result",), kind="counter")
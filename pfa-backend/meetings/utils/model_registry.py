@@ -0,0 +1,284 @@
+# meetings/utils/model_registry.py
+# =============================================================================
+# Registre paresseux des modèles ML (ASR + résumé)
+# - Aucun chargement à l'import : chaque modèle est chargé au premier usage
+# - Une seule instance par identifiant de modèle (fr/ar partagent mT5)
+# - Préchauffage explicite : manage.py warmup_models ou MODELS_WARMUP_ON_STARTUP
+# - Budget mémoire avec éviction LRU des modèles inactifs (non épinglés)
+# =============================================================================
+import gc
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Modèles par défaut (surchargeables dans settings.py)
+DEFAULT_ASR_MODEL = "small"
+DEFAULT_SUMMARIZER_MODELS = {
+    "fr": "csebuetnlp/mT5_multilingual_XLSum",
+    "en": "facebook/bart-large-cnn",
+    "ar": "csebuetnlp/mT5_multilingual_XLSum",
+}
+DEFAULT_SUMMARIZER_LANG = "fr"
+
+
+def _load_whisper(model_id: str, cpu_threads: int = 0, num_workers: int = None):
+    """Charge un modèle faster-whisper (int8 CPU)."""
+    from faster_whisper import WhisperModel  # import lourd, différé
+
+    # num_workers : permet à plusieurs threads de l'exécuteur de décoder en parallèle
+    # cpu_threads : threads par décodage (0 = défaut CTranslate2), à borner quand
+    # plusieurs processus se partagent les cœurs
+    return WhisperModel(
+        model_id, device="cpu", compute_type="int8", cpu_threads=cpu_threads,
+        num_workers=num_workers or getattr(settings, "ASR_MAX_WORKERS", 2),
+    )
+
+
+SUMMARIZER_BACKENDS = ("torch", "torch-int8", "onnx")
+
+
+def summarizer_backend() -> str:
+    backend = getattr(settings, "SUMMARIZER_BACKEND", "torch")
+    if backend not in SUMMARIZER_BACKENDS:
+        raise ValueError(f"SUMMARIZER_BACKEND inconnu : {backend!r} ({'|'.join(SUMMARIZER_BACKENDS)})")
+    return backend
+
+
+def _onnx_dir(model_id: str) -> str:
+    """Répertoire de l'export ONNX d'un modèle (réutilisé d'un démarrage à l'autre)."""
+    root = getattr(settings, "SUMMARIZER_ONNX_DIR", None) or os.path.join(settings.BASE_DIR, "models", "onnx")
+    return os.path.join(str(root), model_id.replace("/", "__"))
+
+
+def _load_summarizer(model_id: str, backend: str = None):
+    """
+    Charge un pipeline transformers de résumé, selon SUMMARIZER_BACKEND :
+    - "torch"      : PyTorch fp32 (historique)
+    - "torch-int8" : couches Linear quantifiées int8 dynamiquement (CPU)
+    - "onnx"       : ONNX Runtime via optimum (export au premier chargement)
+    """
+    from transformers import pipeline  # import lourd (torch), différé
+
+    backend = backend or summarizer_backend()
+    if backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError("SUMMARIZER_BACKEND='onnx' nécessite optimum[onnxruntime]") from e
+        from transformers import AutoTokenizer
+
+        path = _onnx_dir(model_id)
+        if os.path.isdir(path):
+            model = ORTModelForSeq2SeqLM.from_pretrained(path)
+            tokenizer = AutoTokenizer.from_pretrained(path)
+        else:
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_id, export=True)
+            tokenizer = AutoTokenizer.from_pretrained(model_id)
+            model.save_pretrained(path)
+            tokenizer.save_pretrained(path)
+        pipe = pipeline("summarization", model=model, tokenizer=tokenizer)
+    else:
+        pipe = pipeline("summarization", model=model_id)
+        if backend == "torch-int8":
+            import torch
+
+            pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    # Identité stable (clé du cache des résumés, surcharges de limite) quel que soit le backend
+    pipe.model_id = model_id
+    pipe.backend = backend
+    return pipe
+
+
+def _rss_bytes() -> int:
+    """Mémoire résidente du processus (Linux), 0 si indisponible."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _model_bytes(model) -> int:
+    """
+    Taille des poids d'un pipeline transformers (plus fiable que l'écart de RSS
+    quand plusieurs chargements ont lieu en parallèle). 0 si non applicable
+    (ex. CTranslate2, mesuré par l'écart de RSS).
+    """
+    if getattr(model, "backend", "torch") != "torch":
+        return 0  # poids int8 empaquetés / ONNX Runtime : hors de parameters()
+    torch_model = getattr(model, "model", None)
+    params = getattr(torch_model, "parameters", None)
+    if not callable(params):
+        return 0
+    return sum(p.numel() * p.element_size() for p in params())
+
+
+class ModelRegistry:
+    """
+    Cache de modèles indexé par (type, identifiant), borné en mémoire.
+
+    - Thread-safe : les modèles sont demandés depuis les threads de l'exécuteur ASR.
+      Deux demandes simultanées du même modèle n'entraînent qu'un seul chargement.
+    - Budget (MODELS_MEMORY_BUDGET_MB) : au-delà, le modèle le moins récemment
+      utilisé et non épinglé est déchargé (LRU).
+    - Épinglage : une session active (``pin``) ou une inférence en cours (``use``)
+      protège son modèle de l'éviction.
+    """
+
+    LOADERS = {
+        "asr": _load_whisper,
+        "summarizer": _load_summarizer,
+    }
+
+    def __init__(self, budget_bytes: int = None):
+        self._budget = budget_bytes
+        self._models = OrderedDict()  # clé -> modèle, ordre = récence d'usage
+        self._sizes = {}              # clé -> taille résidente mesurée (octets)
+        self._pins = Counter()        # clé -> nombre de sessions/appels actifs
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def budget(self):
+        """Budget mémoire en octets (None = illimité)."""
+        if self._budget is not None:
+            return self._budget
+        mb = getattr(settings, "MODELS_MEMORY_BUDGET_MB", None)
+        return int(mb * 1024 * 1024) if mb else None
+
+    def get(self, kind: str, model_id: str):
+        key = (kind, model_id)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Verrou par modèle : un chargement lent ne bloque pas les autres modèles
+        with key_lock:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return model
+                self.misses += 1
+                # Taille connue d'un chargement précédent : on fait la place avant
+                self._evict_for(self._sizes.get(key, 0), keep=key)
+            rss0 = _rss_bytes()
+            model = self.LOADERS[kind](model_id)
+            size = _model_bytes(model) or max(0, _rss_bytes() - rss0)
+            with self._lock:
+                self._models[key] = model
+                self._sizes[key] = size
+                self._evict_for(0, keep=key)
+        return model
+
+    def _evict_for(self, incoming: int, keep=None):
+        """Décharge les modèles LRU inactifs jusqu'à tenir dans le budget (verrou tenu)."""
+        budget = self.budget
+        if budget is None:
+            return
+        evicted = False
+        for key in list(self._models):
+            if self._resident_bytes() + incoming <= budget:
+                break
+            if key == keep or self._pins[key] > 0:
+                continue
+            del self._models[key]
+            self.evictions += 1
+            evicted = True
+        if self._resident_bytes() + incoming > budget:
+            logger.warning("Budget modèles dépassé : les modèles restants sont épinglés")
+        if evicted:
+            gc.collect()  # libère les poids dès maintenant (cycles torch)
+
+    def _resident_bytes(self) -> int:
+        return sum(self._sizes.get(k, 0) for k in self._models)
+
+    # ------------------------------------------------------------ épinglage
+    def pin(self, kind: str, model_id: str):
+        """Protège un modèle de l'éviction (session active), chargé ou non."""
+        with self._lock:
+            self._pins[(kind, model_id)] += 1
+
+    def unpin(self, kind: str, model_id: str):
+        with self._lock:
+            key = (kind, model_id)
+            self._pins[key] -= 1
+            if self._pins[key] <= 0:
+                del self._pins[key]
+
+    @contextmanager
+    def use(self, kind: str, model_id: str):
+        """Modèle épinglé le temps d'une inférence."""
+        self.pin(kind, model_id)
+        try:
+            yield self.get(kind, model_id)
+        finally:
+            self.unpin(kind, model_id)
+
+    def loaded(self):
+        """Identifiants des modèles actuellement en mémoire."""
+        return sorted(self._models)
+
+    def stats(self) -> dict:
+        """Compteurs du cache et occupation mémoire."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "resident_bytes": self._resident_bytes(),
+                "budget_bytes": self.budget,
+                "models": [
+                    {"kind": k, "id": m, "bytes": self._sizes.get((k, m), 0), "pins": self._pins[(k, m)]}
+                    for (k, m) in self._models
+                ],
+            }
+
+    # ------------------------------------------------------------ raccourcis
+    def asr(self):
+        return self.get("asr", asr_model_id())
+
+    def summarizer(self, lang: str):
+        return self.get("summarizer", summarizer_model_id(lang))
+
+    def use_asr(self):
+        return self.use("asr", asr_model_id())
+
+    def use_summarizer(self, lang: str):
+        return self.use("summarizer", summarizer_model_id(lang))
+
+    def warmup(self, langs=None):
+        """Charge l'ASR et les modèles de résumé (dédupliqués) à l'avance."""
+        self.asr()
+        models = summarizer_models()
+        for model_id in sorted({models[l] for l in (langs or models) if l in models}):
+            self.get("summarizer", model_id)
+        return self.loaded()
+
+
+def asr_model_id() -> str:
+    return getattr(settings, "ASR_MODEL", DEFAULT_ASR_MODEL)
+
+
+def summarizer_models() -> dict:
+    return getattr(settings, "SUMMARIZER_MODELS", DEFAULT_SUMMARIZER_MODELS)
+
+
+def summarizer_model_id(lang: str) -> str:
+    """Modèle de résumé d'une langue (repli sur le français si inconnue)."""
+    models = summarizer_models()
+    return models.get(lang) or models[DEFAULT_SUMMARIZER_LANG]
+
+
+registry = ModelRegistry()
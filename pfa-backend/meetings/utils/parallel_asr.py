@@ -0,0 +1,182 @@
+# meetings/utils/parallel_asr.py
+# =============================================================================
+# Transcription parallèle des longs enregistrements (fichiers, pas le live)
+# - Découpage aux silences (EnergyVAD) en morceaux d'environ une minute
+# - Morceaux répartis sur un pool de processus (un modèle Whisper chacun,
+#   threads CTranslate2 bornés pour ne pas surcharger les cœurs)
+# - Segments recollés dans l'ordre avec des horodatages globaux : les coupures
+#   tombent dans des silences, ou à défaut (parole continue) au creux
+#   d'énergie le plus profond près de la cible
+# =============================================================================
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from .vad import EnergyVAD, frame_energy_db
+
+SR = 16000
+
+# Segment transcrit en temps global : (début s, fin s, texte)
+Segment = Tuple[float, float, str]
+
+
+def split_at_silences(audio: np.ndarray, sr: int = SR, target_sec: float = 60.0,
+                      max_sec: float = 90.0, min_silence_sec: float = 0.3) -> List[Tuple[int, int]]:
+    """
+    Bornes (samples) des morceaux à transcrire.
+
+    Chaque coupure est placée au milieu du plus long silence trouvé entre
+    ``target_sec`` et ``max_sec`` après le début du morceau ; à défaut
+    (parole continue), au creux d'énergie le plus bas de cet intervalle
+    (énergie lissée sur 0,1 s : entre deux mots plutôt qu'au milieu d'un).
+    Les morceaux sans aucune trame vocale sont écartés.
+    """
+    vad = EnergyVAD(sr)  # plancher de bruit réévalué chaque seconde au fil du fichier
+    flags = vad(audio)
+    frame = vad.frame
+    energy = frame_energy_db(audio, frame)
+    width = max(1, int(0.1 * sr / frame))
+    smooth = np.convolve(energy, np.ones(width) / width, mode="same") if energy.size else energy
+
+    # Plages de silence (en trames) d'au moins min_silence_sec
+    padded = np.concatenate([[False], ~flags, [False]])
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    runs = edges.reshape(-1, 2)
+    runs = runs[(runs[:, 1] - runs[:, 0]) * frame >= min_silence_sec * sr]
+
+    chunks, start, total = [], 0, audio.size
+    target, limit = int(target_sec * sr), int(max_sec * sr)
+    while start < total:
+        if total - start <= limit:
+            end = total
+        else:
+            lo, hi = (start + target) // frame, (start + limit) // frame
+            # Partie de chaque silence comprise dans [lo, hi)
+            a, b = np.maximum(runs[:, 0], lo), np.minimum(runs[:, 1], hi)
+            ok = b > a
+            if ok.any():
+                i = np.argmax(np.where(ok, b - a, -1))
+                end = int((a[i] + b[i]) // 2) * frame
+            elif hi > lo and hi <= smooth.size:
+                end = int(lo + np.argmin(smooth[lo:hi])) * frame
+            else:
+                end = start + limit
+        if flags[start // frame:(end + frame - 1) // frame].any():
+            chunks.append((start, end))
+        start = end
+    return chunks
+
+
+# --- côté processus du pool ---------------------------------------------------
+_model = None
+
+
+def _init_worker(settings_module: str, model_id: str, cpu_threads: int):
+    """Initialisation d'un processus : Django puis chargement unique du modèle."""
+    from .asr_executor import _init_process_worker
+    from .model_registry import _load_whisper
+
+    _init_process_worker(settings_module)
+    global _model
+    _model = _load_whisper(model_id, cpu_threads=cpu_threads, num_workers=1)
+
+
+def _ready(_=None) -> int:
+    time.sleep(0.05)  # laisse le pool démarrer les autres processus
+    return os.getpid()
+
+
+def _transcribe_chunk(audio: np.ndarray, lang: str, beam_size: int) -> List[Segment]:
+    segments, _ = _model.transcribe(audio, language=lang, vad_filter=True, beam_size=beam_size)
+    return [(s.start, s.end, s.text.strip()) for s in segments]
+
+
+# --- côté appelant --------------------------------------------------------------
+class ParallelTranscriber:
+    """
+    Moteur de transcription d'un fichier entier sur ``workers`` processus.
+
+    Le pool (et les modèles chargés) est conservé d'un fichier à l'autre ;
+    ``close()`` ou ``with`` pour l'arrêter.
+    """
+
+    def __init__(self, workers: int = None, model_id: str = None, beam_size: int = 5,
+                 target_sec: float = 60.0, max_sec: float = 90.0):
+        from .model_registry import asr_model_id
+
+        cores = os.cpu_count() or 1
+        self.workers = max(1, workers or cores)
+        self.cpu_threads = max(1, cores // self.workers)
+        self.model_id = model_id or asr_model_id()
+        self.beam_size = beam_size
+        self.target_sec = target_sec
+        self.max_sec = max_sec
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    os.environ.get("DJANGO_SETTINGS_MODULE", "meeting_project.settings"),
+                    self.model_id, self.cpu_threads,
+                ),
+            )
+        return self._pool
+
+    def warmup(self):
+        """Démarre tous les processus (modèles chargés) avant une mesure."""
+        pool, pids = self._get_pool(), set()
+        for _ in range(10):
+            pids.update(pool.map(_ready, range(self.workers * 2)))
+            if len(pids) >= self.workers:
+                break
+
+    def iter_segments(self, audio: np.ndarray, lang: str = None, progress=None) -> Iterator[Segment]:
+        """
+        Segments globaux, dans l'ordre du fichier, au fur et à mesure.
+
+        Au plus ``2 * workers`` morceaux en vol : la mémoire transmise aux
+        processus reste bornée quelle que soit la durée du fichier.
+        ``progress(fraction)`` est appelé à chaque morceau rendu.
+        """
+        chunks = split_at_silences(audio, SR, self.target_sec, self.max_sec)
+        pool = self._get_pool()
+        total = audio.size or 1
+        pending, nxt = {}, 0
+        for i, (start, end) in enumerate(chunks):
+            pending[i] = pool.submit(_transcribe_chunk, audio[start:end], lang, self.beam_size)
+            while len(pending) >= 2 * self.workers or (i == len(chunks) - 1 and pending):
+                yield from self._collect(chunks, pending, nxt)
+                nxt += 1
+                if progress:
+                    progress(chunks[nxt - 1][1] / total)
+
+    @staticmethod
+    def _collect(chunks, pending, idx) -> Iterator[Segment]:
+        """Résultat du morceau ``idx`` (ordre du fichier), décalé en temps global."""
+        start, end = chunks[idx]
+        offset, limit = start / SR, end / SR
+        for s, e, text in pending.pop(idx).result():
+            if text:
+                yield (offset + s, min(offset + e, limit), text)
+
+    def transcribe(self, audio: np.ndarray, lang: str = None) -> List[Segment]:
+        return list(self.iter_segments(audio, lang))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
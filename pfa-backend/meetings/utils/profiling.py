@@ -0,0 +1,180 @@
+# meetings/utils/profiling.py
+# =============================================================================
+# Profilage de requêtes HTTP à la demande (RequestProfilingMiddleware)
+# - Temps total, nombre et durée des requêtes SQL, requêtes répétées à
+#   l'identique aux constantes près (empreintes N+1), cProfile en option
+# - Un enregistrement JSON par requête profilée, dans des fichiers tournants
+#   (PROFILING_DIR, PROFILING_MAX_BYTES x PROFILING_BACKUPS)
+# - Lecture et agrégation par vue : page /profiling/ (staff)
+# =============================================================================
+import cProfile
+import glob
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from logging.handlers import RotatingFileHandler
+from typing import List
+
+from django.conf import settings
+from django.db import connection
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+_store = None
+_store_lock = threading.Lock()
+# cProfile : un seul profileur actif à la fois dans le processus (sys.monitoring en 3.12)
+_cprofile_lock = threading.Lock()
+
+
+def fingerprint(sql: str) -> str:
+    """Requête sans ses constantes : deux appels de la même requête dans une boucle ont la même empreinte."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (…)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def profile_dir() -> str:
+    return str(getattr(settings, "PROFILING_DIR", None) or os.path.join(settings.BASE_DIR, "profiles"))
+
+
+def _logger() -> logging.Logger:
+    """Logger dédié, écrit en JSON lines dans des fichiers tournants (rotation thread-safe)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                os.makedirs(profile_dir(), exist_ok=True)
+                handler = RotatingFileHandler(
+                    os.path.join(profile_dir(), "requests.jsonl"),
+                    maxBytes=getattr(settings, "PROFILING_MAX_BYTES", 5 * 1024 * 1024),
+                    backupCount=getattr(settings, "PROFILING_BACKUPS", 3),
+                    encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("meetings.profiling.store")
+                logger.propagate = False
+                logger.setLevel(logging.INFO)
+                logger.addHandler(handler)
+                _store = logger
+    return _store
+
+
+def _cprofile_text(profiler: cProfile.Profile, limit: int) -> str:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def profile_request(request, get_response, use_cprofile: bool = False):
+    """Exécute la requête en mesurant SQL et temps, puis enregistre le résultat."""
+    queries = defaultdict(lambda: [0, 0.0])  # empreinte -> [nombre, durée s]
+    sql_time = [0.0]
+
+    def record(execute, sql, params, many, context):
+        t = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            dt = time.perf_counter() - t
+            row = queries[fingerprint(sql)]
+            row[0] += 1
+            row[1] += dt
+            sql_time[0] += dt
+
+    profiler = None
+    locked = use_cprofile and _cprofile_lock.acquire(blocking=False)
+    t0 = time.perf_counter()
+    try:
+        with connection.execute_wrapper(record):
+            if locked:
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError:  # autre profileur actif (débogueur…)
+                    profiler = None
+            try:
+                response = get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        if locked:
+            _cprofile_lock.release()
+    wall = time.perf_counter() - t0
+
+    threshold = getattr(settings, "PROFILING_N1_THRESHOLD", 5)
+    match = getattr(request, "resolver_match", None)
+    record_id = uuid.uuid4().hex[:12]
+    entry = {
+        "id": record_id,
+        "ts": time.time(),
+        "method": request.method,
+        "path": request.path,
+        "view": match.view_name if match else None,
+        "status": response.status_code,
+        "wall_ms": round(wall * 1000, 2),
+        "sql_count": sum(n for n, _ in queries.values()),
+        "sql_ms": round(sql_time[0] * 1000, 2),
+        "repeated": sorted(
+            ({"sql": fp[:500], "count": n, "ms": round(t * 1000, 2)}
+             for fp, (n, t) in queries.items() if n >= threshold),
+            key=lambda r: r["count"], reverse=True,
+        )[:10],
+    }
+    if profiler is not None:
+        entry["cprofile"] = _cprofile_text(profiler, getattr(settings, "PROFILING_CPROFILE_LINES", 40))
+    elif use_cprofile:
+        entry["cprofile"] = None  # un autre profilage cProfile était en cours
+    try:
+        _logger().info(json.dumps(entry, ensure_ascii=False))
+    except OSError:
+        logging.getLogger(__name__).exception("Écriture du profil impossible")
+    response["X-Profile-Id"] = record_id
+    return response
+
+
+def load_records() -> List[dict]:
+    """Tous les enregistrements encore présents (fichier courant et rotations)."""
+    records = []
+    for path in glob.glob(os.path.join(profile_dir(), "requests.jsonl*")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # ligne tronquée
+    return records
+
+
+def summarize_by_view(records: List[dict]) -> List[dict]:
+    """Une ligne par vue, triée par p95 du temps total décroissant."""
+    groups = defaultdict(list)
+    for r in records:
+        groups[r.get("view") or r["path"]].append(r)
+    rows = []
+    for view, rs in groups.items():
+        walls = sorted(r["wall_ms"] for r in rs)
+        n1 = [q for r in rs for q in r.get("repeated", [])]
+        rows.append({
+            "view": view,
+            "count": len(rs),
+            "p50_ms": walls[len(walls) // 2],
+            "p95_ms": walls[min(len(walls) - 1, int(0.95 * len(walls)))],
+            "max_ms": walls[-1],
+            "sql_avg": round(sum(r["sql_count"] for r in rs) / len(rs), 1),
+            "sql_max": max(r["sql_count"] for r in rs),
+            "sql_ms_avg": round(sum(r["sql_ms"] for r in rs) / len(rs), 1),
+            "n1": max(n1, key=lambda q: q["count"]) if n1 else None,
+        })
+    return sorted(rows, key=lambda r: r["p95_ms"], reverse=True)
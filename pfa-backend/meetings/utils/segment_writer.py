@@ -0,0 +1,79 @@
+# meetings/utils/segment_writer.py
+# =============================================================================
+# Écriture différée (write-behind) des TranscriptSegment depuis le consumer live
+# - Les segments validés sont mis en tampon en mémoire
+# - bulk_create toutes les N entrées ou T secondes, dans un thread
+#   (database_sync_to_async) : la boucle d'événements n'attend jamais la base
+# - Un onglet fermé ou un crash ne perd que les dernières secondes
+# =============================================================================
+import asyncio
+import logging
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db.models import Max
+
+from meetings.models import TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentWriter:
+    """Tampon de segments d'une réunion, vidé par lots en tâche de fond."""
+
+    def __init__(self, reunion_id: int, batch_size: int = None, interval_sec: float = None):
+        self.reunion_id = reunion_id
+        self.batch_size = batch_size or getattr(settings, "SEGMENTS_FLUSH_EVERY", 20)
+        self.interval = interval_sec or getattr(settings, "SEGMENTS_FLUSH_SEC", 5.0)
+        self._pending = []
+        self._lock = asyncio.Lock()   # un seul bulk_create à la fois
+        self._timer = None
+        self._flushes = set()
+        self.written = 0
+
+    def add(self, text: str, start_sec: float, end_sec: float, speaker: str = ""):
+        """Ajoute un segment (sans I/O) ; déclenche l'écriture si le lot est plein."""
+        self._pending.append(TranscriptSegment(
+            reunion_id=self.reunion_id, text=text,
+            start_sec=round(start_sec, 2), end_sec=round(end_sec, 2), speaker=speaker,
+        ))
+        if len(self._pending) >= self.batch_size:
+            self._spawn_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.interval, self._spawn_flush)
+
+    def _spawn_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = asyncio.ensure_future(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self):
+        """Écrit le lot en attente (bulk_create hors boucle)."""
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                await database_sync_to_async(TranscriptSegment.objects.bulk_create)(batch)
+                self.written += len(batch)
+            except Exception:
+                logger.exception("Écriture des segments impossible (réunion %s)", self.reunion_id)
+                self._pending[:0] = batch  # réessayé au prochain vidage
+
+    async def close(self):
+        """Vidage final (arrêt ou déconnexion)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushes:
+            await asyncio.wait(list(self._flushes))
+        await self.flush()
+
+
+@database_sync_to_async
+def last_segment_end(reunion_id: int) -> float:
+    """Fin du dernier segment enregistré : point de départ d'un nouvel enregistrement."""
+    return TranscriptSegment.objects.filter(reunion_id=reunion_id).aggregate(m=Max("end_sec"))["m"] or 0.0
@@ -0,0 +1,91 @@
+# meetings/utils/streaming.py
+# =============================================================================
+# Décodage en flux "local agreement" (LocalAgreement-2)
+# - Chaque passe Whisper produit une hypothèse de mots horodatés
+# - Seuls les mots identiques sur deux passes consécutives sont validés
+# - Le curseur audio avance jusqu'à la fin du dernier mot validé : l'audio déjà
+#   validé n'est plus jamais redécodé, et les mots de bord ne sont plus dupliqués
+# =============================================================================
+import re
+from typing import List, NamedTuple, Tuple
+
+
+class Word(NamedTuple):
+    start: float  # secondes absolues depuis le début de la session
+    end: float
+    text: str
+
+
+def _norm(w: str) -> str:
+    """Forme de comparaison d'un mot (casse et ponctuation ignorées)."""
+    return re.sub(r"[^\w]", "", w.lower())
+
+
+class LocalAgreement:
+    """
+    Gestionnaire d'hypothèses pour la transcription live.
+
+    ``update(words)`` reçoit l'hypothèse complète de la fenêtre courante
+    (mots en temps absolu) et renvoie ``(validés, partiels)``.
+    """
+
+    # Tolérance sur les horodatages de mots au bord du curseur (s)
+    EDGE_TOLERANCE = 0.1
+    # Taille max du n-gramme répété au bord à supprimer
+    MAX_NGRAM = 5
+
+    def __init__(self):
+        self.committed_end = 0.0       # fin (s) du dernier mot validé
+        self._prev: List[Word] = []    # hypothèse non validée de la passe précédente
+        self._last: List[Word] = []    # derniers mots validés (détection de répétition)
+
+    def reset(self):
+        self.committed_end = 0.0
+        self._prev = []
+        self._last = []
+
+    def update(self, words: List[Word]) -> Tuple[List[Word], List[Word]]:
+        new = [w for w in words if w.start >= self.committed_end - self.EDGE_TOLERANCE]
+        new = self._drop_border_repeat(new)
+
+        # Plus long préfixe commun avec la passe précédente
+        n = 0
+        for a, b in zip(self._prev, new):
+            if _norm(a.text) != _norm(b.text):
+                break
+            n += 1
+        committed = new[:n]
+        self._prev = new[n:]
+        self._remember(committed)
+        return committed, list(self._prev)
+
+    def flush(self) -> List[Word]:
+        """Valide tout ce qui reste (arrêt de l'enregistrement ou fenêtre trop longue)."""
+        committed = self._prev
+        self._prev = []
+        self._remember(committed)
+        return committed
+
+    def _remember(self, committed: List[Word]):
+        if committed:
+            self.committed_end = committed[-1].end
+            self._last = (self._last + committed)[-self.MAX_NGRAM:]
+
+    def _drop_border_repeat(self, new: List[Word]) -> List[Word]:
+        """
+        Whisper re-émet parfois les derniers mots validés au début de la
+        fenêtre suivante : on retire le plus long n-gramme ainsi répété.
+        """
+        if not self._last or not new or new[0].start > self.committed_end + 1.0:
+            return new
+        tail = [_norm(w.text) for w in self._last]
+        head = [_norm(w.text) for w in new[:self.MAX_NGRAM]]
+        for k in range(min(len(tail), len(head)), 0, -1):
+            if tail[-k:] == head[:k]:
+                return new[k:]
+        return new
+
+
+def words_text(words: List[Word]) -> str:
+    """Texte d'une liste de mots (les mots Whisper portent leur espace initial)."""
+    return "".join(w.text for w in words)
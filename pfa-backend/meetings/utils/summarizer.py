@@ -0,0 +1,333 @@
+# meetings/utils/summarizer.py
+# =============================================================================
+# Résumé du texte transcrit, hors de la boucle d'événements
+# - Génération dans un exécuteur dédié (jamais celui de l'ASR live)
+# - Découpage en phrases entières, comptées en jetons par le tokenizer du
+#   modèle, jusqu'à sa vraie limite de contexte (moins de morceaux, pleins)
+# - Map-reduce : les résumés partiels sont à nouveau résumés tant qu'il en
+#   reste plusieurs, pour un résumé d'un seul tenant
+# - Tous les morceaux d'un niveau passés au pipeline en un flux, par lots de
+#   SUMMARY_BATCH_SIZE ; chaque résumé partiel est remis à la boucle dès qu'il est prêt
+# - Résumé glissant pendant la réunion (RollingSummary) : sections résumées en
+#   tâche de fond à basse priorité ; le résumé final n'est plus qu'une fusion
+# - Cache adressé par contenu (cache Django "summaries") : un morceau déjà
+#   résumé par le même modèle avec les mêmes paramètres n'est jamais régénéré
+# =============================================================================
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Callable, List
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+
+from . import metrics
+from .asr_executor import ASRExecutor
+from .model_registry import registry
+
+logger = logging.getLogger(__name__)
+
+# Paramètres de génération (identiques pour tous les modèles de résumé)
+GEN_KWARGS = {"max_length": 220, "min_length": 60, "do_sample": False}
+
+# Limite utilisée quand ni le tokenizer ni la config ne la donnent (mT5 : positions relatives)
+DEFAULT_INPUT_TOKENS = 512
+# Niveaux de réduction max (chaque niveau divise au moins par deux le nombre de parties)
+MAX_REDUCE_LEVELS = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…؟。])\s+")
+
+
+def input_limit(summarizer) -> int:
+    """
+    Jetons d'entrée utilisables par le modèle du pipeline (jetons spéciaux déduits).
+    Surcharge possible par modèle : SUMMARY_MAX_INPUT_TOKENS = {"model_id": n}.
+    """
+    tok, config = summarizer.tokenizer, summarizer.model.config
+    overrides = getattr(settings, "SUMMARY_MAX_INPUT_TOKENS", {}) or {}
+    limit = overrides.get(getattr(summarizer, "model_id", config.name_or_path))
+    if limit is None:
+        limit = tok.model_max_length
+        if not limit or limit > 100_000:  # valeur sentinelle "pas de limite connue"
+            limit = getattr(config, "max_position_embeddings", None) or DEFAULT_INPUT_TOKENS
+    return max(16, int(limit) - tok.num_special_tokens_to_add())
+
+
+def _pack(units: List[str], counts: List[int], limit: int) -> List[str]:
+    """Regroupe des unités consécutives tant que la somme des jetons tient dans ``limit``."""
+    chunks, cur, size = [], [], 0
+    for unit, n in zip(units, counts):
+        if cur and size + n > limit:
+            chunks.append(" ".join(cur))
+            cur, size = [], 0
+        cur.append(unit)
+        size += n
+    if cur:
+        chunks.append(" ".join(cur))
+    return chunks
+
+
+def chunk_text(text: str, tokenizer, limit: int) -> List[str]:
+    """
+    Morceaux de phrases entières d'au plus ``limit`` jetons (tokenizer du modèle).
+    Une phrase trop longue à elle seule est coupée entre deux mots.
+    """
+    sentences = [s for s in _SENTENCE_END.split(text.strip()) if s]
+    if not sentences:
+        return []
+    counts = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]]
+    units, unit_counts = [], []
+    for sentence, n in zip(sentences, counts):
+        if n <= limit:
+            units.append(sentence)
+            unit_counts.append(n)
+            continue
+        words = sentence.split()
+        word_counts = [len(ids) for ids in tokenizer(words, add_special_tokens=False)["input_ids"]]
+        pieces = _pack(words, word_counts, limit)
+        units += pieces
+        unit_counts += [limit] * len(pieces)  # chaque morceau est plein : jamais regroupé
+    return _pack(units, unit_counts, limit)
+
+
+def cache_key(chunk: str, model_id: str) -> str:
+    """Clé de cache : empreinte du morceau normalisé, du modèle et des paramètres de génération."""
+    normalized = " ".join(unicodedata.normalize("NFC", chunk).split())
+    params = [GEN_KWARGS["max_length"], GEN_KWARGS["min_length"], GEN_KWARGS["do_sample"]]
+    payload = json.dumps([normalized, model_id, params], ensure_ascii=False)
+    return "summary:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache():
+    """Cache des résumés (settings.CACHES["summaries"], sinon "default")."""
+    try:
+        return caches["summaries"]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+cache_stats = {"hits": 0, "misses": 0}
+
+
+def _model_label(summarizer) -> str:
+    """Modèle et backend : un modèle quantifié ne rend pas le même texte (ni au même coût)."""
+    model_id = getattr(summarizer, "model_id", summarizer.model.config.name_or_path)
+    return f"{model_id}@{getattr(summarizer, 'backend', 'torch')}"
+
+
+def _generate(summarizer, chunks: List[str], batch_size: int, on_part: Callable[[int, str], None] = None) -> List[str]:
+    """
+    Un niveau de génération. Les morceaux déjà en cache sont rendus
+    immédiatement ; les autres sont passés au pipeline transformers sous forme
+    de générateur, ce qui le fait itérer par lots de ``batch_size`` et rendre
+    chaque sortie dès que son lot est généré.
+    """
+    keys = [cache_key(c, _model_label(summarizer)) for c in chunks]
+    cache = _cache()
+    try:
+        cached = cache.get_many(keys)
+    except Exception:
+        logger.exception("Cache des résumés illisible")
+        cached = {}
+    missing = [c for c, k in zip(chunks, keys) if k not in cached]
+    cache_stats["hits"] += len(chunks) - len(missing)
+    cache_stats["misses"] += len(missing)
+    outputs = iter(summarizer((c for c in missing), batch_size=batch_size, **GEN_KWARGS)) if missing else None
+
+    parts = []
+    for i, key in enumerate(keys):
+        if key in cached:
+            text = cached[key]
+        else:
+            out = next(outputs)
+            # Sortie par élément : [{"summary_text": …}] (ou dict selon la version)
+            text = (out[0] if isinstance(out, list) else out)["summary_text"]
+            try:
+                cache.set(key, text, timeout=None)
+            except Exception:
+                logger.exception("Écriture dans le cache des résumés impossible")
+        parts.append(text)
+        if on_part:
+            on_part(i, text)
+    return parts
+
+
+def _reduce(summarizer, parts: List[str], batch_size: int) -> str:
+    """
+    Réduction : les partiels regroupés sont résumés à leur tour jusqu'à n'en
+    garder qu'un. Déjà assez courts ensemble (SUMMARY_JOIN_MAX_TOKENS), ils
+    sont simplement juxtaposés : une génération de plus ne ferait que perdre
+    des détails, pour le coût d'un appel au modèle.
+    """
+    tok, limit = summarizer.tokenizer, input_limit(summarizer)
+    join_max = getattr(settings, "SUMMARY_JOIN_MAX_TOKENS", 2 * GEN_KWARGS["max_length"])
+    for _ in range(MAX_REDUCE_LEVELS):
+        if len(parts) <= 1:
+            break
+        if len(tok(" ".join(parts), add_special_tokens=False)["input_ids"]) <= join_max:
+            break
+        chunks = chunk_text(" ".join(parts), tok, limit)
+        if len(chunks) >= len(parts):
+            break  # partiels trop longs pour converger : on s'arrête là
+        parts = _generate(summarizer, chunks, batch_size)
+    return " ".join(parts)
+
+
+def summarize_text(text: str, lang: str, on_partial: Callable[[int, int, str], None] = None,
+                   batch_size: int = None, sections: List[str] = ()) -> str:
+    """
+    Résumé map-reduce de ``text`` (bloquant : à exécuter hors de la boucle).
+
+    ``on_partial(i, total, texte)`` est appelé pour chaque résumé de la
+    première passe (morceaux du texte d'origine), dans l'ordre.
+    ``sections`` : résumés déjà calculés (résumé glissant) placés avant ceux
+    de ``text`` dans la réduction.
+    """
+    batch_size = batch_size or getattr(settings, "SUMMARY_BATCH_SIZE", 4)
+    with registry.use_summarizer(lang) as summarizer:
+        t0 = time.perf_counter()
+        chunks = chunk_text(text, summarizer.tokenizer, input_limit(summarizer)) if text else []
+        report = (lambda i, t: on_partial(i, len(chunks), t)) if on_partial else None
+        parts = list(sections) + _generate(summarizer, chunks, batch_size, report)
+        summary = _reduce(summarizer, parts, batch_size)
+        metrics.summary_duration.observe(time.perf_counter() - t0, _model_label(summarizer), "final")
+        return summary
+
+
+def summarize_section(text: str, lang: str):
+    """
+    Résumé glissant (bloquant) : résume les morceaux pleins de ``text`` et
+    renvoie ``(résumés, reste)`` ; un dernier morceau à moitié vide reste en
+    attente de la suite de la réunion.
+    """
+    with registry.use_summarizer(lang) as summarizer:
+        tok, limit = summarizer.tokenizer, input_limit(summarizer)
+        chunks = chunk_text(text, tok, limit)
+        rest = ""
+        if len(chunks) > 1 and len(tok(chunks[-1], add_special_tokens=False)["input_ids"]) < limit // 2:
+            rest = chunks.pop()
+        t0 = time.perf_counter()
+        summaries = _generate(summarizer, chunks, getattr(settings, "SUMMARY_BATCH_SIZE", 4))
+        metrics.summary_duration.observe(time.perf_counter() - t0, _model_label(summarizer), "section")
+        return summaries, rest
+
+
+_executor = None
+
+
+def get_summary_executor() -> ASRExecutor:
+    """Exécuteur des résumés : threads à part, l'ASR live garde toutes ses places."""
+    global _executor
+    if _executor is None:
+        _executor = ASRExecutor(kind="thread", max_workers=getattr(settings, "SUMMARY_MAX_WORKERS", 1))
+    return _executor
+
+
+def _lower_priority():
+    """Thread de fond : priorité minimale (nice par thread sous Linux), au profit de l'ASR."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass  # plateforme sans priorité par thread : la limite d'un seul thread reste
+
+
+_background = None
+
+
+def get_background_executor() -> ASRExecutor:
+    """Exécuteur du résumé glissant : un thread, basse priorité."""
+    global _background
+    if _background is None:
+        _background = ASRExecutor(kind="thread", max_workers=1, initializer=_lower_priority)
+    return _background
+
+
+class RollingSummary:
+    """
+    Résumé glissant d'une session live.
+
+    Le texte validé s'accumule (``add``) ; dès qu'une section est assez longue,
+    ``start_step()`` la résume en tâche de fond. ``finish()`` ne résume plus que le
+    reste puis fusionne les résumés de section (sans modifier l'état : la
+    réunion peut continuer).
+    """
+
+    def __init__(self, lang: str, section_chars: int = None):
+        self.lang = lang
+        self.section_chars = section_chars or getattr(settings, "SUMMARY_SECTION_CHARS", 2500)
+        self.sections: List[str] = []
+        self._pending = ""
+        self._task = None
+
+    def add(self, text: str):
+        self._pending = f"{self._pending} {text}".strip()
+
+    @property
+    def busy(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def ready(self) -> bool:
+        return not self.busy and len(self._pending) >= self.section_chars
+
+    def start_step(self, on_section=None):
+        """Lance la section suivante en tâche de fond ; ``await on_section(i, texte)`` par résumé."""
+        self._task = asyncio.ensure_future(self._step(on_section))
+        return self._task
+
+    async def _step(self, on_section):
+        text, self._pending = self._pending, ""
+        try:
+            summaries, rest = await get_background_executor().run(summarize_section, text, self.lang)
+        except Exception:
+            logger.exception("Résumé glissant impossible (section de %d caractères)", len(text))
+            self._pending = f"{text} {self._pending}".strip()  # réessayé à la prochaine section
+            return
+        self._pending = f"{rest} {self._pending}".strip()
+        for summary in summaries:
+            self.sections.append(summary)
+            if on_section:
+                await on_section(len(self.sections) - 1, summary)
+
+    async def finish(self, send_partial=None) -> str:
+        """Résumé final : reste en attente + fusion des sections déjà résumées."""
+        if self.busy:
+            await asyncio.wait([self._task])
+        return await summarize_stream(self._pending, self.lang, send_partial, sections=list(self.sections))
+
+    def cancel(self):
+        if self.busy:
+            self._task.cancel()
+
+
+async def summarize_stream(text: str, lang: str, send_partial=None, sections: List[str] = ()) -> str:
+    """
+    Version asynchrone : la génération tourne dans l'exécuteur des résumés et
+    ``await send_partial(i, total, texte)`` est appelé dans la boucle pour
+    chaque résumé de première passe.
+    """
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Queue()
+
+    def on_partial(i, total, part):
+        loop.call_soon_threadsafe(ready.put_nowait, (i, total, part))
+
+    task = asyncio.ensure_future(
+        get_summary_executor().run(summarize_text, text, lang, on_partial if send_partial else None, None, sections)
+    )
+    while True:
+        getter = asyncio.ensure_future(ready.get())
+        await asyncio.wait([getter, task], return_when=asyncio.FIRST_COMPLETED)
+        if not getter.done():
+            getter.cancel()
+            break  # génération terminée (ou en erreur)
+        await send_partial(*getter.result())
+    summary = await task
+    while not ready.empty():  # partiels arrivés avec la fin de la tâche
+        await send_partial(*ready.get_nowait())
+    return summary
@@ -0,0 +1,94 @@
+# meetings/utils/tracing.py
+# =============================================================================
+# Traces par session live (TranscriptionConsumer), pour expliquer un retard
+# - Une ligne par événement : réception d'une trame (décodage + VAD),
+#   décision de déclenchement, début/fin de passe ASR, envoi d'un message
+# - Format compact "code t_µs champs…" ; première ligne = métadonnées JSON
+# - Désactivé : le consumer garde trace = None, un test d'attribut par étape
+# - Écritures bufferisées (64 Ko) depuis la boucle uniquement
+#   Lecture et rendu : manage.py trace_timeline
+# =============================================================================
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+
+FRAME, DECISION, ASR_START, ASR_END, SEND, MARK = "F", "D", "A", "E", "S", "M"
+
+_seq = itertools.count(1)  # traces ouvertes par le processus (deux "start" dans la même seconde)
+
+
+def trace_dir() -> str:
+    return str(getattr(settings, "LIVE_TRACE_DIR", None) or os.path.join(settings.BASE_DIR, "traces"))
+
+
+def wants_trace(requested: bool) -> bool:
+    """LIVE_TRACE : "all" (toutes les sessions), "request" (sur demande du client au start), ou False."""
+    mode = getattr(settings, "LIVE_TRACE", False)
+    return mode == "all" or (mode == "request" and bool(requested))
+
+
+class SessionTrace:
+    """Journal d'une session ; temps relatifs à l'ouverture, en microsecondes."""
+
+    def __init__(self, path: str, meta: dict):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.t0 = time.perf_counter()
+        self._f = open(path, "x", encoding="utf-8", buffering=65536)  # jamais une trace existante écrasée
+        self._f.write("#" + json.dumps({**meta, "epoch": time.time()}) + "\n")
+
+    def _write(self, code: str, t: float, *fields):
+        self._f.write(f"{code} {int((t - self.t0) * 1e6)} {' '.join(map(str, fields))}\n")
+
+    def frame(self, t: float, nbytes: int, samples: int, end: int):
+        """Trame reçue à ``t`` ; durée = décodage + VAD ; ``end`` = position absolue du tampon."""
+        self._write(FRAME, t, int((time.perf_counter() - t) * 1e6), nbytes, samples, end)
+
+    def decision(self, action: str, pending: int):
+        self._write(DECISION, time.perf_counter(), action, pending)
+
+    def asr_start(self, start: int, end: int, final: bool):
+        self._write(ASR_START, time.perf_counter(), start, end, int(final))
+
+    def asr_end(self, words: int, model: str):
+        self._write(ASR_END, time.perf_counter(), words, model)
+
+    def sent(self, t: float, text_data: Optional[str]):
+        # json.dumps({"type": …}) : le type commence au 10e caractère
+        kind = text_data[10:text_data.find('"', 10)] if text_data and text_data.startswith('{"type": "') else "-"
+        self._write(SEND, t, int((time.perf_counter() - t) * 1e6), kind, len(text_data or ""))
+
+    def mark(self, name: str):
+        self._write(MARK, time.perf_counter(), name)
+
+    def close(self):
+        try:
+            self._f.close()
+        except OSError:
+            pass
+
+
+def open_trace(reunion_id: Optional[int], session: int, meta: dict) -> SessionTrace:
+    folder = os.path.join(trace_dir(), str(reunion_id) if reunion_id else "libre")
+    name = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{session}-{next(_seq)}.trace"
+    return SessionTrace(os.path.join(folder, name), {"reunion": reunion_id, "session": session, **meta})
+
+
+def read_trace(path: str) -> Tuple[dict, List[tuple]]:
+    """(métadonnées, [(code, t en s, champs…)]) ; une ligne tronquée (session coupée) est ignorée."""
+    meta, events = {}, []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                meta = json.loads(line[1:])
+                continue
+            parts = line.split()
+            if len(parts) < 2 or not parts[1].isdigit():
+                continue
+            events.append((parts[0], int(parts[1]) / 1e6, *parts[2:]))
+    return meta, events
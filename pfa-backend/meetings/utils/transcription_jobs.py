@@ -0,0 +1,194 @@
+# meetings/utils/transcription_jobs.py
+# =============================================================================
+# Transcription différée des fichiers audio importés (TranscriptionJob)
+# - La vue d'upload ne fait qu'enregistrer le fichier et la tâche
+# - Des processus `manage.py transcription_worker`, séparés du serveur ASGI,
+#   réservent les tâches en attente (mise à jour conditionnelle, sans verrou)
+#   et les exécutent : ni les workers web ni l'exécuteur ASR live ne sont occupés
+# - Segments écrits par lots au fil du décodage, avec la progression, et
+#   rattachés à leur tâche : supprimés si elle échoue (ou si son worker meurt) ;
+#   la Transcription de la réunion est recalculée à la fin
+# - Longs fichiers : découpage aux silences et pool de processus (parallel_asr)
+# =============================================================================
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from meetings.models import JobStatus, Transcription, TranscriptionJob, TranscriptSegment
+
+from .model_registry import registry
+from .parallel_asr import ParallelTranscriber
+
+logger = logging.getLogger(__name__)
+
+SR = 16000
+BEAM_SIZE = 5  # hors temps réel : qualité plutôt que latence
+
+
+def enqueue(audio, lang: str = "fr") -> TranscriptionJob:
+    """Met en file la transcription d'un Audio déjà enregistré."""
+    return TranscriptionJob.objects.create(audio=audio, langue=lang)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next(worker: str):
+    """
+    Réserve la plus ancienne tâche en attente, ou None.
+
+    La réservation est un UPDATE conditionnel sur le statut : si deux
+    processus visent la même tâche, un seul met à jour la ligne.
+    """
+    candidates = TranscriptionJob.objects.filter(status=JobStatus.EN_ATTENTE).values_list("pk", flat=True)[:5]
+    for pk in candidates:
+        now = timezone.now()
+        taken = TranscriptionJob.objects.filter(pk=pk, status=JobStatus.EN_ATTENTE).update(
+            status=JobStatus.EN_COURS, worker=worker, date_debut=now, date_maj=now,
+        )
+        if taken:
+            return TranscriptionJob.objects.select_related("audio").get(pk=pk)
+    return None
+
+
+def fail_stale(stale_sec: float) -> int:
+    """
+    Tâches "en cours" sans signe de vie depuis ``stale_sec`` (worker tué) :
+    passées en échec plutôt que relancées, et leurs segments partiels supprimés.
+    """
+    limit = timezone.now() - timedelta(seconds=stale_sec)
+    stale = TranscriptionJob.objects.filter(status=JobStatus.EN_COURS, date_maj__lt=limit)
+    pks = list(stale.values_list("pk", flat=True))
+    if not pks:
+        return 0
+    n = stale.filter(pk__in=pks).update(status=JobStatus.ECHEC, error="Worker interrompu", date_fin=timezone.now())
+    _discard_segments(TranscriptionJob.objects.filter(pk__in=pks, status=JobStatus.ECHEC).values_list("pk", flat=True))
+    return n
+
+
+def _discard_segments(job_pks):
+    """Segments écrits par des tâches en échec : une transcription partielle n'est pas gardée."""
+    TranscriptSegment.objects.filter(job_id__in=list(job_pks)).delete()
+
+
+def _set_progress(job: TranscriptionJob, progress: float):
+    job.progress = min(max(progress, 0.0), 1.0)
+    TranscriptionJob.objects.filter(pk=job.pk).update(progress=job.progress, date_maj=timezone.now())
+
+
+_engine = None
+
+
+def _engine_for_jobs():
+    """Moteur parallèle du processus worker (si TRANSCRIPTION_JOB_CHUNK_WORKERS > 1)."""
+    global _engine
+    workers = getattr(settings, "TRANSCRIPTION_JOB_CHUNK_WORKERS", 1)
+    if workers <= 1:
+        return None
+    if _engine is None:
+        _engine = ParallelTranscriber(workers=workers, beam_size=BEAM_SIZE)
+    return _engine
+
+
+def _segments(audio, lang: str, progress, engine=None):
+    """Segments (début, fin, texte) du fichier : moteur parallèle ou modèle du registre."""
+    engine = engine or _engine_for_jobs()
+    if engine is not None:
+        yield from engine.iter_segments(audio, lang, progress=progress)
+        return
+    with registry.use_asr() as model:
+        segments, _ = model.transcribe(audio, language=lang, vad_filter=True, beam_size=BEAM_SIZE)
+        for seg in segments:  # générateur : le décodage avance à chaque itération
+            yield seg.start, seg.end, seg.text.strip()
+
+
+def run_job(job: TranscriptionJob, engine: ParallelTranscriber = None):
+    """Transcrit le fichier de la tâche (bloquant : exécuté dans un worker)."""
+    from faster_whisper.audio import decode_audio  # PyAV : wav, webm, mp3, m4a…
+
+    audio_row = job.audio
+    reunion_id = audio_row.reunion_id
+    audio = decode_audio(audio_row.chemin_fichier.path, sampling_rate=SR)
+    duration = audio.size / SR
+    if not audio_row.duree and duration >= 1:
+        type(audio_row).objects.filter(pk=audio_row.pk).update(duree=round(duration))
+
+    # Les segments se placent après ceux déjà enregistrés (live ou import précédent)
+    offset = TranscriptSegment.objects.filter(reunion_id=reunion_id).aggregate(m=Max("end_sec"))["m"] or 0.0
+
+    batch_size = getattr(settings, "SEGMENTS_FLUSH_EVERY", 20)
+    interval = getattr(settings, "SEGMENTS_FLUSH_SEC", 5.0)
+    batch, last_flush = [], time.monotonic()
+    for start, end, text in _segments(audio, job.langue, lambda p: _set_progress(job, p), engine):
+        if text:
+            batch.append(TranscriptSegment(
+                reunion_id=reunion_id, job_id=job.pk, text=text,
+                start_sec=offset + start, end_sec=offset + end,
+            ))
+        if len(batch) >= batch_size or time.monotonic() - last_flush >= interval:
+            TranscriptSegment.objects.bulk_create(batch)
+            batch, last_flush = [], time.monotonic()
+            _set_progress(job, end / duration if duration else 1.0)
+    if batch:
+        TranscriptSegment.objects.bulk_create(batch)
+
+    # Texte final : tous les segments de la réunion, dans l'ordre
+    text = " ".join(
+        TranscriptSegment.objects.filter(reunion_id=reunion_id).order_by("start_sec", "id").values_list("text", flat=True)
+    ).strip()
+    Transcription.objects.update_or_create(
+        reunion_id=reunion_id,
+        defaults={"text_transcrit": text, "langue": job.langue, "heure_date": timezone.now()},
+    )
+
+
+def process(job: TranscriptionJob, engine: ParallelTranscriber = None):
+    """Exécute une tâche réservée et enregistre son issue."""
+    try:
+        run_job(job, engine)
+    except Exception as e:
+        logger.exception("Échec de la transcription (job %s)", job.pk)
+        TranscriptionJob.objects.filter(pk=job.pk).update(
+            status=JobStatus.ECHEC, error=str(e)[:2000], date_fin=timezone.now(), date_maj=timezone.now(),
+        )
+        _discard_segments([job.pk])
+        return
+    # Conditionnel : une tâche déclarée morte entre-temps (fail_stale) reste en échec
+    done = TranscriptionJob.objects.filter(pk=job.pk, status=JobStatus.EN_COURS).update(
+        status=JobStatus.TERMINE, progress=1.0, date_fin=timezone.now(), date_maj=timezone.now(),
+    )
+    if not done:
+        logger.warning("Job %s passé en échec pendant son exécution : segments supprimés", job.pk)
+        _discard_segments([job.pk])
+
+
+def worker_loop(poll_sec: float = 2.0, once: bool = False):
+    """
+    Boucle d'un processus worker : réserve, exécute, recommence. Les tâches
+    d'un worker mort sont passées en échec au fil de l'eau (pas seulement au
+    redémarrage de la commande), par n'importe quel worker encore vivant.
+    """
+    name = worker_name()
+    stale_sec = getattr(settings, "TRANSCRIPTION_JOB_STALE_SEC", 600)
+    next_sweep = time.monotonic() + stale_sec / 10
+    while True:
+        if time.monotonic() >= next_sweep:
+            stale = fail_stale(stale_sec)
+            if stale:
+                logger.warning("%s tâche(s) sans signe de vie passée(s) en échec", stale)
+            next_sweep = time.monotonic() + stale_sec / 10
+        job = claim_next(name)
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_sec)
+            continue
+        logger.info("Job %s réservé par %s", job.pk, name)
+        process(job)
@@ -1,77 +1,261 @@
 # meetings/consumers.py
-import json, re
-from typing import List
+import asyncio, json, re, time
+from typing import List, Optional, Tuple
 import numpy as np
+from channels.db import database_sync_to_async
+from channels.exceptions import ChannelFull
 from channels.generic.websocket import AsyncWebsocketConsumer
-from faster_whisper import WhisperModel
-from transformers import pipeline
+from django.conf import settings
+from django.db.models import Q
+
+from meetings.models import Reunion
+
+from .asr_executor import get_asr_executor
+from .adaptive import QualityController
+from .asr_remote import get_remote_asr
+from .asr_scheduler import get_asr_scheduler
+from .audio_buffer import PCMRingBuffer, SharedPCMRingBuffer
+from .audio_codecs import make_decoder
+from .audio_recorder import finalize_live_audio, open_live_audio
+from . import live_sessions, metrics
+from .model_registry import asr_model_id, registry, summarizer_model_id
+from .segment_writer import SegmentWriter, last_segment_end
+from .streaming import LocalAgreement, Word, words_text
+from .summarizer import RollingSummary, cache_stats, summarize_stream
+from .tracing import open_trace, wants_trace
+from .vad import EnergyVAD, FlushPolicy
 
 def _clean(s: str) -> str:
     """Nettoie le texte en supprimant les espaces multiples et en trimant"""
     return re.sub(r"\s+", " ", s or "").strip()
 
-def _chunk(text: str, n=1800) -> List[str]:
-    """Découpe un texte en morceaux de taille maximale n caractères"""
-    return [text[i:i+n] for i in range(0, len(text), n)]
+# Mot horodaté relatif au début de la fenêtre : (début s, fin s, texte)
+WindowWord = Tuple[float, float, str]
 
-class _Models:
-    """Classe contenant les modèles de ML chargés en mémoire (singleton implicite)"""
-    # Modèle de reconnaissance vocale (ASR) - Whisper
-    asr = WhisperModel("small", device="cpu", compute_type="int8")  # commence petit pour tester
-    
-    # Modèles de résumé pour différentes langues
-    summarizers = {
-        "fr": pipeline("summarization", model="csebuetnlp/mT5_multilingual_XLSum"),
-        "en": pipeline("summarization", model="facebook/bart-large-cnn"),
-        "ar": pipeline("summarization", model="csebuetnlp/mT5_multilingual_XLSum"),
-    }
+def transcribe_window(audio: np.ndarray, lang: str, model_id: str = None) -> List[WindowWord]:
+    """
+    Inférence Whisper bloquante sur une fenêtre PCM (exécutée dans le pool ASR).
+    Renvoie les mots horodatés de la fenêtre. ``model_id`` : modèle du profil
+    de qualité de la session (défaut : ASR_MODEL).
+
+    Les segments de faster-whisper sont un générateur paresseux : le décodage
+    a lieu pendant l'itération, qui doit donc se faire ici et non dans la boucle.
+    """
+    with registry.use("asr", model_id or asr_model_id()) as model:
+        segments, _ = model.transcribe(
+            audio, language=lang, vad_filter=True, beam_size=1, word_timestamps=True
+        )
+        return [(w.start, w.end, w.word) for s in segments for w in (s.words or [])]
+
+def _words_from_tokens(tok, ids: List[int], duration: float) -> List[WindowWord]:
+    """
+    Mots d'une séquence décodée avec jetons d'horodatage (<|t|> texte <|t|>).
+    Les horodatages sont par segment : les mots y sont répartis linéairement.
+    """
+    words, text, start = [], [], 0.0
+    for t in ids + [None]:
+        if t is not None and t < tok.timestamp_begin:
+            text.append(t)
+            continue
+        ts = duration if t is None else (t - tok.timestamp_begin) * 0.02
+        if text:
+            parts = tok.decode(text).split()
+            step = max(ts - start, 0.0) / max(len(parts), 1)
+            words += [(start + i * step, start + (i + 1) * step, " " + p) for i, p in enumerate(parts)]
+            text = []
+        start = ts
+    return words
+
+def _speech_only(audio: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Fenêtre dont les passages sans parole sont mis à zéro (VAD Silero de
+    faster-whisper, celui de ``vad_filter=True``) ; None si aucune parole.
+    Masquer plutôt que recoller garde les horodatages de la fenêtre.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    chunks = get_speech_timestamps(audio, VadOptions())
+    if not chunks:
+        return None
+    masked = np.zeros_like(audio)
+    for c in chunks:
+        masked[c["start"]:c["end"]] = audio[c["start"]:c["end"]]
+    return masked
+
+def transcribe_batch(audios: List[np.ndarray], langs: List[str]) -> List[List[WindowWord]]:
+    """
+    Décode plusieurs fenêtres (de sessions différentes) en un seul appel.
+
+    Reprend les briques de BatchedInferencePipeline de faster-whisper :
+    features log-Mel complétées à 30 s, un prompt par élément (langue propre
+    à chaque session), puis un unique ``generate`` CTranslate2 sur tout le lot.
+    Les fenêtres live dépassent rarement 30 s (taille du tampon) ; au-delà,
+    elles sont tronquées. L'alignement mot à mot n'existe pas en lot : les
+    horodatages de mots sont interpolés dans chaque segment.
+
+    Même filtrage VAD que ``transcribe_window`` : silences masqués, fenêtres
+    sans parole retirées du lot (pas de texte halluciné sur du bruit).
+    """
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.transcribe import get_ctranslate2_storage
+
+    out = [[] for _ in audios]
+    speech = [(i, m) for i, m in enumerate(map(_speech_only, audios)) if m is not None]
+    if not speech:
+        return out
+    with registry.use_asr() as model:
+        feats = np.stack([pad_or_trim(model.feature_extractor(m)) for _, m in speech])
+        tokenizers = [
+            Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=langs[i])
+            for i, _ in speech
+        ]
+        prompts = [model.get_prompt(tok, [], without_timestamps=False) for tok in tokenizers]
+        results = model.model.generate(
+            get_ctranslate2_storage(feats), prompts,
+            beam_size=1, max_length=model.max_length, suppress_blank=True,
+        )
+    for (i, _), tok, r in zip(speech, tokenizers, results):
+        out[i] = _words_from_tokens(tok, r.sequences_ids[0], audios[i].size / 16000)
+    return out
+
+@database_sync_to_async
+def _can_join(reunion_id: int, user) -> bool:
+    """Accès au flux live d'une réunion : créateur ou participant (comme les vues)"""
+    if not user or not user.is_authenticated:
+        return False
+    return Reunion.objects.filter(
+        Q(pk=reunion_id) & (Q(utilisateur=user) | Q(participants=user))
+    ).exists()
 
 class TranscriptionConsumer(AsyncWebsocketConsumer):
     """
     Consumer WebSocket pour la transcription en temps réel.
     
-    Reçoit des buffers Float32Array (PCM mono 16 kHz) depuis le navigateur.
-    Accumule, puis lance Whisper sur la partie nouvelle avec un léger recouvrement.
+    Reçoit l'audio du navigateur dans le format négocié au "start" (PCM Float32
+    ou int16 mono 16 kHz, ou Opus/WebM de MediaRecorder).
+    Accumule, puis relance Whisper sur l'audio non encore validé : un mot n'est
+    envoyé comme "transcription" qu'une fois stable sur deux passes (local
+    agreement) ; la fin instable part en message "partial".
+    L'inférence tourne dans l'exécuteur ASR partagé : au plus une fenêtre en vol
+    par session, et la boucle continue de recevoir l'audio pendant le calcul.
     """
     
     # Constantes pour le traitement audio
     SR = 16000  # Sample rate (16 kHz)
-    MIN_NEW_SEC = 2.0  # Seuil minimal de secondes avant traitement
-    OVERLAP_SEC = 0.5  # Recouvrement entre les segments pour éviter les coupures
-    MIN_NEW_SAMPLES = int(SR * MIN_NEW_SEC)  # Seuil en samples
+    MIN_NEW_SEC = 2.0  # Sans VAD : secondes d'audio neuf avant traitement
+    PAUSE_SEC = 0.4  # Avec VAD : pause qui déclenche le traitement
+    MAX_LATENCY_SEC = 4.0  # Avec VAD : parole en attente max avant traitement forcé
+    OVERLAP_SEC = 0.5  # Marge conservée avant le curseur quand la fenêtre est muette
+    MAX_WINDOW_SEC = 15.0  # Au-delà, l'hypothèse est validée de force
+    MAX_BUFFER_SEC = 30.0  # Capacité du tampon live (fenêtre native de Whisper)
     OVERLAP_SAMPLES = int(SR * OVERLAP_SEC)  # Recouvrement en samples
+    MAX_BUFFER_SAMPLES = int(SR * MAX_BUFFER_SEC)  # Capacité en samples
+    MAX_WINDOW_SAMPLES = int(SR * MAX_WINDOW_SEC)  # Fenêtre max en samples
+    trace = None  # Journal de la session (LIVE_TRACE), None = aucun coût
+    group = None  # Groupe channels de la réunion (producteur + spectateurs)
+    producing = False  # Ce socket enregistre la réunion (un seul à la fois)
 
     async def connect(self):
         """Établit la connexion WebSocket et initialise les variables d'état"""
+        # URL /ws/transcription/<id>/ : segments persistés pour cette réunion
+        reunion_id = self.scope.get("url_route", {}).get("kwargs", {}).get("reunion_id")
+        self.reunion_id = int(reunion_id) if reunion_id else None
+        if self.reunion_id and not await _can_join(self.reunion_id, self.scope.get("user")):
+            return await self.close(code=4403)
         await self.accept()
+        self.writer = SegmentWriter(self.reunion_id) if self.reunion_id else None
+        self.time_offset = 0.0  # Début (s) de l'enregistrement dans la réunion
         self.recording = False  # État d'enregistrement
         self.lang = "fr"  # Langue par défaut
-        self.pcm = np.empty(0, dtype=np.float32)   # Tampon pour tout le flux PCM
-        self.processed = 0  # Nombre de samples déjà traités par l'ASR
+        self.pcm = PCMRingBuffer(1)  # Tampon de repos : le vrai (MAX_BUFFER_SAMPLES) est alloué au start, jamais pour un spectateur
+        self.decoder = make_decoder("f32")  # Format audio négocié au "start"
+        self.processed = 0  # Position absolue (samples) de fin de la dernière passe ASR
+        self.cursor = 0  # Position absolue (samples) de l'audio déjà validé
+        self.agreement = LocalAgreement()  # Hypothèses stables / partielles
+        self.policy = self._make_policy()  # VAD + décision de déclenchement ASR
+        self.quality = None  # Profil ASR adaptatif (modèle, fenêtre, déclenchement)
+        self.asr_model = asr_model_id()  # Modèle Whisper du profil courant
+        self.max_window = self.MAX_WINDOW_SAMPLES  # Fenêtre max du profil courant
         self.collected_text: List[str] = []  # Texte transcrit accumulé
+        self._asr_task = None  # Inférence en cours (une seule par session)
+        self._summary_task = None  # Résumé en cours (un seul par session)
+        self.rolling = None  # Résumé glissant des sections déjà validées
+        self._pinned = []  # Modèles épinglés tant que la session est active
+        self.recorder = None  # Enregistrement disque de l'audio live (si activé)
+        self.audio_id = None  # Ligne Audio correspondante
+        self._claim_task = None  # Prolongation de la réservation de la réunion (producteur)
+        self.metrics_id = metrics.register_session(self)  # Tampon et état lus par /metrics/
+        if self.reunion_id and self.channel_layer is not None:
+            # Tout socket de la réunion reçoit le live, qu'il enregistre ou non
+            self.group = live_sessions.group_name(self.reunion_id)
+            await self.channel_layer.group_add(self.group, self.channel_name)
+            producer = await live_sessions.current_producer(self.reunion_id)
+            if producer:
+                await self.send(json.dumps({"type": "live", "recording": True, "producer": False}))
+                try:
+                    await self.channel_layer.send(producer, {"type": "live.sync", "reply": self.channel_name})
+                except ChannelFull:
+                    pass  # producteur disparu, réservation pas encore expirée
 
     async def disconnect(self, code):
         """Gère la déconnexion WebSocket"""
+        if not hasattr(self, "pcm"):
+            return  # connexion refusée avant initialisation
+        metrics.unregister_session(self.metrics_id)
+        self._close_trace()
+        await self._release()
+        if self.group:
+            try:
+                await self.channel_layer.group_discard(self.group, self.channel_name)
+            except OSError:
+                pass  # appartenance expirée côté couche de canaux (group_expiry)
         self.recording = False
+        for task in (self._asr_task, self._summary_task):
+            if task and not task.done():
+                task.cancel()
+        if self.rolling:
+            self.rolling.cancel()
+        if self.quality:
+            self.quality.close()
+        self.decoder.close()
+        self.pcm.close()
+        self._unpin_models()
+        if self.writer:
+            await self.writer.close()  # segments encore en tampon
+        if self.recorder:
+            # Onglet fermé : le fichier est clos par son thread, la durée est celle reçue
+            recorder, self.recorder = self.recorder, None
+            recorder.close()
+            await self._finalize_audio(recorder)
 
     async def receive(self, text_data=None, bytes_data=None):
         """
         Reçoit les données du client WebSocket.
         
         Deux types de données :
-        - bytes_data : données audio binaires (Float32)
+        - bytes_data : données audio binaires (format négocié)
         - text_data : messages de contrôle JSON
         """
-        # --- Traitement des données audio binaires (Float32) ---
+        # --- Traitement des données audio binaires ---
         if bytes_data and self.recording:
             try:
-                # Conversion des données binaires en tableau numpy
-                chunk = np.frombuffer(bytes_data, dtype=np.float32)
-                if chunk.size == 0:
+                t = time.perf_counter() if self.trace else 0.0
+                # Décodage direct dans le tampon borné (pas de réallocation)
+                n = self.decoder.feed(bytes_data, self.pcm)
+                if self.decoder.error is not None:
+                    # Flux illisible : le décodage s'est arrêté, la suite serait ignorée
+                    return await self._stop()
+                if self.recorder:
+                    # Mise en file seulement : l'écriture disque a lieu dans un thread
+                    self.recorder.write(bytes_data, self.pcm.view(self.pcm.end - n))
+                if n == 0:
                     return
-                
-                # Concaténation au tampon global
-                self.pcm = np.concatenate([self.pcm, chunk])
+
+                # VAD sur les samples ajoutés (vue sans copie)
+                self.policy.feed(self.pcm.view(self.pcm.end - n))
+                if self.trace:
+                    self.trace.frame(t, len(bytes_data), n, self.pcm.end)
 
                 # Vérification s'il y a assez de nouvelles données pour traitement
                 await self._flush_if_enough()
@@ -86,85 +270,455 @@ class TranscriptionConsumer(AsyncWebsocketConsumer):
 
             # Démarrage de la transcription
             if action == "start":
+                if self.group and not await self._claim():
+                    # Un autre participant enregistre déjà : ce socket reste spectateur
+                    await self.send(json.dumps({"type": "live", "recording": True, "producer": False}))
+                    return await self._info("👀 Transcription déjà en cours par un autre participant : affichage en direct")
+                await self._wait_asr()
+                try:
+                    decoder = make_decoder((msg.get("format") or "f32").lower())
+                except ValueError as e:
+                    return await self._info(f"Erreur: {e}")
+                self.decoder.close()
+                self.decoder = decoder
                 self.recording = True
                 self.lang = (msg.get("lang") or "fr").lower()
-                self.pcm = np.empty(0, dtype=np.float32)
+                self.pcm.close()
+                self.pcm = self._make_buffer()
                 self.processed = 0
+                self.cursor = 0
+                self.agreement.reset()
+                self.policy = self._make_policy()
+                if self.quality:
+                    self.quality.close()
+                self.quality = QualityController() if getattr(settings, "ASR_ADAPTIVE", True) else None
+                self._apply_profile(self.quality.profile if self.quality else None)
                 self.collected_text.clear()
-                await self._info("🎤 Transcription démarrée")
+                if self.rolling:
+                    self.rolling.cancel()
+                self.rolling = RollingSummary(self.lang) if getattr(settings, "SUMMARY_ROLLING", True) else None
+                if self.writer:
+                    # Reprise : les horodatages suivent ceux déjà enregistrés
+                    self.time_offset = await last_segment_end(self.reunion_id)
+                await self._start_recorder()
+                await self._open_trace(msg.get("trace"))
+                await self._info(f"🎤 Transcription démarrée ({self.decoder.name})")
 
             # Arrêt de la transcription
             elif action == "stop":
-                self.recording = False
-                try:
-                    # Traitement final des données restantes
-                    await self._flush(final=True)
-                except Exception as e:
-                    await self._info(f"Erreur flush final: {e}")
-                await self._info("⏹️ Transcription arrêtée")
+                if self.group and not self.producing:
+                    return  # spectateur : rien à arrêter
+                await self._stop()
+
+            # Occupation mémoire du tampon de la session
+            elif action == "stats":
+                await self._send_stats()
 
             # Demande de résumé du texte transcrit
             elif action == "summarize":
-                # Concaténation et nettoyage de tout le texte transcrit
-                full = _clean(" ".join(self.collected_text))
-                if not full:
-                    return await self.send(json.dumps({"type": "summary", "message": "⚠️ Aucun texte à résumer"}))
-                
-                # Sélection du modèle de résumé approprié
-                summarizer = _Models.summarizers.get(self.lang, _Models.summarizers["fr"])
-                parts = []
-                
-                # Découpage et résumé par morceaux (limitations de contexte des modèles)
-                for ch in _chunk(full, 1800):
-                    out = summarizer(ch, max_length=220, min_length=60, do_sample=False)
-                    parts.append(out[0]["summary_text"])
-                
-                # Envoi du résumé final
-                await self.send(json.dumps({"type": "summary", "message": _clean(" ".join(parts))}))
+                if self.group and not self.collected_text:
+                    producer = await live_sessions.current_producer(self.reunion_id)
+                    if producer and producer != self.channel_name:
+                        # Spectateur : le producteur résume, le résultat est diffusé à tous
+                        return await self.channel_layer.send(producer, {"type": "live.summarize", "reply": self.channel_name})
+                await self._start_summary()
+
+    # --- Messages du groupe de la réunion (channel layer) ---
+    async def live_message(self, event):
+        """Message du producteur, relayé tel quel (déjà sérialisé) : aucun calcul par spectateur"""
+        if event.get("origin") != self.channel_name:
+            await self.send(event["text"])
+
+    async def live_sync(self, event):
+        """Spectateur arrivé en cours de réunion : texte déjà validé, en un message"""
+        if self.collected_text:
+            text = json.dumps({"type": "transcription", "message": " ".join(self.collected_text)})
+            await self.channel_layer.send(event["reply"], {"type": "live.message", "text": text, "origin": self.channel_name})
+
+    async def live_summarize(self, event):
+        """Résumé demandé par un spectateur (les refus lui sont répondus, pas au producteur)"""
+        await self._start_summary(event.get("reply"))
+
+    async def _stop(self):
+        """Fin d'enregistrement : "stop" du client ou flux audio indécodable"""
+        self.recording = False
+        try:
+            # Fin du flux compressé : le décodeur rend ses dernières trames
+            await asyncio.get_running_loop().run_in_executor(None, self.decoder.finish)
+            n = self.decoder.drain(self.pcm)
+            if n:
+                self.policy.feed(self.pcm.view(self.pcm.end - n))
+                if self.recorder:
+                    self.recorder.write(b"", self.pcm.view(self.pcm.end - n))
+            # Traitement final des données restantes
+            await self._flush(final=True)
+            if self.writer:
+                await self.writer.flush()
+        except Exception as e:
+            await self._info(f"Erreur flush final: {e}")
+        if self.decoder.error is not None:
+            await self._info(f"Erreur décodage audio ({self.decoder.name}): {self.decoder.error}")
+        await self._stop_recorder()
+        await self._info("⏹️ Transcription arrêtée")
+        await self._send_stats()
+        self._close_trace()
+        await self._release()
+
+    async def _start_summary(self, reply: Optional[str] = None):
+        # Concaténation et nettoyage de tout le texte transcrit
+        full = _clean(" ".join(self.collected_text))
+        if not full:
+            return await self._reply(reply, {"type": "summary", "message": "⚠️ Aucun texte à résumer"})
+        if self._summary_task and not self._summary_task.done():
+            return await self._reply(reply, {"type": "info", "message": "Résumé déjà en cours…"})
+        # Tâche de fond : le socket continue de recevoir l'audio pendant la génération
+        self._summary_task = asyncio.create_task(self._summarize(full))
+
+    async def _summarize(self, full: str):
+        """
+        Résumé map-reduce sur des morceaux de phrases entières (limite de
+        contexte du modèle), générés par lots hors de la boucle : chaque
+        partiel part dès qu'il est prêt, puis le résumé fusionné.
+        """
+        async def send_partial(i, total, text):
+            await self._publish({
+                "type": "summary_partial", "index": i, "total": total, "message": _clean(text),
+            })
+
+        try:
+            if self.rolling:
+                # Sections déjà résumées pendant la réunion : reste + fusion seulement
+                summary = await self.rolling.finish(send_partial)
+            else:
+                summary = await summarize_stream(full, self.lang, send_partial)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Diffusé comme le résumé : le spectateur qui l'a demandé l'attend aussi
+            return await self._publish({"type": "info", "message": f"Erreur résumé: {e}"})
+
+        # Envoi du résumé final
+        await self._publish({"type": "summary", "message": _clean(summary)})
+
+    def _make_buffer(self) -> PCMRingBuffer:
+        """Tampon en mémoire partagée si les fenêtres sont lues par des workers ASR de la machine"""
+        if get_remote_asr() is not None and getattr(settings, "ASR_REMOTE_SHM", True):
+            return SharedPCMRingBuffer(self.MAX_BUFFER_SAMPLES)
+        return PCMRingBuffer(self.MAX_BUFFER_SAMPLES)
+
+    def _make_policy(self) -> FlushPolicy:
+        """Politique de déclenchement : pauses détectées par VAD, ou pas fixe sans VAD"""
+        vad = EnergyVAD(self.SR) if getattr(settings, "ASR_VAD_ENABLED", True) else None
+        return FlushPolicy(
+            self.SR, vad=vad, min_new_sec=self.MIN_NEW_SEC,
+            pause_sec=self.PAUSE_SEC, max_latency_sec=self.MAX_LATENCY_SEC,
+        )
 
     async def _flush_if_enough(self):
-        """Vérifie s'il y a assez de nouvelles données pour lancer la transcription"""
-        new = self.pcm.size - self.processed
-        if new >= self.MIN_NEW_SAMPLES:
-            await self._run_asr()
+        """
+        Vérifie s'il y a assez de nouvelles données pour lancer la transcription.
+        L'inférence est lancée en tâche de fond : receive() rend la main aussitôt.
+        Le silence pur ne déclenche jamais Whisper.
+        """
+        if self._asr_task and not self._asr_task.done():
+            return  # une fenêtre est déjà en cours ; l'audio continue d'arriver
+        action = self.policy.decide()
+        if action is None:
+            return
+        self.policy.mark_flushed(action)
+        if self.trace:
+            self.trace.decision(action, self.pcm.end - self.processed)
+        if action == FlushPolicy.SKIP:
+            await self._skip_silence()
+        else:
+            pause = action == FlushPolicy.PAUSE
+            self._asr_task = asyncio.create_task(self._run_asr_safe(pause=pause))
+
+    async def _skip_silence(self):
+        """Silence depuis la dernière passe : valide l'hypothèse en attente sans appeler Whisper"""
+        await self._send_committed(self.agreement.flush(), [])
+        end = self.pcm.end
+        self.cursor = max(self.cursor, end - self.OVERLAP_SAMPLES)
+        self.processed = end
+        self.pcm.discard_before(self.cursor)
 
     async def _flush(self, final=False):
         """Force le traitement des données audio restantes"""
-        if self.pcm.size > self.processed:
+        await self._wait_asr()
+        if self.pcm.end > self.processed and (self.policy.vad is None or self.policy.speech > 0):
             await self._run_asr(final=final)
+        elif final:
+            # Plus d'audio neuf : on valide la dernière hypothèse en attente
+            await self._send_committed(self.agreement.flush(), [])
 
-    async def _run_asr(self, final=False):
+    async def _wait_asr(self):
+        """Attend la fin de l'inférence en vol (s'il y en a une)"""
+        if self._asr_task and not self._asr_task.done():
+            await asyncio.wait([self._asr_task])
+
+    async def _run_asr_safe(self, pause=False):
+        """Variante de _run_asr pour les tâches de fond (erreurs remontées au client)"""
+        try:
+            await self._run_asr(pause=pause)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._info(f"Erreur ASR: {e}")
+
+    async def _run_asr(self, final=False, pause=False):
         """
-        Exécute la reconnaissance vocale sur les données audio accumulées
-        
-        Utilise un recouvrement pour éviter de couper les mots en fin de segment
+        Exécute la reconnaissance vocale sur l'audio non validé (curseur -> fin)
+
+        Seuls les mots confirmés par deux passes sont ajoutés au texte ; le
+        curseur avance jusqu'à la fin du dernier mot validé. Sur une pause
+        (``pause``), la phrase est close : toute l'hypothèse est validée.
         """
-        # Calcul du segment à traiter avec recouvrement
-        start = max(0, self.processed - self.OVERLAP_SAMPLES)
-        chunk = self.pcm[start:]
-        
-        if chunk.size <= 0:
-            return
+        # Fenêtre à traiter (vue sans copie).
+        # La fin est figée : l'audio reçu pendant l'inférence sera pour la suivante.
+        start = max(self.pcm.start, self.cursor)
+        end = self.pcm.end
 
-        # Transcription avec Whisper
-        segments, _ = _Models.asr.transcribe(
-            chunk, language=self.lang, vad_filter=True, beam_size=1
-        )
-        
-        # Extraction et nettoyage du texte
-        text = _clean(" ".join(s.text for s in segments))
-        
+        with self.pcm.lease():
+            chunk = self.pcm.view(start, end)
+            if chunk.size <= 0:
+                return
+
+            # Transcription avec Whisper, hors boucle d'événements :
+            # regroupée avec les autres sessions si le batching est actif
+            # (lots mono-modèle : un profil dégradé passe directement par l'exécuteur)
+            if self.trace:
+                self.trace.asr_start(start, end, final)
+            t0 = time.perf_counter()
+            scheduler = get_asr_scheduler()
+            remote = get_remote_asr()
+            if remote is not None:
+                # Workers ASR séparés : la fenêtre est relue dans le segment partagé
+                # (audio joint au message seulement si ASR_REMOTE_SHM est désactivé)
+                window = (self.pcm.ref(start, end) if isinstance(self.pcm, SharedPCMRingBuffer)
+                          else {"audio": chunk.tobytes(), "dtype": chunk.dtype.str, "n": chunk.size})
+                raw = await remote.run(window, self.lang, self.asr_model)
+            elif scheduler is not None and self.asr_model == asr_model_id():
+                raw = await scheduler.submit(chunk, self.lang)
+            else:
+                raw = await get_asr_executor().run(transcribe_window, chunk, self.lang, self.asr_model)
+            elapsed = time.perf_counter() - t0
+            if self.trace:
+                self.trace.asr_end(len(raw), self.asr_model)
+        metrics.asr_duration.observe(elapsed, self.asr_model)
+        metrics.asr_rtf.observe(elapsed * self.SR / (end - start), self.asr_model)
+
+        # Mots en temps absolu, puis tri validés / partiels
+        offset = start / self.SR
+        words = [Word(offset + s, offset + e, t) for s, e, t in raw]
+        committed, tail = self.agreement.update(words)
+        if final or pause or end - start >= self.max_window:
+            committed += self.agreement.flush()
+            tail = []
+
+        await self._send_committed(committed, tail)
+
+        # Avance du curseur : fin du dernier mot validé, ou fenêtre muette
+        if words:
+            self.cursor = max(self.cursor, int(self.agreement.committed_end * self.SR))
+        else:
+            self.cursor = max(self.cursor, end - self.OVERLAP_SAMPLES)
+        self.processed = end
+
+        # En mode final, tout est traité
+        if final:
+            self.cursor = end
+
+        # Libère l'audio validé (jamais redécodé)
+        self.pcm.discard_before(self.cursor)
+
+        # Charge : temps de la passe (attente comprise) et audio arrivé pendant celle-ci
+        if self.quality and not final:
+            backlog = (self.pcm.end - end) / self.SR
+            profile = self.quality.observe(elapsed, (end - start) / self.SR, backlog)
+            if profile is not None:
+                self._apply_profile(profile)
+                await self.send(json.dumps({"type": "profile", **self.quality.state()}))
+
+    def _apply_profile(self, profile):
+        """Modèle, fenêtre max et rythme de déclenchement d'un profil (None = valeurs de la classe)"""
+        profile = profile or {}
+        self.asr_model = profile.get("model") or asr_model_id()
+        self.max_window = int(self.SR * profile.get("max_window_sec", self.MAX_WINDOW_SEC))
+        self.policy.max_latency = int(self.SR * profile.get("max_latency_sec", self.MAX_LATENCY_SEC))
+        self.policy.min_new = int(self.SR * profile.get("min_new_sec", self.MIN_NEW_SEC))
+        self._pin_models()  # le modèle du profil ne doit pas être évincé en cours de session
+
+    async def _send_committed(self, committed: List[Word], tail: List[Word]):
+        """Envoie le texte validé (accumulé) puis la fin provisoire (remplacée à chaque passe)"""
+        text = _clean(words_text(committed))
         if text:
             # Ajout au texte accumulé et envoi au client
             self.collected_text.append(text)
-            await self.send(json.dumps({"type": "transcription", "message": text}))
+            if self.writer:
+                self.writer.add(
+                    text,
+                    self.time_offset + committed[0].start,
+                    self.time_offset + committed[-1].end,
+                )
+            await self._publish({"type": "transcription", "message": text})
+            if self.rolling:
+                self.rolling.add(text)
+                self._maybe_roll()
+        await self._publish({"type": "partial", "message": _clean(words_text(tail))})
 
-        # Mise à jour du pointeur de traitement avec recouvrement
-        self.processed = max(self.processed, self.pcm.size - self.OVERLAP_SAMPLES)
-        
-        # En mode final, traite tout le reste
-        if final:
-            self.processed = self.pcm.size
+    def _maybe_roll(self):
+        """
+        Résume la section suivante en tâche de fond, seulement si l'ASR n'a
+        rien en attente : le résumé glissant ne retarde jamais le live.
+        """
+        if not self.rolling.ready():
+            return
+        scheduler = get_asr_scheduler()
+        if get_asr_executor().waiting or (scheduler is not None and scheduler.pending):
+            return  # réessayé au prochain texte validé
+        self.rolling.start_step(self._send_section)
+
+    async def _send_section(self, i: int, text: str):
+        await self._publish({"type": "summary_section", "index": i, "message": _clean(text)})
+
+    async def _start_recorder(self):
+        """Ouvre le fichier audio de l'enregistrement (réunion identifiée uniquement)"""
+        await self._stop_recorder()  # "start" sans "stop" : l'enregistrement précédent est clos
+        if not self.reunion_id or not getattr(settings, "LIVE_AUDIO_RECORDING", True):
+            return
+        try:
+            self.audio_id, self.recorder = await open_live_audio(self.reunion_id, self.decoder.name)
+        except Exception as e:
+            await self._info(f"Enregistrement audio indisponible: {e}")
+
+    async def _stop_recorder(self):
+        """Clôt le fichier (hors boucle) puis renseigne la durée de la ligne Audio"""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, recorder.finish)
+        if recorder.error:
+            await self._info(f"Erreur enregistrement audio: {recorder.error}")
+        if recorder.dropped:
+            await self._info(f"Enregistrement audio incomplet : {recorder.dropped} trame(s) perdue(s), disque trop lent")
+        await self._finalize_audio(recorder)
+
+    async def _finalize_audio(self, recorder):
+        """Durée de la ligne Audio : audio reçu par l'enregistreur (le décodeur change à chaque start)"""
+        if self.audio_id is None:
+            return
+        audio_id, self.audio_id = self.audio_id, None
+        try:
+            await finalize_live_audio(audio_id, recorder.samples / self.SR)
+        except Exception:
+            pass  # la ligne reste sans durée ; le fichier est complet
+
+    def _pin_models(self):
+        """Épingle l'ASR et le résumeur de la langue : pas d'éviction pendant la session"""
+        self._unpin_models()
+        self._pinned = [("asr", self.asr_model), ("summarizer", summarizer_model_id(self.lang))]
+        for kind, model_id in self._pinned:
+            registry.pin(kind, model_id)
+
+    def _unpin_models(self):
+        for kind, model_id in self._pinned:
+            registry.unpin(kind, model_id)
+        self._pinned = []
+
+    async def _send_stats(self):
+        """Envoie l'occupation mémoire du tampon PCM de la session"""
+        await self.send(json.dumps({
+            "type": "stats",
+            "buffer": self.pcm.stats(),
+            "decoder": self.decoder.stats(),  # octets/s et coût de décodage du format
+            "flushes": self.policy.counts,  # asr / pause / skip (silence sans Whisper)
+            "summary_cache": dict(cache_stats),  # morceaux résumés servis par le cache / générés
+            "asr_profile": self.quality.state() if self.quality else None,  # profil adaptatif, RTF, retard
+        }))
+
+    async def _open_trace(self, requested):
+        """Nouveau journal à chaque "start" (LIVE_TRACE, ou "trace": true du client si autorisé)"""
+        self._close_trace()
+        if not wants_trace(requested):
+            return
+        try:
+            self.trace = open_trace(self.reunion_id, self.metrics_id, {
+                "format": self.decoder.name, "lang": self.lang, "model": self.asr_model,
+            })
+            self.trace.mark("start")
+        except OSError as e:
+            self.trace = None
+            await self._info(f"Trace indisponible: {e}")
+
+    def _close_trace(self):
+        if self.trace:
+            self.trace.mark("stop")
+            self.trace.close()
+            self.trace = None
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        if not self.trace:
+            return await super().send(text_data, bytes_data, close)
+        t = time.perf_counter()
+        await super().send(text_data, bytes_data, close)
+        if self.trace:  # fermé pendant l'envoi
+            self.trace.sent(t, text_data)
+
+    async def _claim(self) -> bool:
+        """Réserve la réunion pour ce socket ; faux si un autre producteur est actif"""
+        if self.producing:
+            return True
+        if not await live_sessions.claim(self.reunion_id, self.channel_name):
+            return False
+        self.producing = True
+        self._claim_task = asyncio.create_task(self._keep_claim())
+        await self._broadcast(json.dumps({"type": "live", "recording": True, "producer": False}))
+        return True
+
+    async def _keep_claim(self):
+        """Prolonge la réservation ; si elle est perdue, ce socket cesse de produire"""
+        await live_sessions.keep_claim(self.reunion_id, self.channel_name)
+        # Réservation expirée puis prise par un autre socket (ou cache indisponible un temps)
+        self.producing = False
+        if self.recording:
+            await self._info("⚠️ Réunion reprise par un autre participant : enregistrement arrêté")
+            await self._stop()
+        await self.send(json.dumps({"type": "live", "recording": True, "producer": False}))
+
+    async def _release(self):
+        """Libère la réunion (arrêt ou déconnexion du producteur) et prévient les spectateurs"""
+        if not self.producing:
+            return
+        self.producing = False
+        self._claim_task.cancel()
+        await live_sessions.release(self.reunion_id, self.channel_name)
+        await self._broadcast(json.dumps({"type": "live", "recording": False, "producer": False}))
+
+    async def _publish(self, payload: dict):
+        """Envoie au client puis diffuse aux spectateurs (JSON sérialisé une seule fois)"""
+        text = json.dumps(payload)
+        await self.send(text)
+        await self._broadcast(text)
+
+    async def _reply(self, reply: Optional[str], payload: dict):
+        """Réponse au demandeur : ce socket, ou le spectateur dont la demande a été relayée"""
+        text = json.dumps(payload)
+        if reply is None or reply == self.channel_name:
+            return await self.send(text)
+        try:
+            await self.channel_layer.send(reply, {"type": "live.message", "text": text, "origin": self.channel_name})
+        except (ChannelFull, OSError):
+            pass  # spectateur parti entre-temps
+
+    async def _broadcast(self, text: str):
+        if not self.group:
+            return
+        try:
+            await self.channel_layer.group_send(
+                self.group, {"type": "live.message", "text": text, "origin": self.channel_name}
+            )
+        except OSError:
+            pass  # broker de canaux injoignable : le producteur continue seul
 
     async def _info(self, m: str):
         """Envoie un message d'information au client"""
@@ -0,0 +1,141 @@
+# meetings/utils/vad.py
+# =============================================================================
+# Détection d'activité vocale (VAD) légère et politique de déclenchement ASR
+# - VAD par énergie, vectorisée numpy (trames de 30 ms, plancher de bruit par minimum glissant)
+# - Le silence ne déclenche jamais Whisper
+# - Déclenchement sur pause naturelle, avec un plafond de latence
+# =============================================================================
+import numpy as np
+
+
+def frame_energy_db(x: np.ndarray, frame: int) -> np.ndarray:
+    """Énergie (dB) de chaque trame complète de ``x``."""
+    n = x.size // frame
+    frames = x[:n * frame].reshape(n, frame)
+    return 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+
+class EnergyVAD:
+    """
+    VAD par énergie de trame.
+
+    Une trame est "parole" si son énergie (dB) dépasse le plancher de bruit
+    estimé de ``threshold_db`` et le seuil absolu ``min_db``. Le plancher est
+    un bas percentile de l'énergie des ``history_sec`` dernières secondes
+    (statistique de minimum) : il descend dans les pauses et monte avec un
+    bruit de fond constant, même si aucune trame n'a encore été jugée muette.
+    Il est réévalué au plus chaque seconde d'audio, quel que soit le découpage
+    des blocs reçus.
+    """
+
+    def __init__(self, sr: int = 16000, frame_ms: int = 30, threshold_db: float = 10.0,
+                 min_db: float = -50.0, history_sec: float = 10.0, percentile: float = 5.0):
+        self.frame = int(sr * frame_ms / 1000)
+        self.threshold_db = threshold_db
+        self.min_db = min_db
+        self.percentile = percentile
+        self.history = max(1, int(history_sec * 1000 / frame_ms))  # trames retenues
+        self.block = max(1, int(1000 / frame_ms))  # trames par réévaluation (1 s)
+        self.reset()
+
+    def reset(self):
+        self.noise_db = self.min_db - self.threshold_db  # plancher initial, avant 1 s d'audio
+        self._energy = np.empty(0)  # énergies récentes (dB)
+        self._since = 0  # trames reçues depuis la dernière réévaluation
+        self._rest = np.empty(0, dtype=np.float32)  # fin de trame incomplète
+
+    def __call__(self, chunk: np.ndarray) -> np.ndarray:
+        """Drapeaux parole/silence (bool) des trames complètes du bloc."""
+        x = np.concatenate([self._rest, chunk]) if self._rest.size else chunk
+        energy_db = frame_energy_db(x, self.frame)
+        self._rest = x[energy_db.size * self.frame:].copy()
+        n = energy_db.size
+        speech = np.empty(n, dtype=bool)
+        i = 0
+        while i < n:
+            # Jusqu'à la prochaine réévaluation (toutes les ``block`` trames reçues)
+            k = min(n - i, self.block - self._since)
+            e = energy_db[i:i + k]
+            speech[i:i + k] = e > max(self.noise_db + self.threshold_db, self.min_db)
+            self._energy = np.concatenate([self._energy, e])[-self.history:]
+            self._since += k
+            i += k
+            if self._since == self.block:
+                self._since = 0
+                self.noise_db = float(np.percentile(self._energy, self.percentile))
+        return speech
+
+
+class FlushPolicy:
+    """
+    Décide quand lancer l'ASR pour une session live.
+
+    Actions renvoyées par ``decide()`` :
+    - ``ASR``   : parole en cours depuis ``max_latency`` (plafond de latence,
+      compté à partir de la première trame vocale : le silence qui précède
+      ne l'entame pas)
+    - ``PAUSE`` : parole suivie d'une pause naturelle (fin de phrase probable)
+    - ``SKIP``  : uniquement du silence depuis ``max_latency`` : rien à décoder
+    - ``None``  : attendre
+
+    Sans VAD (``vad=None``), comportement historique : ASR tous les ``min_new`` s.
+    L'état n'est remis à zéro que par ``mark_flushed()``, appelé quand
+    l'action est réellement exécutée (l'ASR peut être occupé).
+    """
+
+    ASR, PAUSE, SKIP = "asr", "pause", "skip"
+
+    def __init__(self, sr: int = 16000, vad: EnergyVAD = None, min_new_sec: float = 2.0,
+                 pause_sec: float = 0.4, max_latency_sec: float = 4.0, min_speech_sec: float = 0.2):
+        self.sr = sr
+        self.vad = vad
+        self.min_new = int(sr * min_new_sec)
+        self.pause = int(sr * pause_sec)
+        self.max_latency = int(sr * max_latency_sec)
+        self.min_speech = int(sr * min_speech_sec)
+        self.counts = {self.ASR: 0, self.PAUSE: 0, self.SKIP: 0}
+        self.reset()
+
+    def reset(self):
+        self.pending = 0   # samples reçus depuis le dernier déclenchement
+        self.speech = 0    # dont samples de parole
+        self.silence = 0   # silence en fin de flux (samples)
+        self.talking = 0   # samples depuis la première trame vocale (0 : pas encore de parole)
+        if self.vad is not None:
+            self.vad.reset()
+
+    def feed(self, chunk: np.ndarray):
+        self.pending += chunk.size
+        if self.vad is None:
+            return
+        flags = self.vad(chunk)
+        if self.talking:
+            self.talking += chunk.size
+        if flags.any():
+            if not self.talking:
+                self.talking = int(flags.size - np.flatnonzero(flags)[0]) * self.vad.frame
+            self.speech += int(flags.sum()) * self.vad.frame
+            # Silence final = trames muettes après la dernière trame vocale
+            self.silence = int(flags.size - 1 - np.flatnonzero(flags)[-1]) * self.vad.frame
+        else:
+            self.silence += flags.size * self.vad.frame
+
+    def decide(self):
+        if self.vad is None:
+            return self.ASR if self.pending >= self.min_new else None
+        if self.speech >= self.min_speech:
+            if self.silence >= self.pause:
+                return self.PAUSE
+            if self.talking >= self.max_latency:
+                return self.ASR
+        elif self.pending >= self.max_latency:
+            return self.SKIP
+        return None
+
+    def mark_flushed(self, action: str):
+        """Enregistre l'action exécutée et repart d'une fenêtre vide."""
+        self.counts[action] += 1
+        self.pending = 0
+        self.speech = 0
+        self.silence = 0  # un silence final déjà traité ne redéclenche pas de PAUSE
+        self.talking = 0
@@ -7,12 +7,14 @@
 # =============================================================================
 
 from __future__ import annotations
+import hmac
 import os
 from tempfile import NamedTemporaryFile
 from datetime import date as ddate, datetime, time as dtime
 
 from django.conf import settings
-from django.contrib import messages
+from django.contrib import admin, messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import authenticate, login, logout, get_user_model
 from django.contrib.auth.decorators import login_required
 from django.db import IntegrityError, transaction
@@ -34,7 +36,11 @@ from django.core.paginator import Paginator
 from docx import Document
 from docx.shared import Inches
 
-from .models import Reunion, Audio, Transcription, Resume, Rapport
+from .forms import AudioUploadForm
+from .models import Reunion, Audio, Transcription, Resume, Rapport, TranscriptionJob, JobStatus, Lang
+from .utils import metrics
+from .utils.profiling import load_records, profile_dir, summarize_by_view
+from .utils.transcription_jobs import enqueue
 
 User = get_user_model()
 
@@ -801,7 +807,7 @@ def transcription_page(request, reunion_id: int):
         "reunion": reunion,
         "transcription": transcription,
         "resume": resume,
-        "webrtc_ws_url": "/ws/transcription/",
+        "webrtc_ws_url": f"/ws/transcription/{reunion.id}/",
     }
     return render(request, "HTML/transcription.html", ctx)
 
@@ -818,7 +824,8 @@ def save_transcription(request, reunion_id: int):
     if not _can_view_meeting(reunion, request.user):
         return HttpResponseForbidden("Accès interdit.")
 
-    text = (request.POST.get("text") or "").strip()
+    # Texte envoyé par la page, sinon segments déjà persistés par le flux live
+    text = (request.POST.get("text") or "").strip() or reunion.full_text_transcription()
     summary = (request.POST.get("summary") or "").strip()
     lang = (request.POST.get("lang") or "fr").strip()
 
@@ -853,6 +860,68 @@ def save_transcription(request, reunion_id: int):
     return JsonResponse({"ok": True, "transcription_id": tr.id})
 
 
+# =============================================================================
+# Import d'un enregistrement audio -> transcription en tâche de fond
+# =============================================================================
+@login_required
+def upload_audio(request, reunion_id: int):
+    """
+    Enregistre le fichier et met en file sa transcription (réponse immédiate).
+    Le décodage est fait par `manage.py transcription_worker`, hors serveur web.
+    """
+    if forbid_admin_on_meetings(request):
+        return JsonResponse({"ok": False, "error": "Admin: stats only."}, status=403)
+
+    if request.method != "POST":
+        return HttpResponseForbidden("Méthode non autorisée")
+
+    reunion = get_object_or_404(Reunion, pk=reunion_id)
+    if not _can_view_meeting(reunion, request.user):
+        return HttpResponseForbidden("Accès interdit.")
+
+    lang = (request.POST.get("lang") or "fr").strip()
+    if lang not in Lang.values:
+        return JsonResponse({"ok": False, "error": "Langue non supportée"}, status=400)
+
+    form = AudioUploadForm(request.POST, request.FILES)
+    if not form.is_valid():
+        return JsonResponse({"ok": False, "error": form.errors.get_json_data()}, status=400)
+
+    audio = form.save(commit=False)
+    audio.reunion = reunion
+    audio.format = os.path.splitext(request.FILES["chemin_fichier"].name)[1].lstrip(".").lower()[:15]
+    audio.save()
+    job = enqueue(audio, lang)
+
+    return JsonResponse({
+        "ok": True,
+        "job_id": job.id,
+        "status_url": reverse("transcription_job_status", args=[job.id]),
+    }, status=202)
+
+
+@login_required
+def transcription_job_status(request, job_id: int):
+    """Avancement d'une tâche de transcription (interrogé par la page)."""
+    if forbid_admin_on_meetings(request):
+        return JsonResponse({"ok": False, "error": "Admin: stats only."}, status=403)
+
+    job = get_object_or_404(TranscriptionJob.objects.select_related("audio__reunion"), pk=job_id)
+    reunion = job.audio.reunion
+    if not _can_view_meeting(reunion, request.user):
+        return HttpResponseForbidden("Accès interdit.")
+
+    transcription = Transcription.objects.filter(reunion=reunion).only("id").first()
+    return JsonResponse({
+        "ok": True,
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "progress": round(job.progress, 3),
+        "error": job.error,
+        "transcription_id": transcription.id if transcription and job.status == JobStatus.TERMINE else None,
+    })
+
+
 # =============================================================================
 # Rapport (DOCX) (utilisateur uniquement)
 # =============================================================================
@@ -968,3 +1037,46 @@ def generate_report(request, reunion_id: int):
 
     # Téléchargement direct
     return FileResponse(rapport.fichier.open("rb"), as_attachment=True, filename=filename)
+
+
+# =============================================================================
+# Métriques (format texte Prometheus)
+# =============================================================================
+def metrics_view(request):
+    """
+    Compteurs du worker pour un collecteur (Prometheus…). Accès : jeton
+    METRICS_TOKEN (en-tête Authorization: Bearer) ou admin connecté. Pas de
+    passe-droit pour 127.0.0.1 : derrière un tunnel (ngrok) ou un proxy local,
+    toutes les requêtes arrivent de là.
+    """
+    if not getattr(settings, "METRICS_ENABLED", True):
+        return HttpResponse(status=404)
+    token = getattr(settings, "METRICS_TOKEN", None)
+    allowed = bool(token) and hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode(),
+    )
+    if not (allowed or is_admin(request.user)):
+        return HttpResponseForbidden("Accès interdit.")
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# =============================================================================
+# Profils des requêtes (staff)
+# =============================================================================
+@staff_member_required
+def profiling_report(request):
+    """Vues les plus lentes et pires requêtes profilées (RequestProfilingMiddleware)."""
+    records = load_records()
+    view = request.GET.get("view")
+    if view:
+        records = [r for r in records if (r.get("view") or r["path"]) == view]
+    return render(request, "admin/profiling_report.html", {
+        **admin.site.each_context(request),
+        "title": "Profils des requêtes",
+        "enabled": getattr(settings, "PROFILING_ENABLED", False),
+        "directory": profile_dir(),
+        "total": len(records),
+        "view": view,
+        "views": summarize_by_view(records),
+        "slowest": sorted(records, key=lambda r: r["wall_ms"], reverse=True)[:30],
+    })